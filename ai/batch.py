@@ -0,0 +1,163 @@
+# ai/batch.py
+"""
+Batch files for offline LLM runs (OpenAI Batch API format).
+
+A backfill is exported as JSONL request files — one chat completion per line,
+identified by a `custom_id` — uploaded to the provider's batch endpoint, and the
+result files it returns are read back here and ingested in bulk. Batch runs cost
+less than interactive calls and are not subject to the per-minute rate limits.
+
+complete_locally() plays the provider's part with the dummy output, so the whole
+export → complete → ingest pipeline can run (and be benchmarked) offline.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+from .llm import NO_USAGE, LLMClient, Usage, estimate_tokens
+
+ENDPOINT = "/v1/chat/completions"
+
+# Provider limits per input file
+MAX_REQUESTS_PER_FILE = 50_000
+MAX_BYTES_PER_FILE = 200 * 1024 * 1024
+
+PathLike = Union[str, os.PathLike]
+
+
+class BatchResult(NamedTuple):
+    custom_id: str
+    text: str  # "" when the request failed
+    usage: Usage
+    error: str  # "" when the request succeeded
+
+
+def request_line(
+        custom_id: str,
+        model: str,
+        prompt: str,
+        max_tokens: int = 200,
+        temperature: float = 0.7,
+        json_mode: bool = False,
+) -> dict:
+    """One batch input line: the chat completion _complete() would make, addressed by `custom_id`."""
+    body = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    }
+    if json_mode:
+        body["response_format"] = {"type": "json_object"}
+    return {"custom_id": custom_id, "method": "POST", "url": ENDPOINT, "body": body}
+
+
+def write_requests(
+        requests: Iterable[dict],
+        out_dir: PathLike,
+        prefix: str = "batch",
+        max_requests: int = MAX_REQUESTS_PER_FILE,
+        max_bytes: int = MAX_BYTES_PER_FILE,
+) -> List[Path]:
+    """
+    Write request lines to `<out_dir>/<prefix>-0001.jsonl`, `-0002`, … starting a new file
+    whenever the next line would exceed the per-file limits. Returns the files written.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths: List[Path] = []
+    fh = None
+    count = size = 0
+    try:
+        for req in requests:
+            line = (json.dumps(req, ensure_ascii=False) + "\n").encode("utf-8")
+            if fh is None or count >= max_requests or size + len(line) > max_bytes:
+                if fh is not None:
+                    fh.close()
+                paths.append(out_dir / f"{prefix}-{len(paths) + 1:04d}.jsonl")
+                fh = open(paths[-1], "wb")
+                count = size = 0
+            fh.write(line)
+            count += 1
+            size += len(line)
+    finally:
+        if fh is not None:
+            fh.close()
+    return paths
+
+
+def read_requests(paths: Iterable[PathLike]) -> Iterator[dict]:
+    for path in paths:
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def parse_result(line: dict) -> BatchResult:
+    """BatchResult from one line of a provider result (or error) file."""
+    custom_id = line.get("custom_id", "")
+    error = line.get("error")
+    response = line.get("response") or {}
+    if error:
+        return BatchResult(custom_id, "", NO_USAGE, error.get("message") or str(error))
+    if response.get("status_code") != 200:
+        body = response.get("body") or {}
+        message = (body.get("error") or {}).get("message") or f"HTTP {response.get('status_code')}"
+        return BatchResult(custom_id, "", NO_USAGE, message)
+
+    body = response["body"]
+    text = (body["choices"][0]["message"].get("content") or "").strip()
+    u = body.get("usage") or {}
+    return BatchResult(custom_id, text, (u.get("prompt_tokens") or 0, u.get("completion_tokens") or 0), "")
+
+
+def read_results(paths: Iterable[PathLike]) -> Iterator[BatchResult]:
+    """Results from provider result files, in file order (which is not the request order)."""
+    for line in read_requests(paths):
+        yield parse_result(line)
+
+
+def complete_locally(
+        request_paths: Iterable[PathLike],
+        result_path: PathLike,
+        respond: Optional[Callable[[str, bool], str]] = None,
+) -> int:
+    """
+    Stand-in for the provider's batch run: answer every request of `request_paths` with
+    `respond(prompt, json_mode)` (default: the dummy provider output) and write a result
+    file in the provider's format. Returns the number of requests completed.
+    """
+    respond = respond or LLMClient(provider="dummy")._dummy
+    done = 0
+    with open(result_path, "w", encoding="utf-8") as out:
+        for req in read_requests(request_paths):
+            body = req["body"]
+            prompt = body["messages"][-1]["content"]
+            json_mode = (body.get("response_format") or {}).get("type") == "json_object"
+            text = respond(prompt, json_mode)
+            usage = {"prompt_tokens": estimate_tokens(prompt), "completion_tokens": estimate_tokens(text)}
+            usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+            done += 1
+            line = {
+                "id": f"batch_req_local_{done}",
+                "custom_id": req["custom_id"],
+                "response": {
+                    "status_code": 200,
+                    "request_id": f"local-{done}",
+                    "body": {
+                        "object": "chat.completion",
+                        "model": body.get("model", ""),
+                        "choices": [{
+                            "index": 0,
+                            "message": {"role": "assistant", "content": text},
+                            "finish_reason": "stop",
+                        }],
+                        "usage": usage,
+                    },
+                },
+                "error": None,
+            }
+            out.write(json.dumps(line, ensure_ascii=False) + "\n")
+    return done
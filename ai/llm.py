@@ -1,7 +1,407 @@
 # ai/llm.py
+import asyncio
+import hashlib
+import json
+import logging
 import os
-from typing import Optional
-from openai import OpenAI
+import re
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Set,
+    Tuple, TypeVar,
+)
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+from .metrics import get_llm_metrics
+from .resilience import CircuitBreaker, LatencyWindow
+
+logger = logging.getLogger(__name__)
+
+# (prompt tokens, completion tokens) reported by the provider
+Usage = Tuple[int, int]
+NO_USAGE: Usage = (0, 0)
+
+
+class Descriptions(dict):
+    """Language -> description, plus the provider token usage it took (`usage`)."""
+
+    def __init__(self, texts: Dict[str, str], usage: Usage = NO_USAGE):
+        super().__init__(texts)
+        self.usage = usage
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count without a tokenizer: ~4 ASCII characters per token, one per other character (CJK)."""
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return ascii_chars // 4 + (len(text) - ascii_chars)
+
+
+def _usage(resp) -> Usage:
+    u = getattr(resp, "usage", None)
+    if u is None:
+        return NO_USAGE
+    return (u.prompt_tokens or 0, u.completion_tokens or 0)
+
+
+def _setting(name: str, default):
+    """Read a tuning knob from Django settings when available, else from the environment."""
+    try:
+        from django.conf import settings
+        if settings.configured:
+            return getattr(settings, name, default)
+    except ImportError:
+        pass
+    raw = os.getenv(name)
+    return type(default)(raw) if raw is not None else default
+
+
+def _resolve_config(
+        provider: Optional[str] = None,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+) -> Tuple[str, str, str]:
+    """Work out (provider, api_key, model) from arguments and environment variables."""
+    # Read provider/key from environment variables
+    prov = (provider or os.getenv("LLM_PROVIDER") or "").strip().lower()
+    key = api_key or os.getenv("LLM_API_KEY")
+
+    # Try common variable names if not explicitly set
+    if not key:
+        if os.getenv("OPENAI_API_KEY"):
+            prov = prov or "openai"
+            key = os.getenv("OPENAI_API_KEY")
+        elif os.getenv("DEEPSEEK_API_KEY"):
+            prov = prov or "deepseek"
+            key = os.getenv("DEEPSEEK_API_KEY")
+
+    # Determine provider: use "openai" if a key exists, otherwise dummy
+    if not prov:
+        prov = "openai" if key else "dummy"
+
+    model = model or os.getenv("LLM_MODEL") or LLMClient._DEFAULT_MODELS.get(prov, "")
+    return prov, key or "", model
+
+
+def _http_client_options() -> dict:
+    return {
+        "limits": httpx.Limits(
+            max_connections=_setting("LLM_HTTP_MAX_CONNECTIONS", 20),
+            max_keepalive_connections=_setting("LLM_HTTP_MAX_KEEPALIVE", 10),
+            keepalive_expiry=_setting("LLM_HTTP_KEEPALIVE_EXPIRY", 30.0),
+        ),
+        "timeout": httpx.Timeout(
+            _setting("LLM_TIMEOUT", 60.0),
+            connect=_setting("LLM_CONNECT_TIMEOUT", 5.0),
+        ),
+    }
+
+
+def _build_http_client() -> httpx.Client:
+    """Keep-alive connection pool shared by every request going through one client."""
+    return httpx.Client(**_http_client_options())
+
+
+def _build_async_http_client() -> httpx.AsyncClient:
+    """Async counterpart of _build_http_client; only usable on the event loop that created it."""
+    return httpx.AsyncClient(**_http_client_options())
+
+
+async def gather_limited(
+        calls: Iterable[Awaitable[Any]],
+        limit: Optional[int] = None,
+        timeout: Optional[float] = None,
+) -> List[Any]:
+    """
+    Await independent calls concurrently and return their results in order.
+    At most `limit` run at once (default LLM_CONCURRENCY) and each one gets `timeout`
+    seconds (default LLM_CALL_TIMEOUT). A call that fails or times out does not cancel
+    the others: its exception is returned in its place.
+    """
+    limit = limit or _setting("LLM_CONCURRENCY", 8)
+    timeout = timeout if timeout is not None else _setting("LLM_CALL_TIMEOUT", 30.0)
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(call):
+        async with semaphore:
+            return await asyncio.wait_for(call, timeout)
+
+    return await asyncio.gather(*(run(c) for c in calls), return_exceptions=True)
+
+
+class AnswerCache:
+    """
+    Thread-safe TTL + LRU cache of assistant answers.
+    Keys are (scope, context version, normalized question). A scope is usually a product id:
+    as soon as a new context version is seen for a scope, all entries of older versions are dropped.
+    A version the scope has moved on from is neither served nor cached, so a request still
+    holding an old context (e.g. from a worker that has not seen the update) cannot purge
+    the newer entries. Versions are remembered for the `max_entries` most recently used scopes.
+    """
+
+    _PUNCT_RE = re.compile(r"[\s?？!！.。,，;；:：]+")
+    # Replaced versions remembered per scope, besides the current one
+    RETIRED_VERSIONS = 4
+
+    def __init__(self, max_entries: int = 2048, ttl: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[tuple, Tuple[float, str]]" = OrderedDict()
+        # Scope -> (current version, *versions it replaced, newest first), in LRU order
+        self._scope_versions: "OrderedDict[Hashable, Tuple[str, ...]]" = OrderedDict()
+        self._scope_keys: Dict[Hashable, Set[tuple]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def normalize(cls, question: str) -> str:
+        """Case-fold and collapse whitespace/punctuation, so trivial variants share an entry."""
+        return cls._PUNCT_RE.sub(" ", (question or "").casefold()).strip()
+
+    def _drop(self, key: tuple):
+        self._data.pop(key, None)
+        keys = self._scope_keys.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._scope_keys[key[0]]
+
+    def _check_version(self, scope: Hashable, version: str) -> bool:
+        """
+        Forget a scope's entries once a new context version is seen for it. Returns False
+        for a version the scope has moved on from.
+        """
+        versions = self._scope_versions.get(scope, ())
+        if version in versions:
+            self._scope_versions.move_to_end(scope)
+            return version == versions[0]
+        for key in self._scope_keys.pop(scope, set()):
+            self._data.pop(key, None)
+        self._scope_versions[scope] = (version, *versions[:self.RETIRED_VERSIONS])
+        self._scope_versions.move_to_end(scope)
+        while len(self._scope_versions) > self.max_entries:
+            self._scope_versions.popitem(last=False)
+        return True
+
+    def get(self, scope: Hashable, version: str, question: str) -> Optional[str]:
+        key = (scope, version, self.normalize(question))
+        with self._lock:
+            if not self._check_version(scope, version):
+                self.misses += 1
+                return None
+            item = self._data.get(key)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, scope: Hashable, version: str, question: str, answer: str):
+        key = (scope, version, self.normalize(question))
+        with self._lock:
+            if not self._check_version(scope, version):
+                return
+            self._data[key] = (time.monotonic() + self.ttl, answer)
+            self._data.move_to_end(key)
+            self._scope_keys.setdefault(scope, set()).add(key)
+            while len(self._data) > self.max_entries:
+                oldest = next(iter(self._data))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._scope_versions.clear()
+            self._scope_keys.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
+
+
+_answer_cache: Optional[AnswerCache] = None
+_answer_cache_lock = threading.Lock()
+
+
+def get_answer_cache() -> AnswerCache:
+    """Process-wide answer cache, sized from LLM_ANSWER_CACHE_SIZE / LLM_ANSWER_CACHE_TTL."""
+    global _answer_cache
+    if _answer_cache is None:
+        with _answer_cache_lock:
+            if _answer_cache is None:
+                _answer_cache = AnswerCache(
+                    max_entries=_setting("LLM_ANSWER_CACHE_SIZE", 2048),
+                    ttl=_setting("LLM_ANSWER_CACHE_TTL", 3600.0),
+                )
+    return _answer_cache
+
+
+class DescriptionStats:
+    """
+    Thread-safe running totals of description generation per mode ("json" / "separate"),
+    so the two modes can be compared on real products. JSON-mode totals include the
+    failed attempt and the two-call fallback whenever the JSON could not be used.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals: Dict[str, Dict[str, float]] = {}
+        self.fallbacks = 0
+
+    def record(self, mode: str, usage: Usage, seconds: float, fallback: bool = False):
+        with self._lock:
+            t = self._totals.setdefault(
+                mode, {"products": 0, "prompt_tokens": 0, "completion_tokens": 0, "seconds": 0.0}
+            )
+            t["products"] += 1
+            t["prompt_tokens"] += usage[0]
+            t["completion_tokens"] += usage[1]
+            t["seconds"] += seconds
+            if fallback:
+                self.fallbacks += 1
+        logger.info(
+            "description mode=%s prompt_tokens=%d completion_tokens=%d seconds=%.3f fallback=%s",
+            mode, usage[0], usage[1], seconds, fallback,
+        )
+
+    def reset(self):
+        with self._lock:
+            self._totals.clear()
+            self.fallbacks = 0
+
+    def stats(self) -> dict:
+        """Totals and per-product averages per mode; `saved_per_product` once both modes ran."""
+        with self._lock:
+            out = {"fallbacks": self.fallbacks}
+            for mode, t in self._totals.items():
+                n = t["products"] or 1
+                out[mode] = dict(
+                    t,
+                    avg_tokens=(t["prompt_tokens"] + t["completion_tokens"]) / n,
+                    avg_prompt_tokens=t["prompt_tokens"] / n,
+                    avg_seconds=t["seconds"] / n,
+                )
+        if "json" in out and "separate" in out:
+            js, sep = out["json"], out["separate"]
+            out["saved_per_product"] = {
+                "tokens": sep["avg_tokens"] - js["avg_tokens"],
+                "prompt_tokens": sep["avg_prompt_tokens"] - js["avg_prompt_tokens"],
+                "seconds": sep["avg_seconds"] - js["avg_seconds"],
+            }
+        return out
+
+
+_desc_stats = DescriptionStats()
+
+
+def get_description_stats() -> DescriptionStats:
+    return _desc_stats
+
+
+class LLMError(Exception):
+    """No provider could complete the call. Nothing should be saved: show a message or retry later."""
+
+
+T = TypeVar("T")
+
+
+class _Provider:
+    """
+    One OpenAI-compatible provider of the failover chain: a pooled sync client, one async
+    client per event loop, a circuit breaker and recent latencies (per operation) for hedging.
+    """
+
+    def __init__(
+            self, name: str, api_key: str, model: str, base_url: str, http_client: Optional[httpx.Client] = None
+    ):
+        self.name, self.api_key, self.model, self.base_url = name, api_key, model, base_url
+        self._http_client = http_client or _build_http_client()
+        # No SDK retries: LLMClient._attempt_plan and the breakers own retrying, and SDK retries
+        # under each attempt would multiply the calls (and the wait) per question
+        self.client = OpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=self._http_client,
+            max_retries=0,
+        )
+        # Async clients hold connections bound to one event loop: keep one per running loop
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._async_lock = threading.Lock()
+        self.breaker = CircuitBreaker(_setting("LLM_BREAKER_FAILURES", 5), _setting("LLM_BREAKER_RESET", 30.0))
+        # Operation -> recent latencies (whole response; time to the first token for streams)
+        self.latency: Dict[str, LatencyWindow] = {}
+        self._latency_lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<provider {self.name} model={self.model}>"
+
+    def close(self):
+        self._http_client.close()
+
+    def async_client(self) -> AsyncOpenAI:
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = AsyncOpenAI(
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                    http_client=_build_async_http_client(),
+                    max_retries=0,
+                )
+                self._async_clients[loop] = client
+        return client
+
+    def latency_window(self, operation: str) -> LatencyWindow:
+        window = self.latency.get(operation)
+        if window is None:
+            with self._latency_lock:
+                window = self.latency.setdefault(operation, LatencyWindow())
+        return window
+
+    def hedge_delay(self, operation: str) -> float:
+        """Seconds to wait for this provider before hedging: the operation's recent LLM_HEDGE_PERCENTILE latency."""
+        window = self.latency_window(operation)
+        if len(window) < _setting("LLM_HEDGE_MIN_SAMPLES", 20):
+            return _setting("LLM_HEDGE_DELAY", 2.0)
+        return max(_setting("LLM_HEDGE_MIN_DELAY", 0.1), window.percentile(_setting("LLM_HEDGE_PERCENTILE", 95.0)))
+
+
+_call_pool: Optional[ThreadPoolExecutor] = None
+_call_pool_lock = threading.Lock()
+
+
+def _get_call_pool() -> ThreadPoolExecutor:
+    """Threads running hedged synchronous calls (a hedge needs the first call off the caller's thread)."""
+    global _call_pool
+    if _call_pool is None:
+        with _call_pool_lock:
+            if _call_pool is None:
+                _call_pool = ThreadPoolExecutor(
+                    max_workers=_setting("LLM_HEDGE_THREADS", 64), thread_name_prefix="llm-call"
+                )
+    return _call_pool
 
 
 class LLMClient:
@@ -10,6 +410,12 @@ class LLMClient:
     - Preferred env vars: LLM_PROVIDER / LLM_API_KEY / LLM_MODEL
     - Also compatible with OPENAI_API_KEY / DEEPSEEK_API_KEY
     - Default model: gpt-4.1-mini (OpenAI)
+    - LLM_FALLBACK_PROVIDERS: providers tried next, in order (key from <NAME>_API_KEY,
+      model from <NAME>_MODEL or the provider default, URL from <NAME>_BASE_URL if set)
+    Calls fail over along the chain and skip providers whose circuit breaker is open. With
+    LLM_HEDGE and a fallback provider they are also hedged: a request to the next provider
+    goes out when the first is slower than its recent p95 for that operation, and the first
+    response wins. When every provider fails, LLMError is raised.
     """
 
     # provider defaults
@@ -23,72 +429,355 @@ class LLMClient:
         "deepseek": "https://api.deepseek.com/v1",
     }
 
+    # Languages of the product descriptions (the JSON mode returns exactly these)
+    DESC_LANGS = ("en", "zh")
+
     # initialization
     def __init__(
             self,
             provider: Optional[str] = None,
             api_key: Optional[str] = None,
             model: Optional[str] = None,
+            http_client: Optional[httpx.Client] = None,
     ):
-        # Read provider/key from environment variables
-        prov = (provider or os.getenv("LLM_PROVIDER") or "").strip().lower()
-        key = api_key or os.getenv("LLM_API_KEY")
-
-        # Try common variable names if not explicitly set
-        if not key:
-            if os.getenv("OPENAI_API_KEY"):
-                prov = prov or "openai"
-                key = os.getenv("OPENAI_API_KEY")
-            elif os.getenv("DEEPSEEK_API_KEY"):
-                prov = prov or "deepseek"
-                key = os.getenv("DEEPSEEK_API_KEY")
-
-        # Determine provider: use "openai" if a key exists, otherwise dummy
-        if not prov:
-            prov = "openai" if key else "dummy"
-
-        self.provider = prov
-        self.api_key = key or ""
-        self.model = (
-                model
-                or os.getenv("LLM_MODEL")
-                or self._DEFAULT_MODELS.get(self.provider, "")
+        self.provider, self.api_key, self.model = _resolve_config(provider, api_key, model)
+
+        # LLM_BASE_URL points an OpenAI-compatible provider elsewhere (a proxy, or ai/mock_server.py)
+        self.base_url = _setting("LLM_BASE_URL", "") or self._BASE_URLS.get(self.provider, "")
+        self._providers: List[_Provider] = []
+        if self.provider in self._BASE_URLS and self.api_key:
+            self._providers.append(_Provider(self.provider, self.api_key, self.model, self.base_url, http_client))
+            self._providers += self._fallback_providers()
+
+        # Client of the main provider (None → dummy output)
+        self.client: Optional[OpenAI] = self._providers[0].client if self._providers else None
+
+        chain = " → ".join(f"{p.name}/{p.model}" for p in self._providers[1:])
+        logger.info(
+            "LLMClient initialized provider=%s model=%s%s",
+            self.provider, self.model, f" fallback={chain}" if chain else "",
         )
 
-        # Initialize OpenAI-compatible client
-        self.client: Optional[OpenAI] = None
-        if self.provider in {"openai", "deepseek"} and self.api_key:
-            base = self._BASE_URLS[self.provider]
-            self.client = OpenAI(api_key=self.api_key, base_url=base)
+    def _fallback_providers(self) -> List[_Provider]:
+        names = _setting("LLM_FALLBACK_PROVIDERS", "")
+        if isinstance(names, str):
+            names = names.split(",")
+        out, seen = [], {self.provider}
+        for name in (n.strip().lower() for n in names):
+            key = os.getenv(f"{name.upper()}_API_KEY")
+            if name in seen or name not in self._BASE_URLS or not key:
+                continue
+            seen.add(name)
+            model = os.getenv(f"{name.upper()}_MODEL") or self._DEFAULT_MODELS[name]
+            base_url = os.getenv(f"{name.upper()}_BASE_URL") or self._BASE_URLS[name]
+            out.append(_Provider(name, key, model, base_url))
+        return out
 
-        print(f"[LLMClient] Initialized provider={self.provider}, model={self.model}")
+    def close(self):
+        """Close the underlying connection pools."""
+        for p in self._providers:
+            p.close()
 
     # internal helpers
-    def _dummy(self, prompt: str) -> str:
+    def _dummy(self, prompt: str, json_mode: bool = False) -> str:
         """Return placeholder text when no API key is configured."""
         short = (prompt or "")[:160].replace("\n", " ")
-        return f"[Dummy AI Output] {short} ..."
+        text = f"[Dummy AI Output] {short} ..."
+        if json_mode:
+            return json.dumps({lang: text for lang in self.DESC_LANGS})
+        return text
 
-    def _chat(self, prompt: str, max_tokens: int = 200, temperature: float = 0.7) -> str:
-        """Low-level chat wrapper for model calls."""
+    def _attempt_plan(self) -> Iterator[_Provider]:
+        """
+        Providers to try, in order, skipping open circuits: the only retries of a call (the
+        clients make none). A single provider is tried twice, so it is retried once after a
+        failure (it is never hedged against itself).
+        """
+        if not self.model:
+            raise LLMError("No model configured. Please set LLM_MODEL in .env.")
+        chain = self._providers if len(self._providers) > 1 else self._providers * 2
+        return (p for p in chain if p.breaker.allow())
+
+    def _hedging(self) -> bool:
+        """Hedge only with LLM_HEDGE and another provider to send the hedge to."""
+        return _setting("LLM_HEDGE", False) and len(self._providers) > 1
+
+    @staticmethod
+    def _timed(p: _Provider, operation: str, attempt: Callable[[_Provider], T]) -> T:
+        start = time.perf_counter()
+        try:
+            result = attempt(p)
+        except Exception:
+            p.breaker.record_failure()
+            raise
+        p.breaker.record_success()
+        p.latency_window(operation).add(time.perf_counter() - start)
+        return result
+
+    @staticmethod
+    def _failed(errors: List[Tuple[_Provider, BaseException]]) -> LLMError:
+        if not errors:
+            return LLMError("All LLM providers are unavailable (circuit open).")
+        error = LLMError("; ".join(f"{p.name}: {e}" for p, e in errors))
+        # The last provider error, so metrics can report its class
+        error.__cause__ = errors[-1][1]
+        error.attempts = len(errors)
+        return error
+
+    def _record(
+            self,
+            operation: str,
+            start: float,
+            provider: Optional[_Provider] = None,
+            usage: Usage = NO_USAGE,
+            error: Optional[BaseException] = None,
+            **extra,
+    ):
+        """Report one logical call (all its failover/hedge attempts) to the LLM metrics."""
+        error_class = type(error.__cause__ or error).__name__ if error is not None else ""
+        name, model = (provider.name, provider.model) if provider else (self.provider, self.model)
+        get_llm_metrics().record(
+            operation, name, model, time.perf_counter() - start,
+            prompt_tokens=usage[0], completion_tokens=usage[1], error=error_class, **extra,
+        )
+
+    def _call(self, attempt: Callable[[_Provider], T], operation: str) -> Tuple[T, _Provider, int]:
+        """
+        Run attempt(provider) along the provider chain: fail over on errors and, when
+        hedging, send a hedge request to the next provider once the first is slower than
+        its hedge delay for `operation`. The first success wins; a losing call finishes in
+        the background. Returns (result, winning provider, requests sent).
+        """
+        plan = self._attempt_plan()
+        errors: List[Tuple[_Provider, BaseException]] = []
+        if not self._hedging():
+            # Nothing to hedge to: call on the caller's thread, no pool hop
+            for p in plan:
+                try:
+                    return self._timed(p, operation, attempt), p, len(errors) + 1
+                except Exception as e:
+                    errors.append((p, e))
+            raise self._failed(errors)
+
+        pool = _get_call_pool()
+        pending: Dict[Future, _Provider] = {}
+        sent = 0
+
+        def launch() -> Optional[_Provider]:
+            nonlocal sent
+            p = next(plan, None)
+            if p is not None:
+                pending[pool.submit(self._timed, p, operation, attempt)] = p
+                sent += 1
+            return p
+
+        first = launch()
+        hedge_after = first.hedge_delay(operation) if first else None
+        while pending:
+            done, _ = wait(pending, timeout=hedge_after, return_when=FIRST_COMPLETED)
+            if not done:
+                hedge_after = None
+                launch()
+                continue
+            for future in done:
+                p = pending.pop(future)
+                if future.exception() is None:
+                    return future.result(), p, sent
+                errors.append((p, future.exception()))
+            if not pending:
+                launch()
+        raise self._failed(errors)
+
+    @staticmethod
+    async def _atimed(p: _Provider, operation: str, attempt: Callable[[_Provider], Awaitable[T]]) -> T:
+        start = time.perf_counter()
+        try:
+            result = await attempt(p)
+        except asyncio.CancelledError:
+            # Lost a hedge race: no verdict on the provider
+            p.breaker.release()
+            raise
+        except Exception:
+            p.breaker.record_failure()
+            raise
+        p.breaker.record_success()
+        p.latency_window(operation).add(time.perf_counter() - start)
+        return result
+
+    async def _acall(
+            self, attempt: Callable[[_Provider], Awaitable[T]], operation: str
+    ) -> Tuple[T, _Provider, int]:
+        """Async counterpart of _call; the losing request of a hedge is cancelled."""
+        plan = self._attempt_plan()
+        errors: List[Tuple[_Provider, BaseException]] = []
+        pending: Dict[asyncio.Task, _Provider] = {}
+        sent = 0
+
+        def launch() -> Optional[_Provider]:
+            nonlocal sent
+            p = next(plan, None)
+            if p is not None:
+                pending[asyncio.ensure_future(self._atimed(p, operation, attempt))] = p
+                sent += 1
+            return p
+
+        first = launch()
+        hedge_after = first.hedge_delay(operation) if first and self._hedging() else None
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, timeout=hedge_after, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedge_after = None
+                    launch()
+                    continue
+                for task in done:
+                    p = pending.pop(task)
+                    if task.exception() is None:
+                        return task.result(), p, sent
+                    errors.append((p, task.exception()))
+                if not pending:
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+        raise self._failed(errors)
+
+    def _complete(
+            self, prompt: str, max_tokens: int = 200, temperature: float = 0.7, json_mode: bool = False,
+            operation: str = "chat",
+    ) -> Tuple[str, Usage]:
+        """
+        Low-level chat call returning (text, usage); json_mode asks for a JSON object. Raises LLMError.
+        The call is recorded in the LLM metrics under `operation`.
+        """
+        start = time.perf_counter()
         if not self.client:
             # No client available → dummy output
-            return self._dummy(prompt)
+            self._record(operation, start)
+            return self._dummy(prompt, json_mode), NO_USAGE
 
-        if not self.model:
-            return "[AI Error] No model configured. Please set LLM_MODEL in .env."
+        def attempt(p: _Provider) -> Tuple[str, Usage]:
+            resp = p.client.chat.completions.create(
+                model=p.model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **self._json_kwargs(json_mode),
+            )
+            return (resp.choices[0].message.content or "").strip(), _usage(resp)
 
         try:
-            resp = self.client.chat.completions.create(
-                model=self.model,
+            (text, usage), p, sent = self._call(attempt, operation)
+        except LLMError as e:
+            self._record(operation, start, error=e, attempts=getattr(e, "attempts", 0))
+            raise
+        self._record(operation, start, p, usage, attempts=sent)
+        return text, usage
+
+    async def _acomplete(
+            self, prompt: str, max_tokens: int = 200, temperature: float = 0.7, json_mode: bool = False,
+            operation: str = "chat",
+    ) -> Tuple[str, Usage]:
+        """Async counterpart of _complete."""
+        start = time.perf_counter()
+        if not self.client:
+            self._record(operation, start)
+            return self._dummy(prompt, json_mode), NO_USAGE
+
+        async def attempt(p: _Provider) -> Tuple[str, Usage]:
+            resp = await p.async_client().chat.completions.create(
+                model=p.model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=temperature,
                 max_tokens=max_tokens,
+                **self._json_kwargs(json_mode),
             )
-            return (resp.choices[0].message.content or "").strip()
+            return (resp.choices[0].message.content or "").strip(), _usage(resp)
+
+        try:
+            (text, usage), p, sent = await self._acall(attempt, operation)
+        except asyncio.CancelledError as e:
+            # Usually a timeout of the caller (gather_limited)
+            self._record(operation, start, error=e)
+            raise
+        except LLMError as e:
+            self._record(operation, start, error=e, attempts=getattr(e, "attempts", 0))
+            raise
+        self._record(operation, start, p, usage, attempts=sent)
+        return text, usage
+
+    @staticmethod
+    def _json_kwargs(json_mode: bool) -> dict:
+        return {"response_format": {"type": "json_object"}} if json_mode else {}
+
+    def _chat(self, prompt: str, max_tokens: int = 200, temperature: float = 0.7, operation: str = "chat") -> str:
+        """Low-level chat wrapper for model calls."""
+        return self._complete(prompt, max_tokens, temperature, operation=operation)[0]
+
+    async def _achat(
+            self, prompt: str, max_tokens: int = 200, temperature: float = 0.7, operation: str = "chat"
+    ) -> str:
+        """Async counterpart of _chat."""
+        return (await self._acomplete(prompt, max_tokens, temperature, operation=operation))[0]
+
+    async def _astream_chat(
+            self, prompt: str, max_tokens: int = 200, temperature: float = 0.7, operation: str = "chat_stream"
+    ) -> AsyncIterator[str]:
+        """
+        Async chat call yielding the completion as it is generated (text deltas).
+        Failover and hedging apply until the first token arrives; a stream that breaks
+        after that raises LLMError. The metrics get the whole stream's latency, the
+        time to the first token (`ttft`) and the usage the provider reports at the end.
+        """
+        start = time.perf_counter()
+        if not self.client:
+            # Dummy mode: stream the placeholder word by word
+            for word in re.split(r"(?<= )", self._dummy(prompt)):
+                yield word
+                await asyncio.sleep(0)
+            self._record(operation, start)
+            return
+
+        async def attempt(p: _Provider):
+            stream = await p.async_client().chat.completions.create(
+                model=p.model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            try:
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        return chunk.choices[0].delta.content, stream
+            except BaseException:
+                await stream.close()
+                raise
+            return "", stream
+
+        try:
+            (first, stream), p, sent = await self._acall(attempt, operation)
+        except LLMError as e:
+            self._record(operation, start, error=e, attempts=getattr(e, "attempts", 0))
+            raise
+        ttft = round(time.perf_counter() - start, 4)
+        usage, error = NO_USAGE, None
+        try:
+            if first:
+                yield first
+            async for chunk in stream:
+                if chunk.usage is not None:
+                    # Last chunk (include_usage): no choices, just the totals
+                    usage = _usage(chunk)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
         except Exception as e:
-            # Return a readable error message for debugging
-            return f"[AI Error] provider={self.provider}, model={self.model}, error={e}"
+            error = LLMError(f"stream interrupted: {e}")
+            raise error from e
+        finally:
+            await stream.close()
+            self._record(operation, start, p, usage, error=error, attempts=sent, ttft=ttft)
 
     # public APIs
     def generate_product_desc(
@@ -98,6 +787,205 @@ class LLMClient:
         Generate a persuasive yet factual e-commerce product description.
         Tone: natural, warm, and subtly persuasive.
         """
+        prompt, max_toks = self._desc_prompt(name, category, unit, stock, lang)
+        return self._chat(prompt, max_tokens=max_toks, temperature=0.8, operation="product_desc")
+
+    async def agenerate_product_desc(
+            self, name: str, category: str, unit: str, stock: int, lang: str = "en"
+    ) -> str:
+        """Async counterpart of generate_product_desc."""
+        prompt, max_toks = self._desc_prompt(name, category, unit, stock, lang)
+        return await self._achat(prompt, max_tokens=max_toks, temperature=0.8, operation="product_desc")
+
+    def _desc_mode(self, mode: Optional[str], langs: Sequence[str]) -> str:
+        mode = (mode or _setting("LLM_DESC_MODE", "json")).strip().lower()
+        # The combined prompt covers exactly English + Chinese
+        if mode == "json" and tuple(langs) != self.DESC_LANGS:
+            return "separate"
+        return mode if mode in {"json", "separate"} else "separate"
+
+    def description_cost(
+            self, name: str, category: str, unit: str, stock: int,
+            langs: Sequence[str] = DESC_LANGS, mode: Optional[str] = None,
+    ) -> Tuple[int, int]:
+        """
+        Upper-bound estimate of (requests, tokens) for generate_descriptions, for rate limiting:
+        estimated prompt tokens plus the completion budget (JSON fallbacks not included).
+        """
+        if self._desc_mode(mode, langs) == "json":
+            prompts = [self._desc_json_prompt(name, category, unit, stock)]
+        else:
+            prompts = [self._desc_prompt(name, category, unit, stock, lang) for lang in langs]
+        return len(prompts), sum(estimate_tokens(prompt) + max_toks for prompt, max_toks in prompts)
+
+    def description_batch_requests(
+            self, key: str, name: str, category: str, unit: str, stock: int,
+            langs: Sequence[str] = DESC_LANGS, mode: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        Batch-file request lines (see ai.batch) for generate_descriptions: custom_id "<key>:json"
+        for the combined JSON prompt, "<key>:<lang>" per language otherwise.
+        Read the results back with parse_description_result().
+        """
+        from .batch import request_line
+
+        if self._desc_mode(mode, langs) == "json":
+            prompt, max_toks = self._desc_json_prompt(name, category, unit, stock)
+            return [request_line(f"{key}:json", self.model, prompt, max_toks, 0.8, json_mode=True)]
+        lines = []
+        for lang in langs:
+            prompt, max_toks = self._desc_prompt(name, category, unit, stock, lang)
+            lines.append(request_line(f"{key}:{lang}", self.model, prompt, max_toks, 0.8))
+        return lines
+
+    @classmethod
+    def parse_description_result(cls, custom_id: str, text: str) -> Tuple[str, Optional[Dict[str, str]]]:
+        """(key, {lang: description}) from a description batch result; None when unusable."""
+        key, _, part = custom_id.rpartition(":")
+        if part == "json":
+            return key, cls._parse_desc_json(text)
+        if not text:
+            return key, None
+        return key, {part: text}
+
+    def generate_descriptions(
+            self,
+            name: str,
+            category: str,
+            unit: str,
+            stock: int,
+            langs: Sequence[str] = DESC_LANGS,
+            mode: Optional[str] = None,
+    ) -> Descriptions:
+        """
+        Descriptions for every language of `langs` (with the token usage in `.usage`).
+        mode "json" (default: LLM_DESC_MODE) asks for English and Chinese in one JSON response
+        and falls back to one call per language when the reply cannot be parsed;
+        mode "separate" always makes one call per language.
+        Raises LLMError when no provider could answer.
+        """
+        mode = self._desc_mode(mode, langs)
+        start = time.perf_counter()
+        usage = NO_USAGE
+        if mode == "json":
+            prompt, max_toks = self._desc_json_prompt(name, category, unit, stock)
+            text, usage = self._complete(
+                prompt, max_tokens=max_toks, temperature=0.8, json_mode=True, operation="descriptions_json"
+            )
+            descs = self._parse_desc_json(text)
+            if descs:
+                _desc_stats.record("json", usage, time.perf_counter() - start)
+                return Descriptions(descs, usage)
+
+        out = {}
+        for lang in langs:
+            prompt, max_toks = self._desc_prompt(name, category, unit, stock, lang)
+            out[lang], used = self._complete(prompt, max_tokens=max_toks, temperature=0.8, operation="descriptions")
+            usage = (usage[0] + used[0], usage[1] + used[1])
+        _desc_stats.record(mode, usage, time.perf_counter() - start, fallback=mode == "json")
+        return Descriptions(out, usage)
+
+    async def agenerate_descriptions(
+            self,
+            name: str,
+            category: str,
+            unit: str,
+            stock: int,
+            langs: Sequence[str] = DESC_LANGS,
+            timeout: Optional[float] = None,
+            mode: Optional[str] = None,
+    ) -> Descriptions:
+        """
+        Async counterpart of generate_descriptions. One call per language (the "separate"
+        mode and the JSON fallback) runs concurrently, so it takes about as long as the
+        slowest call instead of the sum of all of them.
+        """
+        mode = self._desc_mode(mode, langs)
+        start = time.perf_counter()
+        usage = NO_USAGE
+        if mode == "json":
+            prompt, max_toks = self._desc_json_prompt(name, category, unit, stock)
+            [result] = await gather_limited(
+                [self._acomplete(
+                    prompt, max_tokens=max_toks, temperature=0.8, json_mode=True, operation="descriptions_json"
+                )],
+                timeout=timeout,
+            )
+            if isinstance(result, BaseException):
+                # Providers that failed (or timed out) once will not do better twice: no fallback
+                raise self._as_llm_error(result)
+            text, usage = result
+            descs = self._parse_desc_json(text)
+            if descs:
+                _desc_stats.record("json", usage, time.perf_counter() - start)
+                return Descriptions(descs, usage)
+
+        calls = []
+        for lang in langs:
+            prompt, max_toks = self._desc_prompt(name, category, unit, stock, lang)
+            calls.append(self._acomplete(prompt, max_tokens=max_toks, temperature=0.8, operation="descriptions"))
+        results = await gather_limited(calls, timeout=timeout)
+
+        out = {}
+        for lang, result in zip(langs, results):
+            if isinstance(result, BaseException):
+                raise self._as_llm_error(result)
+            out[lang], used = result
+            usage = (usage[0] + used[0], usage[1] + used[1])
+        _desc_stats.record(mode, usage, time.perf_counter() - start, fallback=mode == "json")
+        return Descriptions(out, usage)
+
+    @staticmethod
+    def _as_llm_error(exc: BaseException) -> LLMError:
+        if isinstance(exc, LLMError):
+            return exc
+        error = LLMError("timed out" if isinstance(exc, asyncio.TimeoutError) else str(exc))
+        error.__cause__ = exc
+        return error
+
+    @classmethod
+    def _parse_desc_json(cls, text: str) -> Optional[Dict[str, str]]:
+        """{"en": ..., "zh": ...} from a JSON-mode reply, or None when it is unusable."""
+        if not text:
+            return None
+        # Some models still wrap JSON in a code fence
+        text = re.sub(r"^```(?:json)?\s*|\s*```$", "", text.strip())
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return None
+        if not isinstance(data, dict):
+            return None
+        descs = {}
+        for lang in cls.DESC_LANGS:
+            value = data.get(lang)
+            if not isinstance(value, str) or not value.strip():
+                return None
+            descs[lang] = value.strip()
+        return descs
+
+    @staticmethod
+    def _desc_json_prompt(name: str, category: str, unit: str, stock: int) -> Tuple[str, int]:
+        """(prompt, max tokens) asking for the English and Chinese descriptions as one JSON object."""
+        prompt = f"""
+            Write two e-commerce product descriptions for an agricultural item:
+            one in English and one in natural Simplified Chinese (not a literal translation).
+            - Product name: {name}
+            - Category: {category}
+            - Unit of sale: {unit}
+            - Stock quantity: {stock} (total available, not per-unit)
+            Guidelines for both:
+            1. Use 3–4 natural sentences.
+            2. Encourage the reader to purchase while sounding trustworthy and warm, without exaggeration.
+            3. Naturally mention stock, e.g. “Now {stock} {unit} available for order.” / “现有{stock}{unit}现货”.
+            4. Avoid headings, lists, or marketing clichés; keep it concise and genuine.
+            Reply with only a JSON object of the form {{"en": "<English description>", "zh": "<中文描述>"}}.
+            """
+        return prompt, 520
+
+    @staticmethod
+    def _desc_prompt(name: str, category: str, unit: str, stock: int, lang: str) -> Tuple[str, int]:
+        """(prompt, max tokens) for a product description in `lang`."""
         lang_norm = (lang or "en").strip().lower()
         if lang_norm in {"zh", "cn", "zh-cn", "chinese"}:
             prompt = f"""
@@ -127,17 +1015,110 @@ class LLMClient:
                 4. Avoid headings, lists, or marketing clichés; keep it concise and genuine.
                 """
             max_toks = 220
+        return prompt, max_toks
 
-        return self._chat(prompt, max_tokens=max_toks, temperature=0.8)
-
-    def answer_question(self, question: str, product_context: str) -> str:
+    def answer_question(
+            self,
+            question: str,
+            product_context: str,
+            cache_scope: Optional[Hashable] = None,
+            context_version: Optional[str] = None,
+    ) -> str:
         """
         Answer a short customer question based on product info.
         Args:
             question: user question text
             product_context: product data context string
+            cache_scope: key grouping cached answers (e.g. product id); defaults to one shared scope
+            context_version: version of product_context; defaults to a hash of the text
+        Repeated questions for the same context version are served from the answer cache.
+        Raises LLMError when no provider could answer.
         """
-        prompt = (
+        start = time.perf_counter()
+        cache = get_answer_cache()
+        scope, version = self._answer_cache_key(product_context, cache_scope, context_version)
+        cached = cache.get(scope, version, question)
+        if cached is not None:
+            self._record_cache_hit("answer", start)
+            return cached
+
+        prompt = self._answer_prompt(question, product_context)
+        answer = self._chat(prompt, max_tokens=200, temperature=0.5, operation="answer")
+        cache.set(scope, version, question, answer)
+        return answer
+
+    async def aanswer_question(
+            self,
+            question: str,
+            product_context: str,
+            cache_scope: Optional[Hashable] = None,
+            context_version: Optional[str] = None,
+    ) -> str:
+        """Async counterpart of answer_question (same answer cache)."""
+        start = time.perf_counter()
+        cache = get_answer_cache()
+        scope, version = self._answer_cache_key(product_context, cache_scope, context_version)
+        cached = cache.get(scope, version, question)
+        if cached is not None:
+            self._record_cache_hit("answer", start)
+            return cached
+
+        prompt = self._answer_prompt(question, product_context)
+        answer = await self._achat(prompt, max_tokens=200, temperature=0.5, operation="answer")
+        cache.set(scope, version, question, answer)
+        return answer
+
+    async def astream_answer(
+            self,
+            question: str,
+            product_context: str,
+            cache_scope: Optional[Hashable] = None,
+            context_version: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Streaming variant of answer_question: yields the answer in pieces as the model writes it.
+        A cached answer is yielded in one piece; a completed answer is added to the cache.
+        """
+        start = time.perf_counter()
+        cache = get_answer_cache()
+        scope, version = self._answer_cache_key(product_context, cache_scope, context_version)
+        cached = cache.get(scope, version, question)
+        if cached is not None:
+            self._record_cache_hit("answer_stream", start)
+            yield cached
+            return
+
+        prompt = self._answer_prompt(question, product_context)
+        parts = []
+        async for delta in self._astream_chat(prompt, max_tokens=200, temperature=0.5, operation="answer_stream"):
+            parts.append(delta)
+            yield delta
+        answer = "".join(parts).strip()
+        if answer:
+            cache.set(scope, version, question, answer)
+
+    def answer_batch_request(self, custom_id: str, question: str, product_context: str) -> dict:
+        """Batch-file request line (see ai.batch) for answer_question."""
+        from .batch import request_line
+
+        return request_line(custom_id, self.model, self._answer_prompt(question, product_context), 200, 0.5)
+
+    def _record_cache_hit(self, operation: str, start: float):
+        # Provider "cache": no request was sent, so it stays out of the providers' latency and cost
+        get_llm_metrics().record(operation, "cache", self.model, time.perf_counter() - start, cache_hit=True)
+
+    @staticmethod
+    def _answer_cache_key(
+            product_context: str, cache_scope: Optional[Hashable], context_version: Optional[str]
+    ) -> Tuple[Hashable, str]:
+        version = context_version or hashlib.sha1((product_context or "").encode()).hexdigest()
+        # Without a scope each context version is its own scope, so contexts never purge each other
+        scope = cache_scope if cache_scope is not None else version
+        return scope, version
+
+    @staticmethod
+    def _answer_prompt(question: str, product_context: str) -> str:
+        return (
             "You are a helpful and friendly customer assistant for an agricultural marketplace.\n"
             "Use the provided product info to answer naturally and accurately.\n"
             "If the question is about price, stock, or shipping, use the numbers from context.\n"
@@ -145,4 +1126,34 @@ class LLMClient:
             f"Product information: {product_context}\n"
             f"Customer question: {question}"
         )
-        return self._chat(prompt, max_tokens=200, temperature=0.5)
+
+
+
+# shared client registry
+_clients: Dict[Tuple[str, str, str], LLMClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_llm_client(provider: Optional[str] = None, model: Optional[str] = None) -> LLMClient:
+    """
+    Return the process-wide LLMClient for (provider, model), creating it on first use.
+    Clients are thread-safe, so every request reuses the same keep-alive connections.
+    """
+    prov, key, mdl = _resolve_config(provider, None, model)
+    registry_key = (prov, mdl, key)
+    client = _clients.get(registry_key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(registry_key)
+            if client is None:
+                client = LLMClient(provider=prov, api_key=key, model=mdl)
+                _clients[registry_key] = client
+    return client
+
+
+def reset_llm_clients():
+    """Close and forget all shared clients (for tests, or after changing LLM settings)."""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
@@ -0,0 +1,241 @@
+# ai/metrics.py
+"""
+In-process instrumentation of LLM calls.
+
+Every call made through LLMClient is recorded once — operation, provider, model,
+tokens, latency, error class, cache hit — and aggregated per (endpoint, operation,
+provider, model) into counters and a latency histogram. The endpoint is the URL name
+of the request (or job kind) that made the call, set through `current_endpoint`.
+With LLM_METRICS_LOG set, each call is also appended to that file as one JSON line.
+
+Totals are per process: each web or worker process reports its own.
+"""
+import bisect
+import contextvars
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Endpoint that LLM calls are attributed to (URL name, "job:<kind>", ...)
+current_endpoint: contextvars.ContextVar[str] = contextvars.ContextVar("llm_endpoint", default="-")
+
+# Histogram bucket upper bounds, seconds (the last bucket is open-ended)
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 2.5, 3.0, 4.0, 5.0, 7.5, 10.0, 15.0, 30.0, 60.0,
+)
+
+# USD per million (prompt, completion) tokens; LLM_PRICES overrides or extends these
+DEFAULT_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4o-mini": (0.15, 0.60),
+    "deepseek-chat": (0.27, 1.10),
+}
+
+
+@contextmanager
+def llm_endpoint(name: str):
+    """Attribute the LLM calls made inside the block to `name`."""
+    token = current_endpoint.set(name)
+    try:
+        yield
+    finally:
+        current_endpoint.reset(token)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram; percentiles are interpolated within a bucket."""
+
+    def __init__(self, bounds: Iterable[float] = LATENCY_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def merge(self, other: "Histogram"):
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.bounds[i - 1] if i else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.max
+                return min(self.max, lower + (upper - lower) * (rank - seen) / n)
+            seen += n
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class _Series:
+    __slots__ = ("calls", "errors", "cache_hits", "prompt_tokens", "completion_tokens", "cost", "latency")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors: Dict[str, int] = {}
+        self.cache_hits = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+        self.latency = Histogram()
+
+    def merge(self, other: "_Series"):
+        self.calls += other.calls
+        for name, n in other.errors.items():
+            self.errors[name] = self.errors.get(name, 0) + n
+        self.cache_hits += other.cache_hits
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.cost += other.cost
+        self.latency.merge(other.latency)
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": sum(self.errors.values()),
+            "error_classes": dict(self.errors),
+            "cache_hits": self.cache_hits,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cost_usd": round(self.cost, 6),
+            "latency": self.latency.summary(),
+        }
+
+
+class LLMMetrics:
+    """Thread-safe aggregation of LLM call records (see module docstring)."""
+
+    def __init__(self, prices: Optional[Dict[str, Tuple[float, float]]] = None, log_path: str = ""):
+        self.prices = dict(DEFAULT_PRICES, **(prices or {}))
+        self.log_path = log_path
+        self._series: Dict[Tuple[str, str, str, str], _Series] = {}
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self.started = time.time()
+
+    def cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        prompt_price, completion_price = self.prices.get(model, (0.0, 0.0))
+        return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+    def record(
+            self,
+            operation: str,
+            provider: str,
+            model: str,
+            seconds: float,
+            prompt_tokens: int = 0,
+            completion_tokens: int = 0,
+            error: str = "",
+            cache_hit: bool = False,
+            **extra,
+    ):
+        """Record one LLM call; `error` is the exception class name of a failed call."""
+        name = current_endpoint.get()
+        cost = self.cost(model, prompt_tokens, completion_tokens)
+        with self._lock:
+            s = self._series.get((name, operation, provider, model))
+            if s is None:
+                s = self._series[(name, operation, provider, model)] = _Series()
+            s.calls += 1
+            if error:
+                s.errors[error] = s.errors.get(error, 0) + 1
+            s.cache_hits += cache_hit
+            s.prompt_tokens += prompt_tokens
+            s.completion_tokens += completion_tokens
+            s.cost += cost
+            s.latency.add(seconds)
+
+        if self.log_path:
+            line = {
+                "ts": round(time.time(), 3),
+                "endpoint": name,
+                "operation": operation,
+                "provider": provider,
+                "model": model,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "seconds": round(seconds, 4),
+                "cost_usd": round(cost, 8),
+                "error": error,
+                "cache_hit": cache_hit,
+                **extra,
+            }
+            with self._log_lock, open(self.log_path, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps(line) + "\n")
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+            self.started = time.time()
+
+    def _rollup(self, key_index: Tuple[int, ...]) -> Dict[str, dict]:
+        groups: Dict[str, _Series] = {}
+        for key, s in self._series.items():
+            group = "/".join(key[i] for i in key_index)
+            groups.setdefault(group, _Series()).merge(s)
+        return {group: s.as_dict() for group, s in sorted(groups.items())}
+
+    def snapshot(self) -> dict:
+        """Totals, rollups per endpoint / operation / model, and every series."""
+        with self._lock:
+            total = _Series()
+            for s in self._series.values():
+                total.merge(s)
+            series: List[dict] = [
+                dict(endpoint=k[0], operation=k[1], provider=k[2], model=k[3], **s.as_dict())
+                for k, s in sorted(self._series.items())
+            ]
+            return {
+                "since": self.started,
+                "total": total.as_dict(),
+                "by_endpoint": self._rollup((0,)),
+                "by_operation": self._rollup((1,)),
+                "by_model": self._rollup((2, 3)),
+                "series": series,
+            }
+
+
+_metrics: Optional[LLMMetrics] = None
+_metrics_lock = threading.Lock()
+
+
+def get_llm_metrics() -> LLMMetrics:
+    """Process-wide LLM metrics (prices from LLM_PRICES, log file from LLM_METRICS_LOG)."""
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                from .llm import _setting
+
+                prices = _setting("LLM_PRICES", "") or {}
+                if isinstance(prices, str):
+                    prices = json.loads(prices)
+                prices = {model: tuple(p) for model, p in prices.items()}
+                _metrics = LLMMetrics(prices=prices, log_path=_setting("LLM_METRICS_LOG", ""))
+    return _metrics
@@ -0,0 +1,88 @@
+# ai/middleware.py
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.http import FileResponse
+
+from .metrics import current_endpoint
+
+
+def _endpoint_name(request) -> str:
+    match = request.resolver_match
+    return (match.url_name or match.view_name) if match else request.path_info
+
+
+def _attributed(content, name: str):
+    """Iterate a streamed body with LLM calls attributed to `name` while each chunk is produced."""
+    iterator = iter(content)
+    while True:
+        token = current_endpoint.set(name)
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            current_endpoint.reset(token)
+        yield chunk
+
+
+async def _aattributed(content, name: str):
+    """Async counterpart of _attributed."""
+    iterator = content.__aiter__()
+    while True:
+        token = current_endpoint.set(name)
+        try:
+            chunk = await iterator.__anext__()
+        except StopAsyncIteration:
+            return
+        finally:
+            current_endpoint.reset(token)
+        yield chunk
+
+
+class LLMEndpointMiddleware:
+    """
+    Attribute the LLM calls made while serving a request to its URL name (see ai.metrics).
+    The name is set once the view is resolved and reset when the request is done, so calls
+    made later on the same thread or event loop (jobs, commands) are not charged to it.
+    A streamed response makes its calls after the middleware has returned: its body is
+    wrapped so they are attributed to the request as well.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = current_endpoint.set(current_endpoint.get())
+        try:
+            response = self.get_response(request)
+        finally:
+            current_endpoint.reset(token)
+        return self._attribute_stream(request, response)
+
+    async def __acall__(self, request):
+        token = current_endpoint.set(current_endpoint.get())
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_endpoint.reset(token)
+        return self._attribute_stream(request, response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        current_endpoint.set(_endpoint_name(request))
+        return None
+
+    @staticmethod
+    def _attribute_stream(request, response):
+        # FileResponse keeps its own iterator (the server's sendfile path); it makes no LLM calls
+        if not response.streaming or isinstance(response, FileResponse):
+            return response
+        name = _endpoint_name(request)
+        wrap = _aattributed if response.is_async else _attributed
+        response.streaming_content = wrap(response.streaming_content, name)
+        return response
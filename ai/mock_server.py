@@ -0,0 +1,333 @@
+# ai/mock_server.py
+"""
+OpenAI-compatible mock provider for latency and load testing without network access.
+
+Serves POST /v1/chat/completions (plain and `stream: true`) with a configurable
+time-to-first-token distribution, generation speed, error rate and 429 rate limiting.
+Point the app at it through LLM_BASE_URL (any non-empty LLM_API_KEY):
+
+    python -m ai.mock_server --port 8765 --latency lognormal:0.8,0.5 --tokens-per-second 50 \\
+        --error-rate 0.01 --rate-limit-rate 0.02
+
+    LLM_BASE_URL=http://127.0.0.1:8765/v1 LLM_API_KEY=mock python manage.py runserver
+
+GET /stats returns the request counters as JSON.
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+from .llm import estimate_tokens
+
+# Filler vocabulary for generated completions (roughly one token per word)
+_WORDS = (
+    "fresh local farm produce picked this week carefully packed and shipped cold to keep "
+    "its flavour crisp sweet ripe seasonal grown without harsh chemicals order now while stock lasts"
+).split()
+_ZH = "新鲜农场直供，当季采摘，冷链配送，口感清甜，欢迎选购。"
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Sampler for a latency spec (seconds):
+    "fixed:S", "uniform:LO,HI", "normal:MEAN,STD", "lognormal:MEDIAN,SIGMA", "exponential:MEAN".
+    """
+    kind, _, raw = spec.partition(":")
+    try:
+        args = [float(x) for x in raw.split(",")] if raw else []
+    except ValueError:
+        raise ValueError(f"Bad latency parameters: {spec!r}")
+    kind = kind.strip().lower()
+    samplers = {
+        "fixed": (1, lambda r, s: s),
+        "uniform": (2, lambda r, lo, hi: r.uniform(lo, hi)),
+        "normal": (2, lambda r, mean, std: r.gauss(mean, std)),
+        "lognormal": (2, lambda r, median, sigma: r.lognormvariate(math.log(median), sigma)),
+        "exponential": (1, lambda r, mean: r.expovariate(1.0 / mean)),
+    }
+    if kind not in samplers or len(args) != samplers[kind][0]:
+        raise ValueError(f"Unknown latency spec {spec!r}; expected e.g. fixed:0.5 or lognormal:0.8,0.5")
+    sample = samplers[kind][1]
+    return lambda r: max(0.0, sample(r, *args))
+
+
+@dataclass
+class MockConfig:
+    latency: str = "lognormal:0.6,0.4"  # time to first token
+    tokens_per_second: float = 60.0  # generation speed after the first token (0 = instant)
+    completion_tokens: int = 80  # reply length, capped by the request's max_tokens
+    error_rate: float = 0.0  # share of requests answered with HTTP 500
+    rate_limit_rate: float = 0.0  # share of requests answered with HTTP 429
+    rpm: float = 0.0  # hard requests-per-minute limit over a sliding minute (0 = none)
+    retry_after: float = 1.0  # Retry-After sent with 429s
+    seed: Optional[int] = None
+
+
+@dataclass
+class MockStats:
+    requests: int = 0
+    streamed: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, **counts: int):
+        with self.lock:
+            for name, n in counts.items():
+                setattr(self, name, getattr(self, name) + n)
+
+    def as_dict(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                name: getattr(self, name)
+                for name in ("requests", "streamed", "errors", "rate_limited", "prompt_tokens", "completion_tokens")
+            }
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], config: MockConfig):
+        super().__init__(address, _Handler)
+        self.config = config
+        self.stats = MockStats()
+        self._latency = parse_latency(config.latency)
+        self._random = random.Random(config.seed)
+        self._random_lock = threading.Lock()
+        self._window: Deque[float] = deque()
+        self._window_lock = threading.Lock()
+
+    def handle_error(self, request, client_address):
+        # Clients hang up on purpose (timeouts, a hedged request that lost the race)
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            super().handle_error(request, client_address)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def draw(self) -> Tuple[float, float]:
+        """(latency sample, uniform sample) from the seeded generator."""
+        with self._random_lock:
+            return self._latency(self._random), self._random.random()
+
+    def over_rpm(self) -> bool:
+        if not self.config.rpm:
+            return False
+        now = time.monotonic()
+        with self._window_lock:
+            while self._window and self._window[0] <= now - 60:
+                self._window.popleft()
+            if len(self._window) >= self.config.rpm:
+                return True
+            self._window.append(now)
+            return False
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: MockLLMServer
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, status: int, payload: dict, headers: Optional[Dict[str, str]] = None):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status: int, message: str, code: str, headers: Optional[Dict[str, str]] = None):
+        self._json(status, {"error": {"message": message, "type": code, "param": None, "code": code}}, headers)
+
+    def _chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/stats":
+            self._json(200, self.server.stats.as_dict())
+        elif self.path.rstrip("/") == "/v1/models":
+            self._json(200, {"object": "list", "data": [{"id": "mock", "object": "model", "owned_by": "mock"}]})
+        else:
+            self._error(404, f"Unknown path {self.path}", "not_found")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length)
+        if self.path.rstrip("/") != "/v1/chat/completions":
+            self._error(404, f"Unknown path {self.path}", "not_found")
+            return
+        try:
+            body = json.loads(raw or b"{}")
+            prompt = "\n".join(str(m.get("content") or "") for m in body["messages"])
+        except (ValueError, KeyError, TypeError, AttributeError):
+            self._error(400, "Invalid request body", "invalid_request_error")
+            return
+
+        server, config = self.server, self.server.config
+        server.stats.add(requests=1)
+        latency, roll = server.draw()
+
+        if server.over_rpm() or roll < config.rate_limit_rate:
+            server.stats.add(rate_limited=1)
+            self._error(
+                429, "Rate limit reached for requests (mock).", "rate_limit_exceeded",
+                {"Retry-After": f"{config.retry_after:g}"},
+            )
+            return
+        if roll < config.rate_limit_rate + config.error_rate:
+            time.sleep(latency)
+            server.stats.add(errors=1)
+            self._error(500, "The server had an error while processing your request (mock).", "server_error")
+            return
+
+        n = max(1, min(config.completion_tokens, int(body.get("max_tokens") or config.completion_tokens)))
+        words = [_WORDS[i % len(_WORDS)] for i in range(n)]
+        json_mode = (body.get("response_format") or {}).get("type") == "json_object"
+        usage = {"prompt_tokens": estimate_tokens(prompt), "completion_tokens": n}
+        usage["total_tokens"] = usage["prompt_tokens"] + n
+        server.stats.add(prompt_tokens=usage["prompt_tokens"], completion_tokens=n)
+        per_token = 1.0 / config.tokens_per_second if config.tokens_per_second > 0 else 0.0
+
+        base = {
+            "id": f"chatcmpl-mock-{uuid.uuid4().hex[:12]}",
+            "created": int(time.time()),
+            "model": body.get("model") or "mock",
+        }
+        time.sleep(latency)
+
+        if not body.get("stream"):
+            time.sleep(per_token * n)
+            text = " ".join(words).capitalize() + "."
+            if json_mode:
+                # The app's JSON prompts ask for {"en": ..., "zh": ...}
+                text = json.dumps({"en": text, "zh": _ZH}, ensure_ascii=False)
+            self._json(200, {
+                **base,
+                "object": "chat.completion",
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop",
+                }],
+                "usage": usage,
+            })
+            return
+
+        server.stats.add(streamed=1)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def event(delta: dict, finish: Optional[str] = None, **extra):
+            chunk = {**base, "object": "chat.completion.chunk",
+                     "choices": [{"index": 0, "delta": delta, "finish_reason": finish}], **extra}
+            self._chunk(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+
+        try:
+            event({"role": "assistant", "content": ""})
+            for i, word in enumerate(words):
+                event({"content": (word.capitalize() if i == 0 else " " + word)})
+                time.sleep(per_token)
+            event({}, finish="stop")
+            if (body.get("stream_options") or {}).get("include_usage"):
+                chunk = {**base, "object": "chat.completion.chunk", "choices": [], "usage": usage}
+                self._chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+            self._chunk(b"data: [DONE]\n\n")
+            self._chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            # The client went away mid-stream (see MockLLMServer.handle_error)
+            self.close_connection = True
+
+
+def start_mock_server(config: MockConfig, host: str = "127.0.0.1", port: int = 0) -> MockLLMServer:
+    """Run a mock server on a daemon thread (port 0 = any free port); stop it with shutdown()."""
+    server = MockLLMServer((host, port), config)
+    threading.Thread(target=server.serve_forever, name="mock-llm", daemon=True).start()
+    return server
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    defaults = MockConfig()
+    parser.add_argument(
+        "--latency",
+        default=defaults.latency,
+        help="Time to first token: fixed:S, uniform:LO,HI, normal:MEAN,STD, lognormal:MEDIAN,SIGMA "
+             f"or exponential:MEAN (default: {defaults.latency}).",
+    )
+    parser.add_argument(
+        "--tokens-per-second",
+        type=float,
+        default=defaults.tokens_per_second,
+        help=f"Generation speed, 0 = instant (default: {defaults.tokens_per_second:g}).",
+    )
+    parser.add_argument(
+        "--completion-tokens",
+        type=int,
+        default=defaults.completion_tokens,
+        help=f"Reply length, capped by max_tokens (default: {defaults.completion_tokens}).",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of HTTP 500 replies (default: 0).")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of HTTP 429 replies (default: 0).")
+    parser.add_argument("--rpm", type=float, default=0.0, help="Hard requests-per-minute limit (default: none).")
+    parser.add_argument("--retry-after", type=float, default=defaults.retry_after, help="Retry-After of 429s.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible runs.")
+
+
+def config_from_args(args: argparse.Namespace) -> MockConfig:
+    config = MockConfig(
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        rpm=args.rpm,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    parse_latency(config.latency)  # fail early on a bad spec
+    return config
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_arguments(parser)
+    args = parser.parse_args()
+    try:
+        config = config_from_args(args)
+    except ValueError as e:
+        parser.error(str(e))
+
+    server = MockLLMServer((args.host, args.port), config)
+    print(f"Mock LLM provider on {server.base_url} ({config})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
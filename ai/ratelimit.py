@@ -0,0 +1,56 @@
+# ai/ratelimit.py
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: refills at `rate` tokens per second up to `capacity`.
+    Use one bucket per provider limit (requests per minute, tokens per minute).
+
+    acquire() blocks until the tokens are available. A cost that was only estimated
+    can be corrected afterwards with adjust(); the level may go negative (debt),
+    which later callers wait out.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, limit: float) -> "TokenBucket":
+        """Bucket for a provider limit expressed per minute (RPM / TPM), allowing one minute of burst."""
+        return cls(rate=limit / 60.0, capacity=limit)
+
+    def _refill(self, now: float):
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """Take `tokens`, waiting as needed; False if that would take longer than `timeout`."""
+        # A request larger than the bucket could never fit: let it through once the bucket is full
+        tokens = min(tokens, self.capacity)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._level >= tokens:
+                    self._level -= tokens
+                    return True
+                wait = (tokens - self._level) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def adjust(self, tokens: float):
+        """Give back (positive) or charge extra (negative) tokens once the real cost is known."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._level = min(self.capacity, self._level + tokens)
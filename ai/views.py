@@ -0,0 +1,35 @@
+# ai/views.py
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+
+from .llm import _clients, get_answer_cache, get_description_stats
+from .metrics import get_llm_metrics
+
+
+@staff_member_required
+def llm_metrics(request):
+    """
+    LLM call metrics of this process as JSON: calls, errors, cache hits, tokens, cost and
+    latency percentiles in total and per endpoint / operation / model, plus the state of
+    every provider (circuit breaker, recent latency per operation) and of the answer cache.
+    """
+    providers = []
+    for client in list(_clients.values()):
+        for p in client._providers:
+            providers.append({
+                "name": p.name,
+                "model": p.model,
+                "circuit": p.breaker.state,
+                # Per operation; streamed operations measure the time to the first token
+                "latency": {
+                    operation: {"p50": window.percentile(50), "p95": window.percentile(95)}
+                    for operation, window in list(p.latency.items())
+                },
+            })
+
+    return JsonResponse({
+        **get_llm_metrics().snapshot(),
+        "providers": providers,
+        "answer_cache": get_answer_cache().stats(),
+        "descriptions": get_description_stats().stats(),
+    })
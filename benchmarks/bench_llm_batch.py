@@ -0,0 +1,98 @@
+# benchmarks/bench_llm_batch.py
+"""
+Throughput of the offline batch-file pipeline (ai.batch) for product descriptions.
+
+Creates a throwaway SQLite database with synthetic products, then times each stage
+of `manage.py llm_batch`: export the request files, complete them locally with the
+dummy provider (no network), and ingest the result files back into the products.
+Ingest includes the bulk-change receivers (search index, Q&A contexts), as in
+production, unless --no-receivers is given.
+
+    python benchmarks/bench_llm_batch.py --products 1000000 --chunk-size 2000
+
+Pass --database-url to measure another database (its tables are created by migrate).
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--products", type=int, default=100_000, help="Synthetic products (default: 100000).")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Rows per bulk update (default: 1000).")
+    parser.add_argument("--mode", choices=["json", "separate"], default="json", help="Description mode.")
+    parser.add_argument(
+        "--no-receivers",
+        action="store_true",
+        help="Disconnect the bulk-change receivers, to measure the database writes alone.",
+    )
+    parser.add_argument("--database-url", default=None, help="Database to use (default: a temporary SQLite file).")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_llm_batch_")
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(workdir, 'bench.sqlite3')}"
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    # Request lines only need the model name: never call a provider from here
+    os.environ["LLM_PROVIDER"] = "dummy"
+
+    import django
+    django.setup()
+
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+
+    from ai import batch
+    from ai.llm import get_llm_client
+    from products.bulk import description_batch_requests, ingest_description_results, products_bulk_changed
+    from products.models import Product, SupplierProfile
+
+    call_command("migrate", verbosity=0)
+    if args.no_receivers:
+        for receiver in list(products_bulk_changed.receivers):
+            products_bulk_changed.disconnect(receiver[1]())
+    user, _ = get_user_model().objects.get_or_create(username="bench-supplier")
+    supplier, _ = SupplierProfile.objects.get_or_create(user=user, defaults={"company_name": "Bench Farm"})
+
+    started = time.perf_counter()
+    batch_rows = 10_000
+    for offset in range(0, args.products, batch_rows):
+        Product.objects.bulk_create(
+            Product(supplier=supplier, name=f"Produce {i}", category="Vegetable", unit="kg", stock=i % 500)
+            for i in range(offset, min(offset + batch_rows, args.products))
+        )
+    print(f"setup    {args.products:>10,} products in {time.perf_counter() - started:6.1f}s")
+
+    def stage(name, fn):
+        t = time.perf_counter()
+        out = fn()
+        elapsed = time.perf_counter() - t
+        print(f"{name:<8} {args.products:>10,} products in {elapsed:6.1f}s  ({args.products / max(elapsed, 1e-9):>9,.0f}/s)")
+        return out
+
+    llm = get_llm_client()
+    qs = Product.objects.order_by("id").only("id", "name", "category", "unit", "stock")
+    requests_dir = os.path.join(workdir, "requests")
+    paths = stage(
+        "export",
+        lambda: batch.write_requests(description_batch_requests(qs.iterator(chunk_size=2000), llm, args.mode), requests_dir),
+    )
+    results_path = os.path.join(workdir, "results.jsonl")
+    completed = stage("complete", lambda: batch.complete_locally(paths, results_path))
+    written, failed = stage(
+        "ingest",
+        lambda: ingest_description_results(batch.read_results([results_path]), args.chunk_size),
+    )
+
+    size = sum(os.path.getsize(p) for p in paths)
+    print(f"\n{len(paths)} request file(s), {size / 1e6:,.1f} MB; {completed:,} completions")
+    print(f"{written:,} product updates, {len(failed):,} failed; files kept in {workdir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# benchmarks/bench_qa_index.py
+"""
+Recall and lookup latency of near-duplicate question matching (qa.retrieval).
+
+Builds the question index of one product from synthetic buyer questions (100k
+by default: the worst case, indexes are per product), then asks a paraphrase of
+a random sample of them (a different wording of the same intent and details,
+shuffled case/punctuation and the odd typo) and checks whether the nearest
+stored question is the one being paraphrased. Questions with an intent that was
+never stored measure how often an unrelated question would wrongly reuse an answer.
+
+Runs without Django or a database:
+
+    python benchmarks/bench_qa_index.py --size 100000 --queries 2000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qa.retrieval import QuestionIndex, embed  # noqa: E402
+
+# Several wordings per intent; slot values (and the delivery date) make each stored question unique
+INTENTS = [
+    [
+        "How much is shipping for {qty} {unit} of {item} to {city}?",
+        "what does delivery cost to {city} for {qty} {unit} {item}",
+        "Shipping fee for {qty}{unit} of {item}, sent to {city}?",
+    ],
+    [
+        "How long does delivery to {city} take for {qty} {unit} of {item}?",
+        "When will {qty} {unit} of {item} arrive in {city}?",
+        "ETA for {item} ({qty} {unit}) shipped to {city}?",
+    ],
+    [
+        "Do you have {qty} {unit} of {item} in stock for {city}?",
+        "Is {qty} {unit} {item} available to order for {city}?",
+        "any {item} left? need {qty} {unit} in {city}",
+    ],
+    [
+        "Are the {item} organic? ordering {qty} {unit} to {city}",
+        "Were pesticides used on the {item}? {qty} {unit} for {city}",
+        "{item} grown without chemicals? buying {qty} {unit}, {city}",
+    ],
+    [
+        "What is the price of {qty} {unit} of {item} delivered to {city}?",
+        "how much for {qty} {unit} {item} to {city}",
+        "Cost of {qty}{unit} of {item} with delivery to {city}?",
+    ],
+    [
+        "How fresh are the {item}? I want {qty} {unit} in {city}",
+        "When were the {item} harvested? {qty} {unit} for {city}",
+        "are {item} freshly picked, {qty} {unit} to {city}?",
+    ],
+]
+
+# Intents never stored: asking them must not reuse an answer to something else
+UNSEEN_INTENTS = [
+    "Can I return {qty} {unit} of {item} if they arrive damaged in {city}?",
+    "Do you offer a discount on {qty} {unit} of {item} for a restaurant in {city}?",
+    "Who is the seller of the {item}? I'm in {city} and need {qty} {unit}",
+    "Can I pick up {qty} {unit} of {item} myself near {city}?",
+]
+
+CITIES = (
+    "Sydney Melbourne Brisbane Perth Adelaide Hobart Darwin Canberra Newcastle Wollongong Geelong "
+    "Townsville Cairns Toowoomba Ballarat Bendigo Launceston Mackay Rockhampton Bunbury Bundaberg "
+    "Wagga Mildura Shepparton Gladstone Tamworth Orange Dubbo Geraldton Albany"
+).split()
+QUANTITIES = [1, 2, 3, 5, 10, 15, 20, 25, 50, 100]
+UNITS = ["kg", "boxes", "crates"]
+MONTHS = "January February March April May June July August September October November December".split()
+DATE_WORDINGS = [" (needed by {month} {day})", ", for {day} {month}", " - before {month} {day}"]
+
+ITEM = "tomatoes"
+
+
+def slots(rng):
+    return {
+        "item": ITEM,
+        "city": rng.choice(CITIES),
+        "qty": rng.choice(QUANTITIES),
+        "unit": rng.choice(UNITS),
+        "month": rng.choice(MONTHS),
+        "day": rng.randint(1, 28),
+    }
+
+
+def phrase(rng, template, s):
+    return template.format(**s) + rng.choice(DATE_WORDINGS).format(**s)
+
+
+def perturb(rng, text):
+    """Casing, punctuation and a one-character typo now and then."""
+    if rng.random() < 0.5:
+        text = text.lower()
+    if rng.random() < 0.5:
+        text = text.rstrip("?") + rng.choice(["", " ?", "??", "."])
+    if rng.random() < 0.3:
+        words = text.split()
+        i = rng.randrange(len(words))
+        w = words[i]
+        if len(w) > 4:
+            j = rng.randrange(1, len(w) - 1)
+            words[i] = w[:j] + w[j + 1:]
+        text = " ".join(words)
+    return text
+
+
+def percentile(values, p):
+    return float(np.percentile(np.asarray(values), p)) * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size", type=int, default=100_000, help="Stored questions (default: 100000).")
+    parser.add_argument("--queries", type=int, default=2000, help="Paraphrased lookups (default: 2000).")
+    parser.add_argument("--dim", type=int, default=256, help="Vector dimension (default: 256).")
+    parser.add_argument("--threshold", type=float, default=0.8, help="Similarity threshold (default: 0.8).")
+    parser.add_argument("--seed", type=int, default=5620)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    # Unique (intent, slots) combinations, stored in a random wording
+    print(f"Generating {args.size} questions...")
+    seen = set()
+    stored = []
+    while len(stored) < args.size:
+        intent = rng.randrange(len(INTENTS))
+        s = slots(rng)
+        key = (intent,) + tuple(sorted(s.items()))
+        if key in seen:
+            continue
+        seen.add(key)
+        wording = rng.randrange(len(INTENTS[intent]))
+        stored.append((intent, phrase(rng, INTENTS[intent][wording], s), wording, s))
+
+    t0 = time.perf_counter()
+    index = QuestionIndex(args.dim, capacity=args.size)
+    for i, (_, text, _, _) in enumerate(stored):
+        index.add(embed(text, args.dim), str(i))
+    build = time.perf_counter() - t0
+    print(f"Indexed {len(index)} questions in {build:.1f}s ({len(index) / build:,.0f}/s), "
+          f"{index._matrix.nbytes / 2 ** 20:.1f} MiB")
+
+    # Paraphrases: same intent and slots, a different wording
+    hits = accepted = 0
+    latencies = []
+    for _ in range(args.queries):
+        i = rng.randrange(len(stored))
+        intent, _, wording, s = stored[i]
+        other = rng.choice([w for w in range(len(INTENTS[intent])) if w != wording])
+        q = perturb(rng, phrase(rng, INTENTS[intent][other], s))
+        t = time.perf_counter()
+        score, answer = index.nearest(embed(q, args.dim))
+        latencies.append(time.perf_counter() - t)
+        if answer == str(i):
+            hits += 1
+            if score >= args.threshold:
+                accepted += 1
+
+    # Unseen intents: anything over the threshold would be a wrong reuse
+    false_matches = 0
+    for _ in range(args.queries):
+        q = perturb(rng, phrase(rng, rng.choice(UNSEEN_INTENTS), slots(rng)))
+        score, _ = index.nearest(embed(q, args.dim))
+        if score >= args.threshold:
+            false_matches += 1
+
+    n = args.queries
+    print(f"recall@1                : {hits / n:.3f}")
+    print(f"recall@1 >= {args.threshold:<12}: {accepted / n:.3f}")
+    print(f"false matches >= {args.threshold:<7}: {false_matches / n:.3f}")
+    print(f"lookup latency          : p50 {percentile(latencies, 50):.2f} ms, "
+          f"p99 {percentile(latencies, 99):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
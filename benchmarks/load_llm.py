@@ -0,0 +1,185 @@
+# benchmarks/load_llm.py
+"""
+Load test of the AI features against the mock provider (ai/mock_server.py).
+
+Starts a mock provider with the given latency/error profile, creates a throwaway
+SQLite database with synthetic products, and drives one scenario through the app
+at a fixed concurrency:
+
+  qa      POST buyer questions to product_detail (synchronous view)
+  stream  GET the SSE answer stream (async view), measuring time to first byte
+  desc    run the generate_desc background job (descriptions + pricing)
+
+Every question is distinct, so answers come from the provider rather than the caches.
+
+    python benchmarks/load_llm.py qa --requests 500 --concurrency 32 --latency lognormal:0.8,0.5 \\
+        --error-rate 0.02 --rate-limit-rate 0.05
+
+Pass --mock-url to use a mock server that is already running.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ai import mock_server  # noqa: E402
+
+CITIES = ["Sydney", "Melbourne", "Brisbane", "Perth", "Adelaide", "Hobart", "Darwin", "Canberra"]
+TOPICS = ["delivery time", "shipping cost", "stock level", "harvest date", "storage", "bulk discount"]
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def question(i: int, rng: random.Random) -> str:
+    return f"Order #{i}: {rng.choice(TOPICS)} for {rng.randint(1, 500)} kg to {rng.choice(CITIES)} postcode {rng.randint(2000, 7999)}?"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("scenario", choices=["qa", "stream", "desc"])
+    parser.add_argument("--requests", type=int, default=200, help="Requests to send (default: 200).")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight (default: 16).")
+    parser.add_argument("--products", type=int, default=50, help="Synthetic products (default: 50).")
+    parser.add_argument("--mock-url", default=None, help="Base URL of a running mock server (…/v1).")
+    mock_server.add_arguments(parser)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    server = None
+    base_url = args.mock_url
+    if not base_url:
+        server = mock_server.start_mock_server(mock_server.config_from_args(args))
+        base_url = server.base_url
+
+    workdir = tempfile.mkdtemp(prefix="load_llm_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'load.sqlite3')}"
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    os.environ.update(LLM_PROVIDER="openai", LLM_API_KEY="mock", LLM_BASE_URL=base_url)
+    os.environ["LLM_HTTP_MAX_CONNECTIONS"] = str(max(20, args.concurrency))
+    os.environ["ALLOWED_HOSTS"] = "testserver"
+
+    import django
+    django.setup()
+
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test import AsyncClient, Client
+    from django.urls import reverse
+
+    from ai.metrics import get_llm_metrics
+    from products.models import Product, SupplierProfile
+    from products.tasks import generate_description
+    from products.views import AI_UNAVAILABLE
+
+    # Many writer threads on one SQLite file: wait for the write lock instead of failing
+    settings.DATABASES["default"].setdefault("OPTIONS", {}).update(timeout=60, transaction_mode="IMMEDIATE")
+    call_command("migrate", verbosity=0)
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA journal_mode=WAL")
+    user, _ = get_user_model().objects.get_or_create(username="load-supplier")
+    supplier, _ = SupplierProfile.objects.get_or_create(user=user, defaults={"company_name": "Load Farm"})
+    product_ids = [
+        p.pk for p in Product.objects.bulk_create(
+            Product(supplier=supplier, name=f"Produce {i}", category="Vegetable", unit="kg", stock=100 + i,
+                    base_price=5)
+            for i in range(args.products)
+        )
+    ]
+    jobs = [(rng.choice(product_ids), question(i, rng)) for i in range(args.requests)]
+
+    latencies, first_bytes, failures = [], [], []
+    lock = threading.Lock()
+
+    def record(seconds, ok, ttfb=None):
+        with lock:
+            latencies.append(seconds)
+            if ttfb is not None:
+                first_bytes.append(ttfb)
+            if not ok:
+                failures.append(seconds)
+
+    local = threading.local()
+
+    def run_qa(job):
+        pk, q = job
+        client = getattr(local, "client", None) or Client()
+        local.client = client
+        t = time.perf_counter()
+        resp = client.post(reverse("product-detail", args=[pk]), {"question": q})
+        record(time.perf_counter() - t, resp.status_code == 200 and AI_UNAVAILABLE.encode() not in resp.content)
+
+    def run_desc(job):
+        t = time.perf_counter()
+        try:
+            generate_description(job[0])
+            ok = True
+        except Exception:
+            ok = False
+        record(time.perf_counter() - t, ok)
+
+    async def run_streams():
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def one(job):
+            pk, q = job
+            async with semaphore:
+                t = time.perf_counter()
+                resp = await client.post(reverse("product-answer-stream", args=[pk]), {"question": q})
+                ttfb, body = None, b""
+                async for chunk in resp.streaming_content:
+                    ttfb = ttfb if ttfb is not None else time.perf_counter() - t
+                    body += chunk
+                record(time.perf_counter() - t, resp.status_code == 200 and AI_UNAVAILABLE.encode() not in body, ttfb)
+
+        await asyncio.gather(*(one(job) for job in jobs))
+
+    print(f"{args.scenario}: {args.requests} requests, concurrency {args.concurrency}, provider {base_url}")
+    started = time.perf_counter()
+    if args.scenario == "stream":
+        asyncio.run(run_streams())
+    else:
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            list(pool.map(run_qa if args.scenario == "qa" else run_desc, jobs))
+    elapsed = time.perf_counter() - started
+
+    print(f"throughput  {len(latencies) / elapsed:8.1f} req/s over {elapsed:.1f}s")
+    print(f"failed      {len(failures):8d} ({len(failures) / max(1, len(latencies)):.1%})")
+    print(
+        f"latency     p50 {percentile(latencies, 50):6.2f}s  p95 {percentile(latencies, 95):6.2f}s  "
+        f"p99 {percentile(latencies, 99):6.2f}s  mean {statistics.fmean(latencies):6.2f}s"
+    )
+    if first_bytes:
+        print(
+            f"first byte  p50 {percentile(first_bytes, 50):6.2f}s  p95 {percentile(first_bytes, 95):6.2f}s  "
+            f"p99 {percentile(first_bytes, 99):6.2f}s"
+        )
+    for operation, m in get_llm_metrics().snapshot()["by_operation"].items():
+        print(
+            f"llm {operation:<15} {m['calls']:6d} calls  {m['errors']:4d} errors  {m['cache_hits']:4d} cached  "
+            f"p50 {m['latency']['p50']:5.2f}s  p99 {m['latency']['p99']:5.2f}s  "
+            f"{m['prompt_tokens'] + m['completion_tokens']:8d} tokens  ${m['cost_usd']:.4f}"
+        )
+    if server is not None:
+        print(f"provider    {server.stats.as_dict()}")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -44,6 +44,8 @@ INSTALLED_APPS = [
     'products',
     'qa',
     'pricing',
+    'search',
+    'jobs',
 ]
 
 # ----------------------------------------------------------------------
@@ -58,6 +60,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'ai.middleware.LLMEndpointMiddleware',
 ]
 
 # ----------------------------------------------------------------------
@@ -100,6 +103,18 @@ DATABASES = {
     )
 }
 
+# ----------------------------------------------------------------------
+# Cache configuration
+# ----------------------------------------------------------------------
+# Local memory by default; e.g. CACHE_URL=filecache:///var/tmp/farmmate_cache to share across workers
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
+# Lifetime of rendered catalog / product-detail fragments (seconds).
+# Entries are invalidated by version bumps, so this only bounds how long stale versions linger.
+FRAGMENT_CACHE_TIMEOUT = env.int('FRAGMENT_CACHE_TIMEOUT', default=24 * 3600)
+
 # ----------------------------------------------------------------------
 # Static & Media files
 # ----------------------------------------------------------------------
@@ -109,6 +124,27 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Encoder quality (1-100) of WebP/JPEG image renditions
+RENDITION_QUALITY = env.int('RENDITION_QUALITY', default=80)
+
+# ----------------------------------------------------------------------
+# Buyer catalog
+# ----------------------------------------------------------------------
+# Number of products per infinite-scroll page
+CATALOG_PAGE_SIZE = env.int('CATALOG_PAGE_SIZE', default=24)
+
+# How long a reverse proxy may serve anonymous catalog pages without revalidating (s-maxage, seconds)
+CATALOG_PROXY_MAX_AGE = env.int('CATALOG_PROXY_MAX_AGE', default=60)
+
+# ----------------------------------------------------------------------
+# REST API (read-only catalog)
+# ----------------------------------------------------------------------
+REST_FRAMEWORK = {
+    'DEFAULT_PERMISSION_CLASSES': ['rest_framework.permissions.AllowAny'],
+}
+# Default number of products per API page (clients may ask for up to 200 with ?page_size=)
+API_PAGE_SIZE = env.int('API_PAGE_SIZE', default=50)
+
 # ----------------------------------------------------------------------
 # Custom user model
 # ----------------------------------------------------------------------
@@ -142,6 +178,17 @@ except Exception:
     # Avoid interfering with initial app loading
     pass
 
+# ----------------------------------------------------------------------
+# Background jobs (python manage.py run_workers)
+# ----------------------------------------------------------------------
+JOBS_MAX_ATTEMPTS = env.int('JOBS_MAX_ATTEMPTS', default=3)
+# Retry n waits JOBS_BACKOFF_BASE * 2**(n-1) seconds (±20%), at most JOBS_BACKOFF_MAX
+JOBS_BACKOFF_BASE = env.float('JOBS_BACKOFF_BASE', default=5.0)
+JOBS_BACKOFF_MAX = env.float('JOBS_BACKOFF_MAX', default=300.0)
+JOBS_POLL_INTERVAL = env.float('JOBS_POLL_INTERVAL', default=1.0)
+# A job running longer than this is assumed to have lost its worker and is queued again
+JOBS_LOCK_TIMEOUT = env.float('JOBS_LOCK_TIMEOUT', default=600.0)
+
 # ----------------------------------------------------------------------
 # Optional: LLM API configuration
 # ----------------------------------------------------------------------
@@ -149,3 +196,52 @@ except Exception:
 LLM_PROVIDER = env('LLM_PROVIDER', default='openai')
 LLM_MODEL = env('LLM_MODEL', default='gpt-4.1-mini')
 LLM_API_KEY = env('LLM_API_KEY', default='')
+# Override the provider's API URL, e.g. http://127.0.0.1:8765/v1 for the mock server (python -m ai.mock_server)
+LLM_BASE_URL = env('LLM_BASE_URL', default='')
+
+# Shared HTTP connection pool of each LLM client (see ai.llm.get_llm_client)
+LLM_HTTP_MAX_CONNECTIONS = env.int('LLM_HTTP_MAX_CONNECTIONS', default=20)
+LLM_HTTP_MAX_KEEPALIVE = env.int('LLM_HTTP_MAX_KEEPALIVE', default=10)
+LLM_HTTP_KEEPALIVE_EXPIRY = env.float('LLM_HTTP_KEEPALIVE_EXPIRY', default=30.0)
+LLM_TIMEOUT = env.float('LLM_TIMEOUT', default=60.0)
+LLM_CONNECT_TIMEOUT = env.float('LLM_CONNECT_TIMEOUT', default=5.0)
+
+# Failover, circuit breaking and hedging (see ai.llm.LLMClient)
+# Providers tried after LLM_PROVIDER, in order; each needs <NAME>_API_KEY
+# (optional <NAME>_MODEL / <NAME>_BASE_URL, e.g. DEEPSEEK_API_KEY)
+LLM_FALLBACK_PROVIDERS = env.list('LLM_FALLBACK_PROVIDERS', default=[])
+LLM_BREAKER_FAILURES = env.int('LLM_BREAKER_FAILURES', default=5)  # consecutive failures that open a circuit
+LLM_BREAKER_RESET = env.float('LLM_BREAKER_RESET', default=30.0)  # seconds before a trial call
+LLM_HEDGE = env.bool('LLM_HEDGE', default=False)  # only with LLM_FALLBACK_PROVIDERS: hedges go to the next provider
+LLM_HEDGE_PERCENTILE = env.float('LLM_HEDGE_PERCENTILE', default=95.0)  # hedge after this latency percentile
+LLM_HEDGE_MIN_SAMPLES = env.int('LLM_HEDGE_MIN_SAMPLES', default=20)
+LLM_HEDGE_DELAY = env.float('LLM_HEDGE_DELAY', default=2.0)  # until enough latencies are known
+LLM_HEDGE_MIN_DELAY = env.float('LLM_HEDGE_MIN_DELAY', default=0.1)
+LLM_HEDGE_THREADS = env.int('LLM_HEDGE_THREADS', default=64)
+
+# Concurrent LLM calls (see ai.llm.gather_limited): max in flight, seconds per call
+LLM_CONCURRENCY = env.int('LLM_CONCURRENCY', default=8)
+LLM_CALL_TIMEOUT = env.float('LLM_CALL_TIMEOUT', default=30.0)
+
+# Product descriptions: 'json' = English + Chinese in one structured response
+# (falls back to one call per language), 'separate' = always one call per language
+LLM_DESC_MODE = env('LLM_DESC_MODE', default='json')
+
+# Provider rate limits used by bulk generation (requests / tokens per minute)
+LLM_RATE_LIMIT_RPM = env.float('LLM_RATE_LIMIT_RPM', default=500)
+LLM_RATE_LIMIT_TPM = env.float('LLM_RATE_LIMIT_TPM', default=200000)
+
+# In-process cache of answers to repeated buyer questions (entries, seconds)
+LLM_ANSWER_CACHE_SIZE = env.int('LLM_ANSWER_CACHE_SIZE', default=2048)
+LLM_ANSWER_CACHE_TTL = env.float('LLM_ANSWER_CACHE_TTL', default=3600.0)
+
+# LLM call metrics (see ai.metrics), served to staff at /metrics/llm/
+# Optional JSONL file receiving one line per call (empty = off)
+LLM_METRICS_LOG = env('LLM_METRICS_LOG', default='')
+# Prices in USD per million tokens, {"model": [prompt, completion]}, on top of ai.metrics.DEFAULT_PRICES
+LLM_PRICES = env.json('LLM_PRICES', default={})
+
+# Near-duplicate question matching over stored Q&A (see qa.retrieval)
+QA_SIMILARITY_THRESHOLD = env.float('QA_SIMILARITY_THRESHOLD', default=0.8)
+QA_INDEX_DIM = env.int('QA_INDEX_DIM', default=256)
+QA_INDEX_MAX_PRODUCTS = env.int('QA_INDEX_MAX_PRODUCTS', default=1000)
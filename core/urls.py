@@ -1,5 +1,5 @@
 from django.contrib import admin
-from django.urls import path
+from django.urls import include, path
 from django.contrib.auth import views as auth_views
 from django.conf import settings
 from django.conf.urls.static import static
@@ -7,9 +7,17 @@ from django.conf.urls.static import static
 from products.views import (
     home, seller_dashboard, buyer_catalog,
     product_detail, product_create, product_edit, generate_desc,
-    product_toggle_active, product_delete
+    product_toggle_active, product_delete, product_answer_stream
 )
 from accounts.views import register, role_route, logout_get, seller_profile  # Key import
+from jobs.views import job_status
+from ai.views import llm_metrics
+from rest_framework.routers import SimpleRouter
+from products.api import ProductViewSet
+
+# Read-only JSON API
+api_router = SimpleRouter()
+api_router.register('products', ProductViewSet, basename='api-product')
 
 urlpatterns = [
     # Admin panel
@@ -36,6 +44,16 @@ urlpatterns = [
     # Buyer section
     path('buy/', buyer_catalog, name='buyer-catalog'),
     path('buy/products/<int:pk>/', product_detail, name='product-detail'),
+    path('buy/products/<int:pk>/answer/stream/', product_answer_stream, name='product-answer-stream'),
+
+    # Background job status (htmx polling)
+    path('jobs/<int:pk>/status/', job_status, name='job-status'),
+
+    # LLM call metrics (staff only, JSON)
+    path('metrics/llm/', llm_metrics, name='llm-metrics'),
+
+    # JSON API
+    path('api/', include(api_router.urls)),
 ]
 
 # Serve media files in development mode
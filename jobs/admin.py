@@ -0,0 +1,14 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """Read-mostly view of the background job queue."""
+
+    list_display = ("id", "kind", "status", "attempts", "max_attempts", "owner", "run_after", "created_at", "finished_at")
+    list_filter = ("status", "kind")
+    search_fields = ("=id", "kind", "owner__username")
+    readonly_fields = ("dedupe_key", "locked_by", "locked_at", "result", "last_error", "created_at", "finished_at")
+    ordering = ("-created_at",)
@@ -0,0 +1,73 @@
+# jobs/management/commands/run_workers.py
+import multiprocessing
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from jobs.worker import process_main, work
+
+
+class Command(BaseCommand):
+    help = "Process background jobs (AI generation etc.) with N worker threads or processes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=2,
+            help="Number of workers (default: 2).",
+        )
+        parser.add_argument(
+            "--mode",
+            choices=["threads", "processes"],
+            default="threads",
+            help="Run workers as threads (I/O-bound jobs such as LLM calls) or processes (default: threads).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=None,
+            help="Seconds an idle worker waits before polling again (default: JOBS_POLL_INTERVAL).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no job is due instead of waiting for new ones.",
+        )
+
+    def handle(self, *args, **options):
+        n = max(1, options["workers"])
+        poll = options["poll_interval"] or settings.JOBS_POLL_INTERVAL
+        once = options["once"]
+        self.stdout.write(self.style.NOTICE(f"Starting {n} worker {options['mode']} (Ctrl+C to stop)..."))
+
+        if options["mode"] == "processes":
+            # Spawned children open their own database connections
+            connections.close_all()
+            ctx = multiprocessing.get_context("spawn")
+            stop = ctx.Event()
+            workers = [ctx.Process(target=process_main, args=(i, stop, poll, once)) for i in range(n)]
+        else:
+            stop = threading.Event()
+            workers = [
+                threading.Thread(target=work, args=(i, stop, poll, once), kwargs={"log": self._log}, daemon=True)
+                for i in range(n)
+            ]
+
+        for w in workers:
+            w.start()
+        try:
+            for w in workers:
+                while w.is_alive():
+                    w.join(0.5)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING("Stopping after the current jobs..."))
+            stop.set()
+            for w in workers:
+                w.join()
+        self.stdout.write(self.style.SUCCESS("Workers stopped."))
+
+    def _log(self, msg: str):
+        self.stdout.write(f"  ✓ {msg}")
@@ -0,0 +1,27 @@
+# jobs/registry.py
+from typing import Callable, Dict
+
+_handlers: Dict[str, Callable] = {}
+
+
+def job_handler(kind: str):
+    """
+    Register a function as the handler of `kind` jobs:
+
+        @job_handler("products.generate_description")
+        def generate_description(product_id): ...
+
+    It is called with the job payload as keyword arguments; its return value
+    (JSON-serialisable) is stored as the job result. Raising marks the attempt failed.
+    """
+    def decorator(func: Callable) -> Callable:
+        _handlers[kind] = func
+        return func
+    return decorator
+
+
+def get_handler(kind: str) -> Callable:
+    try:
+        return _handlers[kind]
+    except KeyError:
+        raise LookupError(f"No job handler registered for '{kind}'.")
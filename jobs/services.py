@@ -0,0 +1,117 @@
+# jobs/services.py
+import hashlib
+import json
+import random
+import traceback
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from ai.metrics import llm_endpoint
+
+from .models import Job
+from .registry import get_handler
+
+
+def dedupe_key(kind: str, payload: dict) -> str:
+    raw = json.dumps([kind, payload], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def enqueue(kind: str, payload: Optional[dict] = None, owner=None, dedupe: bool = True) -> Job:
+    """
+    Queue a job and return it. With `dedupe`, an identical job that is still
+    pending or running is returned instead of queuing a second one.
+    """
+    payload = payload or {}
+    key = dedupe_key(kind, payload) if dedupe else ""
+    for _ in range(2):
+        if key:
+            existing = Job.objects.filter(dedupe_key=key, status__in=Job.ACTIVE).first()
+            if existing:
+                return existing
+        try:
+            with transaction.atomic():
+                return Job.objects.create(
+                    kind=kind,
+                    payload=payload,
+                    dedupe_key=key,
+                    owner=owner,
+                    max_attempts=settings.JOBS_MAX_ATTEMPTS,
+                )
+        except IntegrityError:
+            # Queued concurrently: return that one
+            continue
+    return Job.objects.get(dedupe_key=key, status__in=Job.ACTIVE)
+
+
+def claim_next(worker: str) -> Optional[Job]:
+    """
+    Take the next due pending job for `worker`.
+    The claim is a conditional UPDATE (… WHERE status = 'PENDING'): when several workers
+    race for the same row exactly one update matches, the others move on to the next job.
+    """
+    for _ in range(5):
+        now = timezone.now()
+        job_id = (
+            Job.objects.filter(status=Job.PENDING, run_after__lte=now)
+            .order_by("run_after", "id")
+            .values_list("id", flat=True)
+            .first()
+        )
+        if job_id is None:
+            return None
+        claimed = Job.objects.filter(id=job_id, status=Job.PENDING).update(
+            status=Job.RUNNING, locked_by=worker, locked_at=now, attempts=F("attempts") + 1
+        )
+        if claimed:
+            return Job.objects.get(id=job_id)
+    return None
+
+
+def backoff_delay(attempts: int) -> float:
+    """Seconds before retry number `attempts`: exponential, capped, with jitter."""
+    base = settings.JOBS_BACKOFF_BASE * (2 ** max(0, attempts - 1))
+    return min(settings.JOBS_BACKOFF_MAX, base) * random.uniform(0.8, 1.2)
+
+
+def run_job(job: Job, worker: str) -> Job:
+    """Run a claimed job and record the outcome: success, retry later, or failure."""
+    mine = Job.objects.filter(id=job.id, status=Job.RUNNING, locked_by=worker)
+    try:
+        # LLM calls of the job show up in the metrics as endpoint "job:<kind>"
+        with llm_endpoint(f"job:{job.kind}"):
+            result = get_handler(job.kind)(**job.payload)
+    except Exception:
+        error = traceback.format_exc(limit=5)
+        now = timezone.now()
+        if job.attempts < job.max_attempts:
+            mine.update(
+                status=Job.PENDING,
+                run_after=now + timedelta(seconds=backoff_delay(job.attempts)),
+                last_error=error,
+                locked_by="",
+                locked_at=None,
+            )
+        else:
+            mine.update(status=Job.FAILED, last_error=error, finished_at=now)
+    else:
+        mine.update(status=Job.SUCCEEDED, result=result, finished_at=timezone.now())
+    job.refresh_from_db()
+    return job
+
+
+def requeue_stale(timeout: Optional[float] = None) -> int:
+    """Hand jobs locked longer than JOBS_LOCK_TIMEOUT (their worker died) back to the queue; returns how many."""
+    timeout = timeout if timeout is not None else settings.JOBS_LOCK_TIMEOUT
+    now = timezone.now()
+    stale = Job.objects.filter(status=Job.RUNNING, locked_at__lt=now - timedelta(seconds=timeout))
+    # A job that used up its attempts is not retried again
+    stale.filter(attempts__gte=F("max_attempts")).update(
+        status=Job.FAILED, last_error="Worker stopped while running the job.", finished_at=now
+    )
+    return stale.update(status=Job.PENDING, locked_by="", locked_at=None, run_after=now)
@@ -0,0 +1,18 @@
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import get_object_or_404, render
+
+from .models import Job
+
+
+@login_required
+def job_status(request, pk):
+    """
+    Status badge of one of the user's jobs (htmx partial).
+    While the job is active the badge polls itself; when it succeeds the page is reloaded
+    so the results show up.
+    """
+    job = get_object_or_404(Job, pk=pk, owner=request.user)
+    response = render(request, "jobs/_job_status.html", {"job": job})
+    if job.status == Job.SUCCEEDED and request.htmx:
+        response["HX-Refresh"] = "true"
+    return response
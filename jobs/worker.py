@@ -0,0 +1,56 @@
+# jobs/worker.py
+"""
+Worker loop shared by the thread and process modes of `manage.py run_workers`.
+Imports of Django models happen inside the functions, so a freshly spawned
+process can set Django up before touching them.
+"""
+import os
+import signal
+import socket
+import time
+
+
+def worker_name(n: int) -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{n}"
+
+
+def work(n: int, stop, poll_interval: float, once: bool = False, log=print):
+    """
+    Claim and run jobs until `stop` (a threading/multiprocessing Event) is set.
+    With `once`, return as soon as no job is due (drain mode).
+    """
+    from django.conf import settings
+    from django.db import close_old_connections
+
+    from .services import claim_next, requeue_stale, run_job
+
+    name = worker_name(n)
+    last_sweep = 0.0
+    while not stop.is_set():
+        close_old_connections()
+        if time.monotonic() - last_sweep > settings.JOBS_LOCK_TIMEOUT / 2:
+            requeue_stale()
+            last_sweep = time.monotonic()
+
+        job = claim_next(name)
+        if job is None:
+            if once:
+                break
+            stop.wait(poll_interval)
+            continue
+
+        started = time.perf_counter()
+        job = run_job(job, name)
+        outcome = "will retry" if job.status == job.PENDING else job.status
+        log(f"[{name}] {job.kind} #{job.pk} {outcome} after {time.perf_counter() - started:.2f}s "
+            f"(attempt {job.attempts}/{job.max_attempts})")
+    close_old_connections()
+
+
+def process_main(n: int, stop, poll_interval: float, once: bool = False):
+    """Entry point of one worker process (spawned: Django is set up from scratch)."""
+    # Ctrl+C is handled by the parent, which sets `stop`; finish the current job instead of dying mid-way
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    import django
+    django.setup()
+    work(n, stop, poll_interval, once=once, log=lambda msg: print(msg, flush=True))
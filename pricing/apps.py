@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class PricingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'pricing'
+
+    def ready(self):
+        # Keep CurrentSuggestion up to date on per-row suggestion writes
+        from . import signals  # noqa: F401
@@ -0,0 +1,57 @@
+# pricing/management/commands/compact_suggestions.py
+import time
+from datetime import datetime, time as dt_time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from tqdm import tqdm
+
+from pricing.models import PriceSuggestion
+from pricing.retention import compact_price_suggestions
+
+class Command(BaseCommand):
+    help = "Roll price suggestions older than the retention window up into daily rollups and delete them."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep-days",
+            type=int,
+            default=30,
+            help="Days of full suggestion history to keep; older days are rolled up (default: 30).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Suggestions rolled up and deleted per transaction (default: 2000).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would be compacted without writing anything.",
+        )
+
+    def handle(self, *args, **options):
+        keep_days = options["keep_days"]
+        if keep_days < 0:
+            raise CommandError("--keep-days must be 0 or more.")
+        # Whole local days only, so a day is never split between raw rows and its rollup
+        first_kept_day = timezone.localdate() - timedelta(days=keep_days)
+        before = timezone.make_aware(datetime.combine(first_kept_day, dt_time.min))
+
+        total = PriceSuggestion.objects.filter(created_at__lt=before).count()
+        self.stdout.write(self.style.NOTICE(f"Found {total} suggestion(s) from before {first_kept_day}."))
+
+        started = time.perf_counter()
+        with tqdm(total=total, unit="row", disable=options["verbosity"] == 0) as progress:
+            stats = compact_price_suggestions(
+                before, batch_size=max(1, options["batch_size"]), dry_run=options["dry_run"],
+                progress=progress.update,
+            )
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(f"  ✓ {stats.kept} kept as their product's newest suggestion")
+        verb = "Would compact" if options["dry_run"] else "Compacted"
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. {verb} {stats.compacted} suggestion(s) into daily rollups ({stats.rollups} rollup write(s)) in {elapsed:.1f}s."
+        ))
@@ -1,10 +1,14 @@
 # pricing/management/commands/regen_suggestions.py
+import time
+from typing import Tuple
+
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
+from tqdm import tqdm
 
 from products.models import Product
-from pricing.models import PriceSuggestion, LogisticsInfo
-from pricing.services import generate_pricing_and_logistics
+from pricing.parallel import regenerate_sharded
+from pricing.services import save_suggestions
+from pricing.vectorized import INPUT_FIELDS
 
 class Command(BaseCommand):
     help = "Regenerate price & logistics suggestions for products."
@@ -20,13 +24,38 @@ class Command(BaseCommand):
             action="store_true",
             help="Clear old suggestions before regenerating.",
         )
+        parser.add_argument(
+            "--changed-only",
+            action="store_true",
+            help="Only products whose base price, stock or category changed since their last suggestion.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Products priced and written per transaction (default: 2000).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Processes pricing shards of the product id range in parallel (default: 1, no pool).",
+        )
+        parser.add_argument(
+            "--shards",
+            type=int,
+            default=None,
+            help="Id range shards for --workers (default: one per worker).",
+        )
 
-    @transaction.atomic
     def handle(self, *args, **options):
         product_id = options.get("product_id")
         clear = options.get("clear")
+        batch_size = max(1, options["batch_size"])
+        workers = max(1, options["workers"])
 
-        qs = Product.objects.all()
+        filters = {"pricing_dirty": True} if options["changed_only"] else {}
+        qs = Product.objects.order_by("id").filter(**filters)
         if product_id:
             qs = qs.filter(id=product_id)
             if not qs.exists():
@@ -35,14 +64,46 @@ class Command(BaseCommand):
         total = qs.count()
         self.stdout.write(self.style.NOTICE(f"Found {total} product(s)."))
 
-        done = 0
-        for p in qs.iterator():
-            if clear:
-                PriceSuggestion.objects.filter(product=p).delete()
-                LogisticsInfo.objects.filter(product=p).delete()
+        started = time.perf_counter()
+        with tqdm(total=total, unit="product", disable=options["verbosity"] == 0) as progress:
+            if workers > 1 and not product_id:
+                shards = regenerate_sharded(
+                    workers, options["shards"], filters, batch_size=batch_size, clear=clear, progress=progress.update
+                )
+                done = sum(s.products for s in shards)
+                written = sum(s.written for s in shards)
+            else:
+                shards = []
+                done, written = self._regenerate(qs, batch_size, clear, progress)
+        elapsed = max(time.perf_counter() - started, 1e-9)
 
-            generate_pricing_and_logistics(p)
-            done += 1
-            self.stdout.write(f"✓ Regenerated for product #{p.id}: {p.name}")
+        for s in shards:
+            line = (
+                f"  {'✗' if s.error else '✓'} shard {s.shard}: ids {s.first_id}–{s.last_id}, "
+                f"{s.products} product(s), {s.written} new, in {s.seconds:.1f}s "
+                f"({s.products / max(s.seconds, 1e-9):,.0f}/s)"
+            )
+            self.stdout.write(self.style.WARNING(line) if s.error else line)
+        failed = [s for s in shards if s.error]
+        if failed:
+            raise CommandError(
+                f"{len(failed)} shard(s) failed; their chunks before the error are written.\n{failed[0].error}"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. Regenerated: {done} product(s) in {elapsed:.1f}s ({done / elapsed:,.0f} products/s); "
+            f"{written} with new suggestions, {done - written} unchanged."
+        ))
 
-        self.stdout.write(self.style.SUCCESS(f"Done. Regenerated: {done} product(s)."))
+    @staticmethod
+    def _regenerate(qs, batch_size: int, clear: bool, progress) -> Tuple[int, int]:
+        # One transaction per chunk: other writers (SQLite has one at a time) get in between chunks
+        done = written = last_id = 0
+        while True:
+            rows = list(qs.filter(id__gt=last_id).values_list(*INPUT_FIELDS)[:batch_size])
+            if not rows:
+                break
+            written += len(save_suggestions(rows, clear=clear))
+            last_id = rows[-1][0]
+            done += len(rows)
+            progress.update(len(rows))
+        return done, written
@@ -0,0 +1,115 @@
+# Generated by Django 5.2.7 on 2026-10-17 19:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_current_suggestions(apps, schema_editor):
+    """Copy every product's newest price suggestion and logistics quote into CurrentSuggestion."""
+    db = schema_editor.connection.alias
+    Product = apps.get_model("products", "Product")
+    PriceSuggestion = apps.get_model("pricing", "PriceSuggestion")
+    LogisticsInfo = apps.get_model("pricing", "LogisticsInfo")
+    CurrentSuggestion = apps.get_model("pricing", "CurrentSuggestion")
+
+    newest_price = PriceSuggestion.objects.using(db).filter(product=OuterRef("pk")).order_by("-created_at", "-id")
+    newest_logistics = LogisticsInfo.objects.using(db).filter(product=OuterRef("pk")).order_by("-id")
+    newest = list(
+        Product.objects.using(db)
+        .annotate(
+            price_id=Subquery(newest_price.values("id")[:1]),
+            logistics_id=Subquery(newest_logistics.values("id")[:1]),
+        )
+        .values_list("id", "price_id", "logistics_id")
+    )
+    prices = PriceSuggestion.objects.using(db).in_bulk([price_id for _, price_id, _ in newest if price_id])
+    logistics = LogisticsInfo.objects.using(db).in_bulk([lg_id for _, _, lg_id in newest if lg_id])
+    rows = []
+    for pk, price_id, logistics_id in newest:
+        ps, lg = prices.get(price_id), logistics.get(logistics_id)
+        if ps is None and lg is None:
+            continue
+        rows.append(CurrentSuggestion(
+            product_id=pk,
+            suggested_price=ps and ps.suggested_price,
+            rationale=ps.rationale if ps else "",
+            suggested_at=ps and ps.created_at,
+            region=lg.region if lg else "",
+            carrier=lg.carrier if lg else "",
+            estimated_days=lg and lg.estimated_days,
+            cost_estimate=lg and lg.cost_estimate,
+        ))
+    CurrentSuggestion.objects.using(db).bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pricing', '0001_initial'),
+        ('products', '0011_product_pricing_dirty'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CurrentSuggestion',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='current_suggestion', serialize=False, to='products.product')),
+                ('suggested_price', models.DecimalField(decimal_places=2, max_digits=10, null=True)),
+                ('rationale', models.TextField(blank=True)),
+                ('suggested_at', models.DateTimeField(null=True)),
+                ('region', models.CharField(blank=True, max_length=100)),
+                ('carrier', models.CharField(blank=True, max_length=100)),
+                ('estimated_days', models.PositiveIntegerField(null=True)),
+                ('cost_estimate', models.DecimalField(decimal_places=2, max_digits=10, null=True)),
+            ],
+            options={
+                'verbose_name': 'Current suggestion',
+                'verbose_name_plural': 'Current suggestions',
+            },
+        ),
+        migrations.CreateModel(
+            name='PriceSuggestionDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('suggestions', models.PositiveIntegerField()),
+                ('min_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('max_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('total_price', models.DecimalField(decimal_places=2, max_digits=16)),
+                ('last_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('last_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Daily price suggestions',
+                'verbose_name_plural': 'Daily price suggestions',
+                'ordering': ['product', '-day'],
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='logisticsinfo',
+            options={'ordering': ['product', 'region'], 'verbose_name': 'Logistics info', 'verbose_name_plural': 'Logistics infos'},
+        ),
+        migrations.AlterModelOptions(
+            name='pricesuggestion',
+            options={'ordering': ['-created_at'], 'verbose_name': 'Price suggestion', 'verbose_name_plural': 'Price suggestions'},
+        ),
+        migrations.AddIndex(
+            model_name='logisticsinfo',
+            index=models.Index(fields=['product'], name='pricing_log_product_717936_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='logisticsinfo',
+            index=models.Index(fields=['region'], name='pricing_log_region_e6bb2d_idx'),
+        ),
+        migrations.AddField(
+            model_name='pricesuggestiondaily',
+            name='product',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='price_history', to='products.product'),
+        ),
+        migrations.AddConstraint(
+            model_name='pricesuggestiondaily',
+            constraint=models.UniqueConstraint(fields=('product', 'day'), name='pricing_daily_product_day_uniq'),
+        ),
+        migrations.RunPython(backfill_current_suggestions, migrations.RunPython.noop),
+    ]
@@ -36,3 +36,63 @@ class LogisticsInfo(models.Model):
     def __str__(self):
         carrier_part = f" | {self.carrier}" if self.carrier else ""
         return f"{self.product} @ {self.region}{carrier_part} — {self.cost_estimate}"
+
+
+class CurrentSuggestion(models.Model):
+    """
+    A product's newest price suggestion and logistics quote, copied from the history on
+    every write (pricing.services), so pages read them with a join instead of a sort.
+    The price / logistics columns are null until the product has that kind of suggestion.
+    """
+    product = models.OneToOneField(
+        Product, on_delete=models.CASCADE, primary_key=True, related_name="current_suggestion"
+    )
+    suggested_price = models.DecimalField(max_digits=10, decimal_places=2, null=True)
+    rationale = models.TextField(blank=True)
+    suggested_at = models.DateTimeField(null=True)
+    region = models.CharField(max_length=100, blank=True)
+    carrier = models.CharField(max_length=100, blank=True)
+    estimated_days = models.PositiveIntegerField(null=True)
+    cost_estimate = models.DecimalField(max_digits=10, decimal_places=2, null=True)
+
+    class Meta:
+        verbose_name = "Current suggestion"
+        verbose_name_plural = "Current suggestions"
+
+    def __str__(self):
+        return f"{self.product} → {self.suggested_price}"
+
+    @property
+    def has_price(self) -> bool:
+        return self.suggested_price is not None
+
+    @property
+    def has_logistics(self) -> bool:
+        return self.estimated_days is not None
+
+
+class PriceSuggestionDaily(models.Model):
+    """One day of a product's price suggestions, rolled up by the compact_suggestions command."""
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="price_history")
+    day = models.DateField()
+    suggestions = models.PositiveIntegerField()
+    min_price = models.DecimalField(max_digits=10, decimal_places=2)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2)
+    total_price = models.DecimalField(max_digits=16, decimal_places=2)
+    last_price = models.DecimalField(max_digits=10, decimal_places=2)
+    last_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["product", "-day"]
+        verbose_name = "Daily price suggestions"
+        verbose_name_plural = "Daily price suggestions"
+        constraints = [
+            models.UniqueConstraint(fields=["product", "day"], name="pricing_daily_product_day_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.product} @ {self.day}: {self.suggestions} × ~{self.avg_price}"
+
+    @property
+    def avg_price(self):
+        return round(self.total_price / self.suggestions, 2)
@@ -0,0 +1,130 @@
+# pricing/parallel.py
+"""
+Sharded regeneration of price and logistics suggestions (regen_suggestions --workers).
+
+The product id range is split into shards, each one a task of a process pool. A worker
+reads its shard chunk by chunk, prices it (pricing.vectorized) and prepares the insert
+rows. SQLite allows one writer at a time, so there the prepared chunks are sent back to
+the parent process, the only writer; on other databases each worker writes its own.
+"""
+import multiprocessing
+import queue
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from django.db import connection, connections
+from django.db.models import Max, Min
+
+from products.models import Product
+from .services import prepare_suggestions, write_suggestions
+from .vectorized import INPUT_FIELDS
+
+
+@dataclass
+class ShardStats:
+    shard: int
+    first_id: int
+    last_id: int
+    products: int = 0
+    written: int = 0
+    seconds: float = 0.0
+    error: str = ""
+
+
+def shard_ranges(first_id: int, last_id: int, shards: int) -> List[Tuple[int, int]]:
+    """Split the id range [first_id, last_id] into at most `shards` contiguous ranges of the same width."""
+    width = max(1, -(-(last_id - first_id + 1) // max(1, shards)))
+    return [(lo, min(lo + width - 1, last_id)) for lo in range(first_id, last_id + 1, width)]
+
+
+# Queue to the parent process, set in each worker by _init_worker
+_messages: Optional[multiprocessing.Queue] = None
+
+
+def _init_worker(messages: multiprocessing.Queue):
+    global _messages
+    import django
+
+    # Needed with the "spawn" start method (macOS / Windows); a no-op in forked workers
+    django.setup()
+    _messages = messages
+
+
+def _run_shard(stats: ShardStats, filters: dict, batch_size: int, clear: bool, single_writer: bool) -> ShardStats:
+    """Price one shard. Messages: ("rows", prepared chunk) / ("written", products priced), then ("shard", stats)."""
+    started = time.perf_counter()
+    try:
+        qs = Product.objects.order_by("id").filter(id__range=(stats.first_id, stats.last_id), **filters)
+        last_id = stats.first_id - 1
+        while True:
+            rows = list(qs.filter(id__gt=last_id).values_list(*INPUT_FIELDS)[:batch_size])
+            if not rows:
+                break
+            prepared = prepare_suggestions(rows, skip_unchanged=not clear)
+            if single_writer:
+                _messages.put(("rows", prepared))
+            else:
+                write_suggestions(prepared, clear=clear)
+                _messages.put(("written", len(rows)))
+            last_id = rows[-1][0]
+            stats.products += len(rows)
+            stats.written += len(prepared.ids)
+    except Exception:
+        stats.error = traceback.format_exc(limit=5)
+    finally:
+        connection.close()
+    stats.seconds = time.perf_counter() - started
+    _messages.put(("shard", stats))
+    return stats
+
+
+def regenerate_sharded(
+        workers: int,
+        shards: Optional[int] = None,
+        filters: Optional[dict] = None,
+        batch_size: int = 2000,
+        clear: bool = False,
+        progress: Callable[[int], None] = lambda n: None,
+) -> List[ShardStats]:
+    """
+    Regenerate the suggestions of the products matching `filters` (Product field lookups)
+    with `workers` processes over `shards` id ranges (default: one per worker).
+    `progress` is called with the number of products priced after every chunk.
+    Returns the stats of every shard; a shard that failed has its traceback in `error`.
+    """
+    filters = filters or {}
+    bounds = Product.objects.filter(**filters).aggregate(first=Min("id"), last=Max("id"))
+    if bounds["first"] is None:
+        return []
+    ranges = shard_ranges(bounds["first"], bounds["last"], shards or workers)
+    single_writer = connection.vendor == "sqlite"
+
+    messages = multiprocessing.Queue(maxsize=2 * workers)
+    # Forked workers must not share the parent's database connection
+    connections.close_all()
+    finished: List[ShardStats] = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(messages,)) as pool:
+        futures = [
+            pool.submit(_run_shard, ShardStats(i, lo, hi), filters, batch_size, clear, single_writer)
+            for i, (lo, hi) in enumerate(ranges, 1)
+        ]
+        while len(finished) < len(futures):
+            try:
+                kind, payload = messages.get(timeout=1.0)
+            except queue.Empty:
+                # A worker that died (e.g. killed) never reports: surface BrokenProcessPool instead of waiting
+                for future in futures:
+                    if future.done() and future.exception():
+                        raise future.exception()
+                continue
+            if kind == "rows":
+                write_suggestions(payload, clear=clear)
+                progress(len(payload.priced))
+            elif kind == "written":
+                progress(payload)
+            else:
+                finished.append(payload)
+    return sorted(finished, key=lambda s: s.shard)
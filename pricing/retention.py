@@ -0,0 +1,106 @@
+# pricing/retention.py
+"""
+Retention of the price suggestion history (compact_suggestions command).
+
+Every regeneration adds a PriceSuggestion row per product that changed. Rows older than
+the retention window are rolled up into one PriceSuggestionDaily row per product and
+day, then deleted; pages read pricing.CurrentSuggestion and never need the raw history.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from django.db import connection, transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from products.models import Product
+from .models import PriceSuggestion, PriceSuggestionDaily
+from .services import _delete_sql
+
+ROLLUP_FIELDS = ("suggestions", "min_price", "max_price", "total_price", "last_price", "last_at")
+
+
+@dataclass
+class CompactionStats:
+    compacted: int = 0  # suggestion rows rolled up (and deleted, unless a dry run)
+    kept: int = 0       # old rows kept because they are their product's newest suggestion
+    rollups: int = 0    # daily rollup upserts (a day spanning chunks counts once per chunk)
+
+
+def _add(rollup: PriceSuggestionDaily, count, low, high, total, last, last_at):
+    rollup.suggestions += count
+    rollup.min_price = min(rollup.min_price, low)
+    rollup.max_price = max(rollup.max_price, high)
+    rollup.total_price += total
+    if last_at >= rollup.last_at:
+        rollup.last_price, rollup.last_at = last, last_at
+
+
+def rollup_days(rows: Sequence[tuple]) -> List[PriceSuggestionDaily]:
+    """
+    Daily rollups of (id, product_id, created_at, suggested_price) rows in id order, merged
+    with the rollups already stored for the same product and day (days are local dates).
+    """
+    days: Dict[Tuple[int, object], PriceSuggestionDaily] = {}
+    for _, product_id, created_at, price in rows:
+        key = (product_id, timezone.localdate(created_at))
+        if key in days:
+            _add(days[key], 1, price, price, price, price, created_at)
+        else:
+            days[key] = PriceSuggestionDaily(
+                product_id=product_id, day=key[1], suggestions=1,
+                min_price=price, max_price=price, total_price=price, last_price=price, last_at=created_at,
+            )
+    stored = PriceSuggestionDaily.objects.filter(
+        product_id__in={k[0] for k in days}, day__in={k[1] for k in days}
+    )
+    for old in stored:
+        new = days.get((old.product_id, old.day))
+        if new is not None:
+            _add(new, *(getattr(old, name) for name in ROLLUP_FIELDS))
+    return list(days.values())
+
+
+def compact_price_suggestions(
+        before: datetime,
+        batch_size: int = 2000,
+        dry_run: bool = False,
+        progress: Callable[[int], None] = lambda n: None,
+) -> CompactionStats:
+    """
+    Roll up and delete the PriceSuggestion rows created before `before`, in id order and one
+    transaction per chunk of `batch_size` rows. Each product keeps its newest suggestion.
+    With `dry_run` nothing is written. `progress` is called with the rows read per chunk.
+    """
+    stats = CompactionStats()
+    old = PriceSuggestion.objects.filter(created_at__lt=before).order_by("id")
+    newest = PriceSuggestion.objects.filter(product=OuterRef("pk")).order_by("-created_at", "-id")
+    last_id = 0
+    while True:
+        rows = list(
+            old.filter(id__gt=last_id).values_list("id", "product_id", "created_at", "suggested_price")[:batch_size]
+        )
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        keep = set(
+            Product.objects.filter(id__in={row[1] for row in rows})
+            .annotate(newest_id=Subquery(newest.values("id")[:1]))
+            .values_list("newest_id", flat=True)
+        )
+        compact = [row for row in rows if row[0] not in keep]
+        with transaction.atomic():
+            rollups = rollup_days(compact)
+            if not dry_run and compact:
+                PriceSuggestionDaily.objects.bulk_create(
+                    rollups, update_conflicts=True, unique_fields=["product", "day"], update_fields=ROLLUP_FIELDS
+                )
+                # Old history is not on any page (those read CurrentSuggestion): no signals needed
+                with connection.cursor() as cursor:
+                    cursor.execute(_delete_sql(PriceSuggestion, "id", len(compact)), [row[0] for row in compact])
+        stats.compacted += len(compact)
+        stats.kept += len(rows) - len(compact)
+        stats.rollups += len(rollups)
+        progress(len(rows))
+    return stats
@@ -1,22 +1,223 @@
 # pricing/services.py
+from typing import Dict, Iterable, List, NamedTuple, Sequence
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.db.models import OuterRef, Subquery
+from django.db.models.constants import OnConflict
 from django.utils import timezone
+from products.bulk import products_bulk_changed
 from products.models import Product
-from .models import PriceSuggestion, LogisticsInfo
+from .models import CurrentSuggestion, PriceSuggestion, LogisticsInfo
 from .utils import suggest_price, estimate_logistics
+from .vectorized import price_rows
 
 def generate_pricing_and_logistics(product: Product):
+    """Price one product; pricing.signals refreshes its CurrentSuggestion and invalidates its pages."""
     ps = suggest_price(product)
-    PriceSuggestion.objects.create(
-        product=product,
-        suggested_price=ps.price,
-        rationale=ps.rationale,
-        created_at=timezone.now()
-    )
     lg = estimate_logistics(product)
-    LogisticsInfo.objects.create(
-        product=product,
-        region=lg.region,
-        carrier=lg.carrier,
-        estimated_days=lg.days,
-        cost_estimate=lg.cost
+    with transaction.atomic():
+        PriceSuggestion.objects.create(
+            product=product,
+            suggested_price=ps.price,
+            rationale=ps.rationale,
+            created_at=timezone.now()
+        )
+        LogisticsInfo.objects.create(
+            product=product,
+            region=lg.region,
+            carrier=lg.carrier,
+            estimated_days=lg.days,
+            cost_estimate=lg.cost
+        )
+        mark_priced([(product.pk, product.base_price, product.stock, product.category)])
+
+
+class PreparedSuggestions(NamedTuple):
+    """
+    Database-ready rows for one chunk (see prepare_suggestions); picklable, so a worker
+    process can build them. `ids` are the products with new rows, `priced` the inputs
+    (id, base_price, stock, category) of every product priced, for mark_priced().
+    """
+
+    ids: List[int]
+    suggestions: List[tuple]
+    logistics: List[tuple]
+    current: List[tuple]
+    priced: List[tuple]
+
+
+# Columns written per table, in row order
+SUGGESTION_FIELDS = ("product", "suggested_price", "rationale", "created_at")
+LOGISTICS_FIELDS = ("product", "region", "carrier", "estimated_days", "cost_estimate")
+CURRENT_FIELDS = (
+    "product", "suggested_price", "rationale", "suggested_at", "region", "carrier", "estimated_days", "cost_estimate",
+)
+
+
+def latest_suggestions(ids: Iterable[int]) -> Dict[int, tuple]:
+    """
+    Product id -> (suggested_price, rationale, region, carrier, estimated_days, cost_estimate)
+    of its current suggestion, for products that have both a price and a logistics quote.
+    """
+    return {
+        row[0]: row[1:]
+        for row in CurrentSuggestion.objects.filter(
+            product_id__in=list(ids), suggested_price__isnull=False, estimated_days__isnull=False
+        ).values_list(
+            "product_id", "suggested_price", "rationale", "region", "carrier", "estimated_days", "cost_estimate"
+        )
+    }
+
+
+def refresh_current_suggestions(ids: Iterable[int]):
+    """
+    Recompute the CurrentSuggestion of products from their newest PriceSuggestion and
+    LogisticsInfo, for per-row writes (pricing.signals); the bulk writer upserts it itself.
+    """
+    ids = list(ids)
+    newest_price = PriceSuggestion.objects.filter(product=OuterRef("pk")).order_by("-created_at", "-id")
+    newest_logistics = LogisticsInfo.objects.filter(product=OuterRef("pk")).order_by("-id")
+    newest = list(
+        Product.objects.filter(id__in=ids)
+        .annotate(
+            price_id=Subquery(newest_price.values("id")[:1]),
+            logistics_id=Subquery(newest_logistics.values("id")[:1]),
+        )
+        .values_list("id", "price_id", "logistics_id")
+    )
+    prices = PriceSuggestion.objects.in_bulk([price_id for _, price_id, _ in newest if price_id])
+    logistics = LogisticsInfo.objects.in_bulk([lg_id for _, _, lg_id in newest if lg_id])
+
+    current, empty = [], []
+    for pk, price_id, logistics_id in newest:
+        ps, lg = prices.get(price_id), logistics.get(logistics_id)
+        if ps is None and lg is None:
+            empty.append(pk)
+            continue
+        current.append(CurrentSuggestion(
+            product_id=pk,
+            suggested_price=ps.suggested_price if ps else None,
+            rationale=ps.rationale if ps else "",
+            suggested_at=ps.created_at if ps else None,
+            region=lg.region if lg else "",
+            carrier=lg.carrier if lg else "",
+            estimated_days=lg.estimated_days if lg else None,
+            cost_estimate=lg.cost_estimate if lg else None,
+        ))
+    CurrentSuggestion.objects.filter(product_id__in=empty).delete()
+    CurrentSuggestion.objects.bulk_create(
+        current, update_conflicts=True, unique_fields=["product"], update_fields=list(CURRENT_FIELDS[1:])
+    )
+
+
+def prepare_suggestions(rows: Sequence[tuple], skip_unchanged: bool = True) -> PreparedSuggestions:
+    """
+    Price (id, base_price, stock, category) rows (pricing.vectorized.INPUT_FIELDS) and build
+    the PriceSuggestion / LogisticsInfo inserts and CurrentSuggestion upserts. With
+    `skip_unchanged`, products whose result equals their current suggestion get no new rows.
+    """
+    # The connection itself rather than the `connection` proxy, which costs a lookup per attribute
+    conn = connections[DEFAULT_DB_ALIAS]
+    price_field = PriceSuggestion._meta.get_field("suggested_price")
+    created_field = PriceSuggestion._meta.get_field("created_at")
+    cost_field = LogisticsInfo._meta.get_field("cost_estimate")
+    now = created_field.get_db_prep_save(timezone.now(), conn)
+    latest = latest_suggestions(row[0] for row in rows) if skip_unchanged else {}
+
+    ids, suggestions, logistics, current = [], [], [], []
+    for pk, ps, lg in price_rows(rows).results():
+        price = price_field.get_db_prep_save(ps.price, conn)
+        cost = cost_field.get_db_prep_save(lg.cost, conn)
+        if latest.get(pk) == (price, ps.rationale, lg.region, lg.carrier, lg.days, cost):
+            continue
+        ids.append(pk)
+        suggestions.append((pk, price, ps.rationale, now))
+        logistics.append((pk, lg.region, lg.carrier, lg.days, cost))
+        current.append((pk, price, ps.rationale, now, lg.region, lg.carrier, lg.days, cost))
+    return PreparedSuggestions(ids, suggestions, logistics, current, list(rows))
+
+
+def _insert_sql(model, names, upsert: bool = False) -> str:
+    """INSERT of one row of `names`; with `upsert`, one that updates the row with the same primary key instead."""
+    qn = connection.ops.quote_name
+    fields = [model._meta.get_field(name) for name in names]
+    columns = [qn(f.column) for f in fields]
+    sql = (
+        f"INSERT INTO {qn(model._meta.db_table)} ({', '.join(columns)}) "
+        f"VALUES ({', '.join(['%s'] * len(columns))})"
+    )
+    if upsert:
+        # The backend's own ON CONFLICT / ON DUPLICATE KEY clause, as bulk_create(update_conflicts=True) writes it
+        suffix = connection.ops.on_conflict_suffix_sql(
+            fields, OnConflict.UPDATE,
+            [f.column for f in fields if not f.primary_key], [model._meta.pk.column],
+        )
+        sql = f"{sql} {suffix}"
+    return sql
+
+
+def _delete_sql(model, name: str, count: int) -> str:
+    """
+    DELETE of the rows whose `name` is one of `count` values: set-based, unlike
+    QuerySet.delete(), which loads every row to send its delete signals.
+    """
+    qn = connection.ops.quote_name
+    column = qn(model._meta.get_field(name).column)
+    return f"DELETE FROM {qn(model._meta.db_table)} WHERE {column} IN ({', '.join(['%s'] * count)})"
+
+
+def mark_priced(priced: Sequence[tuple]):
+    """
+    Clear pricing_dirty of products priced from (id, base_price, stock, category), but only
+    where those are still the stored values: a product edited meanwhile stays dirty.
+    """
+    if not priced:
+        return
+    opts = Product._meta
+    qn = connection.ops.quote_name
+    fields = [opts.get_field(name) for name in Product.PRICING_INPUT_FIELDS]
+    sql = (
+        f"UPDATE {qn(opts.db_table)} SET {qn(opts.get_field('pricing_dirty').column)} = %s "
+        f"WHERE {qn(opts.pk.column)} = %s AND " + " AND ".join(f"{qn(f.column)} = %s" for f in fields)
     )
+    clean = opts.get_field("pricing_dirty").get_db_prep_save(False, connection)
+    params = [
+        [clean, pk, *(f.get_db_prep_save(v, connection) for f, v in zip(fields, values))]
+        for pk, *values in priced
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, params)
+
+
+def write_suggestions(prepared: PreparedSuggestions, clear: bool = False) -> List[int]:
+    """
+    Write one prepared chunk in one transaction: set-based deletes (with `clear`), one
+    executemany'd INSERT per table, which costs the writer far less than bulk_create(),
+    the CurrentSuggestion upserts and mark_priced(). Returns the product ids given new suggestions.
+    """
+    ids = prepared.ids
+    with transaction.atomic(), connection.cursor() as cursor:
+        if clear and ids:
+            # No delete signals: the CurrentSuggestion upserts and the products_bulk_changed
+            # below cover what those receivers do
+            cursor.execute(_delete_sql(PriceSuggestion, "product", len(ids)), ids)
+            cursor.execute(_delete_sql(LogisticsInfo, "product", len(ids)), ids)
+        cursor.executemany(_insert_sql(PriceSuggestion, SUGGESTION_FIELDS), prepared.suggestions)
+        cursor.executemany(_insert_sql(LogisticsInfo, LOGISTICS_FIELDS), prepared.logistics)
+        cursor.executemany(_insert_sql(CurrentSuggestion, CURRENT_FIELDS, upsert=True), prepared.current)
+        if ids:
+            # Conditional GET validators of the detail pages (see pricing.signals.suggestion_written)
+            Product.objects.filter(id__in=ids).update(updated_at=timezone.now())
+        mark_priced(prepared.priced)
+    if ids:
+        products_bulk_changed.send(sender=Product, product_ids=ids, fields={"price_suggestions", "logistics"})
+    return ids
+
+
+def save_suggestions(rows: Sequence[tuple], clear: bool = False) -> List[int]:
+    """
+    Bulk counterpart of generate_pricing_and_logistics for (id, base_price, stock, category)
+    rows: prepare_suggestions + write_suggestions. With `clear` the old suggestions are
+    replaced, otherwise unchanged results are skipped. Returns the product ids given new suggestions.
+    """
+    return write_suggestions(prepare_suggestions(rows, skip_unchanged=not clear), clear=clear)
@@ -0,0 +1,29 @@
+# pricing/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from products.bulk import products_bulk_changed
+from products.models import Product
+from .models import PriceSuggestion, LogisticsInfo
+from .services import refresh_current_suggestions
+
+# Related data named in products_bulk_changed's `fields`
+CHANGED_FIELDS = {PriceSuggestion: "price_suggestions", LogisticsInfo: "logistics"}
+
+
+@receiver([post_save, post_delete], sender=PriceSuggestion)
+@receiver([post_save, post_delete], sender=LogisticsInfo)
+def suggestion_written(sender, instance, origin=None, **kwargs):
+    """
+    Per-row suggestion writes (e.g. the admin): refresh the product's CurrentSuggestion
+    first, then touch updated_at for conditional GET validators and tell the
+    products_bulk_changed receivers (fragment cache, product contexts). Invalidating first
+    would let a concurrent render cache the old CurrentSuggestion under the new version.
+    """
+    # Deleting the product cascades to its history and its CurrentSuggestion alike
+    if getattr(origin, "model", type(origin)) is Product:
+        return
+    refresh_current_suggestions([instance.product_id])
+    Product.objects.filter(pk=instance.product_id).update(updated_at=timezone.now())
+    products_bulk_changed.send(sender=Product, product_ids=[instance.product_id], fields={CHANGED_FIELDS[sender]})
@@ -1,3 +1,121 @@
+# pricing/tests.py
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
 
-# Create your tests here.
+from products.bulk import products_bulk_changed, set_product_fields
+from products.models import Product, SupplierProfile
+from .models import CurrentSuggestion, LogisticsInfo, PriceSuggestion
+from .services import generate_pricing_and_logistics, mark_priced, save_suggestions
+from .vectorized import INPUT_FIELDS
+
+
+class SaveSuggestionsTests(TestCase):
+    """The bulk writer: hand-written INSERTs / DELETEs, the CurrentSuggestion upsert and mark_priced."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create(username="supplier")
+        supplier = SupplierProfile.objects.create(user=user, company_name="Farm")
+        cls.products = [
+            Product.objects.create(
+                supplier=supplier, name=f"P{i}", category=category, unit="kg", stock=stock, base_price=price
+            )
+            for i, (category, stock, price) in enumerate([
+                ("Fruit", 10, Decimal("4.50")),
+                ("Veg", 0, Decimal("80.00")),
+                ("Dairy", 500, Decimal("12.25")),
+            ])
+        ]
+        cls.ids = [p.pk for p in cls.products]
+
+    def rows(self):
+        return list(Product.objects.filter(id__in=self.ids).order_by("id").values_list(*INPUT_FIELDS))
+
+    def history(self, model):
+        return {pk: model.objects.filter(product_id=pk).count() for pk in self.ids}
+
+    def assertCurrentIsNewest(self):
+        """Each product's CurrentSuggestion holds its newest PriceSuggestion and LogisticsInfo."""
+        self.assertEqual(CurrentSuggestion.objects.count(), len(self.ids))
+        for pk in self.ids:
+            current = CurrentSuggestion.objects.get(product_id=pk)
+            ps = PriceSuggestion.objects.filter(product_id=pk).latest("created_at", "id")
+            lg = LogisticsInfo.objects.filter(product_id=pk).latest("id")
+            self.assertEqual(
+                (current.suggested_price, current.rationale, current.suggested_at),
+                (ps.suggested_price, ps.rationale, ps.created_at),
+            )
+            self.assertEqual(
+                (current.region, current.carrier, current.estimated_days, current.cost_estimate),
+                (lg.region, lg.carrier, lg.estimated_days, lg.cost_estimate),
+            )
+
+    def assertDirty(self, expected):
+        self.assertEqual(
+            dict(Product.objects.filter(id__in=self.ids).values_list("id", "pricing_dirty")), expected
+        )
+
+    def test_unchanged_results_are_skipped(self):
+        self.assertDirty({pk: True for pk in self.ids})
+        self.assertEqual(sorted(save_suggestions(self.rows())), self.ids)
+        self.assertEqual(save_suggestions(self.rows()), [])
+        self.assertEqual(self.history(PriceSuggestion), {pk: 1 for pk in self.ids})
+        self.assertEqual(self.history(LogisticsInfo), {pk: 1 for pk in self.ids})
+        self.assertCurrentIsNewest()
+        self.assertDirty({pk: False for pk in self.ids})
+
+    def test_changed_inputs_are_repriced(self):
+        save_suggestions(self.rows())
+        changed = self.ids[0]
+        set_product_fields([(changed, [Decimal("40.00")])], ["base_price"])
+        self.assertDirty({pk: pk == changed for pk in self.ids})
+
+        self.assertEqual(save_suggestions(self.rows()), [changed])
+        self.assertEqual(self.history(PriceSuggestion), {pk: 1 + (pk == changed) for pk in self.ids})
+        self.assertEqual(self.history(LogisticsInfo), {pk: 1 + (pk == changed) for pk in self.ids})
+        self.assertCurrentIsNewest()
+        self.assertEqual(
+            CurrentSuggestion.objects.get(product_id=changed).suggested_price,
+            PriceSuggestion.objects.filter(product_id=changed).latest("created_at", "id").suggested_price,
+        )
+        self.assertDirty({pk: False for pk in self.ids})
+
+    def test_clear_replaces_the_history(self):
+        generate_pricing_and_logistics(self.products[0])
+        generate_pricing_and_logistics(self.products[0])
+        self.assertEqual(self.history(PriceSuggestion)[self.ids[0]], 2)
+
+        for _ in range(2):
+            self.assertEqual(sorted(save_suggestions(self.rows(), clear=True)), self.ids)
+            self.assertEqual(self.history(PriceSuggestion), {pk: 1 for pk in self.ids})
+            self.assertEqual(self.history(LogisticsInfo), {pk: 1 for pk in self.ids})
+            self.assertCurrentIsNewest()
+            self.assertDirty({pk: False for pk in self.ids})
+
+    def test_clear_leaves_other_products_alone(self):
+        save_suggestions(self.rows())
+        save_suggestions(self.rows()[:1], clear=True)
+        self.assertEqual(self.history(PriceSuggestion), {pk: 1 for pk in self.ids})
+        self.assertCurrentIsNewest()
+
+    def test_written_products_are_announced(self):
+        sent = []
+
+        def receiver(sender, product_ids, fields, **kwargs):
+            sent.append((sorted(product_ids), fields))
+
+        products_bulk_changed.connect(receiver)
+        try:
+            save_suggestions(self.rows())
+            save_suggestions(self.rows())
+        finally:
+            products_bulk_changed.disconnect(receiver)
+        self.assertEqual(sent, [(self.ids, {"price_suggestions", "logistics"})])
+
+    def test_mark_priced_keeps_products_edited_meanwhile_dirty(self):
+        priced = self.rows()
+        set_product_fields([(self.ids[1], [7])], ["stock"])
+        mark_priced(priced)
+        self.assertDirty({pk: pk == self.ids[1] for pk in self.ids})
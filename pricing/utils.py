@@ -2,6 +2,11 @@
 from dataclasses import dataclass
 from products.models import Product
 
+# Only carrier / region for now (see estimate_logistics)
+LOGISTICS_CARRIER = "AusPost"
+LOGISTICS_REGION = "Australia (NSW)"
+
+
 @dataclass
 class PriceSuggestionResult:
     price: float
@@ -16,6 +21,16 @@ class LogisticsInfoResult:
     cost: float
 
 
+def category_factor(category: str) -> float:
+    """Category-based adjustment (example)."""
+    cat = (category or "").lower()
+    if "fruit" in cat:
+        return 1.05
+    if "vegetable" in cat:
+        return 0.98
+    return 1.00
+
+
 def suggest_price(product: Product) -> PriceSuggestionResult:
     """
     Simple rule: adjust the seller’s base price slightly based on stock, category, and seasonal factors.
@@ -27,13 +42,7 @@ def suggest_price(product: Product) -> PriceSuggestionResult:
     # The higher the stock, the lower the price; the lower the stock, the higher the price
     inv_factor = 0.95 if stock > 500 else (0.98 if stock > 100 else (1.02 if stock < 30 else 1.0))
 
-    # Category-based adjustment (example)
-    cat = (product.category or "").lower()
-    cat_factor = 1.00
-    if "fruit" in cat:
-        cat_factor = 1.05
-    elif "vegetable" in cat:
-        cat_factor = 0.98
+    cat_factor = category_factor(product.category)
 
     price = round(base * inv_factor * cat_factor, 2)
     rationale = f"Estimated based on base price {base}, stock {stock}, and category '{product.category}'."
@@ -44,8 +53,8 @@ def estimate_logistics(product: Product) -> LogisticsInfoResult:
     """
     Logistics estimation: simplified assumption that each item equals one unit of weight and is delivered locally.
     """
-    carrier = "AusPost"
-    region = "Australia (NSW)"
+    carrier = LOGISTICS_CARRIER
+    region = LOGISTICS_REGION
     # Approximate shipping cost using price as a proxy for weight/volume; replace with actual weight/volume fields if available
     base = float(product.base_price)
     cost = round(max(5.0, min(50.0, base * 0.12)), 2)
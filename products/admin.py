@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import Product
+from search.services import search_products
 
 
 
@@ -22,17 +23,18 @@ class ProductAdmin(admin.ModelAdmin):
         "created_at",
     )
 
-    # Allow searching by product info or supplier-related fields
+    # Supplier-related fields; product name/category/descriptions go through the full-text index
     search_fields = (
-        "id",
-        "name",
-        "category",
+        "=id",
         "supplier__company_name",
         "supplier__contact_name",
         "supplier__user__username",
         "supplier__user__email",
     )
 
+    # Upper bound on index hits merged into one admin search
+    search_index_limit = 1000
+
     # Filters for category, active status, and supplier's user
     list_filter = ("category", "is_active", ("supplier__user", admin.RelatedOnlyFieldListFilter))
 
@@ -42,6 +44,16 @@ class ProductAdmin(admin.ModelAdmin):
     ordering = ("-created_at",)
     readonly_fields = ("created_at",)
 
+    def get_search_results(self, request, queryset, search_term):
+        """Combine supplier field matches with ranked hits from the product search index."""
+        base = queryset
+        queryset, may_have_duplicates = super().get_search_results(request, base, search_term)
+        if search_term:
+            result = search_products(search_term, limit=self.search_index_limit, active_only=False)
+            if result.hits:
+                queryset |= base.filter(pk__in=[pk for pk, _ in result.hits])
+        return queryset, may_have_duplicates
+
     def owner(self, obj):
         """Return the auth user behind this product's supplier."""
         return getattr(obj.supplier, "user", None)
@@ -0,0 +1,91 @@
+# products/api.py
+from django.conf import settings
+from django.db.models import F
+from django.utils.dateparse import parse_datetime
+from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+
+from .models import Product
+from .serializers import ProductSerializer, requested_fields
+
+# Model columns each serializer field needs (id/updated_at are always loaded for the cursor)
+FIELD_COLUMNS = {
+    "id": ("id",),
+    "name": ("name",),
+    "category": ("category",),
+    "unit": ("unit",),
+    "stock": ("stock",),
+    "base_price": ("base_price",),
+    "image": ("image",),
+    "purchase_link": ("purchase_link",),
+    "ai_description_en": ("ai_description_en",),
+    "ai_description_zh": ("ai_description_zh",),
+    "supplier": ("supplier__company_name",),
+    "is_active": ("is_active",),
+    "created_at": ("created_at",),
+    "updated_at": ("updated_at",),
+}
+
+
+class ProductCursorPagination(CursorPagination):
+    """Stable cursor over (updated_at, id): pages stay consistent while the catalog changes."""
+    ordering = ("-updated_at", "-id")
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+
+class ProductViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    GET /api/products/ — listed products, newest modification first.
+      ?category=Fruit       exact category
+      ?fields=id,name,...   sparse fieldset (only those columns are loaded)
+      ?updated_since=ISO    only products modified at/after that time; also returns
+                            delisted products (is_active=false) so mirrors can drop them
+    Each page costs one SQL query, latest suggested price and logistics quote included.
+    """
+    serializer_class = ProductSerializer
+    pagination_class = ProductCursorPagination
+
+    def get_queryset(self):
+        params = self.request.query_params
+        qs = Product.objects.all()
+
+        updated_since = params.get("updated_since")
+        if updated_since:
+            since = parse_datetime(updated_since)
+            if since is None:
+                raise ValidationError({"updated_since": "Expected an ISO 8601 datetime."})
+            qs = qs.filter(updated_at__gte=since)
+        else:
+            qs = qs.filter(is_active=True)
+
+        if params.get("category"):
+            qs = qs.filter(category=params["category"])
+
+        return self._project(qs)
+
+    def _project(self, qs):
+        """Load only the columns and annotations the requested fields need."""
+        wanted = requested_fields(self.request, ProductSerializer.Meta.fields)
+        wanted = set(ProductSerializer.Meta.fields) if wanted is None else wanted
+
+        columns = {"id", "updated_at"}
+        for name in wanted & FIELD_COLUMNS.keys():
+            columns.update(FIELD_COLUMNS[name])
+        if "supplier" in wanted:
+            qs = qs.select_related("supplier")
+        qs = qs.only(*columns)
+
+        # Latest suggestion / quote: columns of the LEFT JOINed pricing.CurrentSuggestion row
+        if "suggested_price" in wanted:
+            qs = qs.annotate(latest_price=F("current_suggestion__suggested_price"))
+        if "logistics" in wanted:
+            qs = qs.annotate(
+                latest_lg_region=F("current_suggestion__region"),
+                latest_lg_carrier=F("current_suggestion__carrier"),
+                latest_lg_days=F("current_suggestion__estimated_days"),
+                latest_lg_cost=F("current_suggestion__cost_estimate"),
+            )
+        return qs
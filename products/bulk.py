@@ -0,0 +1,115 @@
+# products/bulk.py
+"""
+Bulk writes to products.
+
+bulk_update() / bulk_create() / QuerySet.update() send no model signals, so the
+fragment cache, the search index and the AI product contexts would never hear
+about them. Bulk writers go through these helpers, or send
+`products_bulk_changed` themselves after writing.
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from django.db import connection, transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import Product
+
+# Sent with sender=Product, product_ids=[...], fields={...} (the product fields written,
+# or the names of related data such as "price_suggestions")
+products_bulk_changed = Signal()
+
+
+def bulk_update_products(products: Sequence[Product], fields: Iterable[str], batch_size: Optional[int] = None):
+    """bulk_update() that also bumps updated_at and tells receivers which products changed."""
+    if not products:
+        return
+    fields = set(fields)
+    written = fields | {"updated_at"}
+    now = timezone.now()
+    for p in products:
+        p.updated_at = now
+    if fields & set(Product.PRICING_INPUT_FIELDS):
+        written.add("pricing_dirty")
+        for p in products:
+            p.pricing_dirty = True
+    Product.objects.bulk_update(products, sorted(written), batch_size=batch_size)
+    products_bulk_changed.send(sender=Product, product_ids=[p.pk for p in products], fields=fields)
+
+
+def set_product_fields(rows: Sequence[Tuple[int, Sequence[Any]]], fields: Sequence[str]):
+    """
+    Write `fields` of products addressed by primary key, without reading them first:
+    rows are (pk, values in `fields` order). One executemany'd UPDATE per call, which is
+    far cheaper than bulk_update()'s CASE WHEN per field on large backfills.
+    Bumps updated_at (and sets pricing_dirty when a pricing input is written) and sends
+    products_bulk_changed; unknown ids are ignored.
+    """
+    if not rows:
+        return
+    opts = Product._meta
+    model_fields = [opts.get_field(name) for name in fields]
+    qn = connection.ops.quote_name
+    assignments = ", ".join(f"{qn(f.column)} = %s" for f in [*model_fields, opts.get_field("updated_at")])
+    if set(fields) & set(Product.PRICING_INPUT_FIELDS):
+        assignments += f", {qn(opts.get_field('pricing_dirty').column)} = %s"
+        flags = [opts.get_field("pricing_dirty").get_db_prep_save(True, connection)]
+    else:
+        flags = []
+    sql = f"UPDATE {qn(opts.db_table)} SET {assignments} WHERE {qn(opts.pk.column)} = %s"
+
+    now = opts.get_field("updated_at").get_db_prep_save(timezone.now(), connection)
+    params = [
+        [*(f.get_db_prep_save(v, connection) for f, v in zip(model_fields, values)), now, *flags, pk]
+        for pk, values in rows
+    ]
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(sql, params)
+    products_bulk_changed.send(sender=Product, product_ids=[pk for pk, _ in rows], fields=set(fields))
+
+
+# Batch-file backfills (see ai.batch): custom ids are "product:<pk>:<json|lang>"
+DESCRIPTION_FIELDS = {"en": "ai_description_en", "zh": "ai_description_zh"}
+
+
+def description_batch_requests(products: Iterable[Product], llm, mode: Optional[str] = None) -> Iterator[dict]:
+    """Batch request lines generating the descriptions of `products`."""
+    for p in products:
+        yield from llm.description_batch_requests(f"product:{p.pk}", p.name, p.category, p.unit, p.stock, mode=mode)
+
+
+def ingest_description_results(results: Iterable, chunk_size: int = 1000) -> Tuple[int, List[str]]:
+    """
+    Write description batch results (ai.batch.BatchResult) to their products,
+    `chunk_size` products per UPDATE (see set_product_fields).
+    Returns (product rows updated, custom ids that failed).
+    """
+    from ai.llm import LLMClient
+
+    written, failed = 0, []
+
+    def flush(chunk: Dict[int, Dict[str, str]]):
+        nonlocal written
+        # One UPDATE per set of languages (a per-language run delivers them separately)
+        groups: Dict[Tuple[str, ...], List[Tuple[int, List[str]]]] = {}
+        for pk, descs in chunk.items():
+            langs = tuple(sorted(descs))
+            groups.setdefault(langs, []).append((pk, [descs[lang] for lang in langs]))
+        for langs, rows in groups.items():
+            set_product_fields(rows, [DESCRIPTION_FIELDS[lang] for lang in langs])
+            written += len(rows)
+
+    chunk: Dict[int, Dict[str, str]] = {}
+    for result in results:
+        key, descs = LLMClient.parse_description_result(result.custom_id, result.text)
+        if result.error or not descs or not key.startswith("product:"):
+            failed.append(result.custom_id)
+            continue
+        descs = {lang: text for lang, text in descs.items() if lang in DESCRIPTION_FIELDS}
+        chunk.setdefault(int(key.split(":")[1]), {}).update(descs)
+        if len(chunk) >= chunk_size:
+            flush(chunk)
+            chunk = {}
+    if chunk:
+        flush(chunk)
+    return written, failed
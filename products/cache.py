@@ -0,0 +1,100 @@
+# products/cache.py
+"""
+Versioned cache for rendered catalog pages and product-detail fragments.
+
+Every fragment key embeds a version number: one for the whole catalog and one
+per product. Writes never delete fragments, they bump the version so the next
+read misses and stale entries simply age out of the cache.
+"""
+import hashlib
+import time
+from typing import Callable, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+
+CATALOG_VERSION_KEY = "fragcache:catalog:version"
+STATS_KEYS = {"hit": "fragcache:stats:hits", "miss": "fragcache:stats:misses"}
+
+
+def _product_version_key(pk: int) -> str:
+    return f"fragcache:product:{pk}:version"
+
+
+def _get_version(key: str) -> int:
+    version = cache.get(key)
+    if version is None:
+        # Seed with a fresh value so a version evicted from the cache can never come back
+        # as a number that old fragments were stored under.
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key, 0)
+    return version
+
+
+def _bump(key: str):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def catalog_version() -> int:
+    return _get_version(CATALOG_VERSION_KEY)
+
+
+def product_version(pk: int) -> int:
+    return _get_version(_product_version_key(pk))
+
+
+def bump_catalog_version():
+    _bump(CATALOG_VERSION_KEY)
+
+
+def bump_product_versions(pks: Iterable[int]):
+    # One set_many instead of an incr per product (bulk writes bump thousands at once).
+    # A fresh time_ns is larger than any version seeded earlier and incremented since.
+    version = time.time_ns()
+    cache.set_many({_product_version_key(pk): version for pk in set(pks)}, timeout=None)
+
+
+def _count(outcome: str):
+    try:
+        cache.incr(STATS_KEYS[outcome])
+    except ValueError:
+        cache.add(STATS_KEYS[outcome], 0, timeout=None)
+        cache.incr(STATS_KEYS[outcome])
+
+
+def get_or_render(key: str, render: Callable):
+    """Return the cached value for `key`, rendering and storing it on a miss."""
+    value = cache.get(key)
+    if value is not None:
+        _count("hit")
+        return value
+    _count("miss")
+    value = render()
+    if value is not None:
+        cache.set(key, value, settings.FRAGMENT_CACHE_TIMEOUT)
+    return value
+
+
+def catalog_page_key(params: str) -> str:
+    """Key for one rendered catalog page; `params` is the query string that selects the page."""
+    digest = hashlib.sha1(params.encode()).hexdigest()
+    return f"fragcache:catalog:{catalog_version()}:{digest}"
+
+
+def product_detail_key(pk: int) -> str:
+    return f"fragcache:product:{pk}:{product_version(pk)}:detail"
+
+
+def stats() -> dict:
+    values = cache.get_many(STATS_KEYS.values())
+    hits = values.get(STATS_KEYS["hit"], 0)
+    misses = values.get(STATS_KEYS["miss"], 0)
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_rate": (hits / total) if total else 0.0}
+
+
+def reset_stats():
+    cache.delete_many(STATS_KEYS.values())
@@ -0,0 +1,60 @@
+# products/conditional.py
+"""
+Conditional GET for buyer pages.
+
+Views declare a cheap validator function (a cache read or one indexed lookup, no template
+rendering). Matching If-None-Match / If-Modified-Since requests are answered
+with 304 Not Modified before the view runs.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+def conditional_page(validators, shared: bool = False):
+    """
+    `validators(request, *args, **kwargs)` returns (etag_source, last_modified) or None.
+    The ETag also covers the user and htmx flag, since both change the rendered page.
+    With `shared=True`, anonymous responses may be stored by a reverse proxy for
+    CATALOG_PROXY_MAX_AGE seconds; everything else must be revalidated by the browser.
+    """
+    def decorator(view):
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(request, *args, **kwargs)
+
+            found = validators(request, *args, **kwargs)
+            if found is None:
+                # Nothing to validate against (e.g. 404): let the view answer
+                return view(request, *args, **kwargs)
+
+            etag_source, last_modified = found
+            user_key = request.user.pk if request.user.is_authenticated else "anon"
+            raw = f"{etag_source}|{user_key}|{bool(request.htmx)}"
+            etag = quote_etag(hashlib.sha1(raw.encode()).hexdigest())
+            timestamp = int(last_modified.timestamp()) if last_modified else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+            elif response.status_code != 304:
+                # 412 Precondition Failed
+                return response
+
+            response.headers.setdefault("ETag", etag)
+            if timestamp is not None:
+                response.headers.setdefault("Last-Modified", http_date(timestamp))
+            if shared and not request.user.is_authenticated:
+                patch_cache_control(response, public=True, max_age=0, s_maxage=settings.CATALOG_PROXY_MAX_AGE)
+            else:
+                patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ("Cookie", "HX-Request"))
+            return response
+        return inner
+    return decorator
@@ -0,0 +1,182 @@
+# products/images.py
+"""
+Derivative-image (rendition) pipeline for product images and logos.
+
+Originals are multi-megabyte uploads; pages only ever show them at a few
+hundred pixels. Each source is decoded once and re-encoded as WebP and JPEG
+at the widths of a named preset. Renditions are stored under the source's
+content hash, so identical uploads share the same files, and a per-source
+manifest (srcset strings, intrinsic size) is kept in the cache so templates
+never touch the disk after the first render.
+"""
+import hashlib
+import io
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Callable, Dict, IO, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Preset:
+    widths: Tuple[int, ...]
+    sizes: str
+
+
+# Display widths of each place an image is shown (2x/3x variants for dense screens)
+PRESETS: Dict[str, Preset] = {
+    "card": Preset(widths=(240, 360, 480, 720), sizes="(min-width: 768px) 360px, 100vw"),
+    "thumb": Preset(widths=(64, 128, 192), sizes="64px"),
+    "detail": Preset(widths=(480, 720, 960, 1280), sizes="(min-width: 768px) 560px, 100vw"),
+    "logo": Preset(widths=(40, 80, 120), sizes="40px"),
+}
+
+# (manifest key, Pillow format, file extension)
+FORMATS = (("webp", "WEBP", "webp"), ("jpeg", "JPEG", "jpg"))
+
+RENDITION_DIR = "renditions"
+
+
+def _digest(fh: IO[bytes]) -> str:
+    h = hashlib.sha256()
+    for chunk in iter(lambda: fh.read(64 * 1024), b""):
+        h.update(chunk)
+    fh.seek(0)
+    return h.hexdigest()[:32]
+
+
+def rendition_name(digest: str, width: int, ext: str) -> str:
+    return f"{RENDITION_DIR}/{digest[:2]}/{digest}-{width}w.{ext}"
+
+
+def _prepare(img: Image.Image, pil_format: str) -> Image.Image:
+    """Normalise the colour mode for the target format."""
+    if img.mode not in ("RGB", "RGBA"):
+        has_alpha = "A" in img.getbands() or "transparency" in img.info
+        img = img.convert("RGBA" if has_alpha else "RGB")
+    if pil_format == "JPEG" and img.mode == "RGBA":
+        # JPEG has no alpha channel: flatten transparent areas onto white
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.getchannel("A"))
+        img = background
+    return img
+
+
+def _write_rendition(name: str, data: bytes):
+    """
+    Store a rendition under exactly `name`, replacing any previous copy. Concurrent builds
+    of the same digest and width encode the same bytes, so whichever lands last is fine;
+    the file is swapped in atomically and never missing or half written.
+    """
+    try:
+        path = default_storage.path(name)
+    except NotImplementedError:
+        # Storage without local paths: save, and drop the suffixed copy if another build won
+        saved = default_storage.save(name, ContentFile(data))
+        if saved != name:
+            default_storage.delete(saved)
+        return
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".rendition-")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(data)
+        if default_storage.file_permissions_mode is not None:
+            os.chmod(tmp_path, default_storage.file_permissions_mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def build_renditions(open_source: Callable[[], IO[bytes]], preset_name: str, force: bool = False) -> dict:
+    """
+    Create every rendition of a preset for one source image and return its manifest.
+    Widths wider than the original are clamped to the original width. With `force`,
+    existing renditions are re-encoded and replaced in place (never deleted first).
+    """
+    preset = PRESETS[preset_name]
+    quality = settings.RENDITION_QUALITY
+
+    with open_source() as fh:
+        digest = _digest(fh)
+        img = ImageOps.exif_transpose(Image.open(fh))
+        img.load()
+
+    src_w, src_h = img.size
+    widths = sorted({min(w, src_w) for w in preset.widths})
+    manifest = {"width": widths[0], "height": max(1, round(src_h * widths[0] / src_w))}
+
+    for key, pil_format, ext in FORMATS:
+        prepared = _prepare(img, pil_format)
+        entries = []
+        for w in widths:
+            name = rendition_name(digest, w, ext)
+            if force or not default_storage.exists(name):
+                h = max(1, round(src_h * w / src_w))
+                resized = prepared.resize((w, h), Image.LANCZOS) if w < src_w else prepared
+                buf = io.BytesIO()
+                resized.save(buf, pil_format, quality=quality, optimize=True)
+                _write_rendition(name, buf.getvalue())
+            entries.append(f"{default_storage.url(name)} {w}w")
+        manifest[key] = ", ".join(entries)
+        manifest[f"{key}_src"] = entries[0].rsplit(" ", 1)[0]
+    return manifest
+
+
+def _manifest_key(source_key: str, preset_name: str) -> str:
+    widths = "-".join(str(w) for w in PRESETS[preset_name].widths)
+    digest = hashlib.sha1(source_key.encode()).hexdigest()
+    return f"renditions:{preset_name}:{widths}:{digest}"
+
+
+def get_manifest(
+        source_key: str,
+        open_source: Callable[[], IO[bytes]],
+        preset_name: str,
+        force: bool = False,
+) -> Optional[dict]:
+    """
+    Return the cached manifest for a source, generating renditions on first use.
+    Returns None when the source is missing or not a readable image.
+    """
+    key = _manifest_key(source_key, preset_name)
+    manifest = None if force else cache.get(key)
+    if manifest is None:
+        try:
+            manifest = build_renditions(open_source, preset_name, force=force)
+        except (OSError, ValueError, Image.DecompressionBombError) as e:
+            logger.warning("Cannot build %s renditions for %s: %s", preset_name, source_key, e)
+            return None
+        cache.set(key, manifest, timeout=None)
+    return manifest
+
+
+def field_manifest(field_file, preset_name: str, force: bool = False) -> Optional[dict]:
+    """Manifest for an ImageField/FileField value (Product.image, SupplierProfile.logo)."""
+    if not field_file:
+        return None
+    storage = field_file.storage
+    return get_manifest(
+        f"media:{field_file.name}", lambda: storage.open(field_file.name, "rb"), preset_name, force=force
+    )
+
+
+def static_manifest(path: str, preset_name: str, force: bool = False) -> Optional[dict]:
+    """Manifest for a file shipped under static/ (e.g. the site logo)."""
+    found = finders.find(path)
+    if not found:
+        return None
+    return get_manifest(f"static:{path}", lambda: open(found, "rb"), preset_name, force=force)
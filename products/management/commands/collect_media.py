@@ -0,0 +1,32 @@
+# products/management/commands/collect_media.py
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from products.storage import collect_unreferenced_blobs, content_addressed_storage as storage
+
+
+class Command(BaseCommand):
+    help = "Delete stored uploads that no row references (e.g. from forms that failed after the upload)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-hours",
+            type=float,
+            default=24,
+            help="Only uploads stored at least this long ago (default: 24).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="List what would be deleted without deleting it.",
+        )
+
+    def handle(self, *args, **options):
+        names = collect_unreferenced_blobs(
+            storage, older_than=timedelta(hours=options["older_than_hours"]), dry_run=options["dry_run"]
+        )
+        for name in names:
+            self.stdout.write(f"✓ {name}")
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(f"Done. {verb} {len(names)} unreferenced upload(s)."))
@@ -0,0 +1,55 @@
+# products/management/commands/compare_desc_modes.py
+from django.core.management.base import BaseCommand
+
+from ai.llm import LLMError, get_description_stats, get_llm_client
+from products.models import Product
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate descriptions for a sample of products in both modes (one JSON call vs one call "
+        "per language) and compare tokens and latency. Nothing is saved."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=10,
+            help="Number of products to sample, newest first (default: 10).",
+        )
+
+    def handle(self, *args, **options):
+        products = list(
+            Product.objects.order_by("-created_at").only("name", "category", "unit", "stock")[: options["limit"]]
+        )
+        if not products:
+            self.stdout.write(self.style.WARNING("No products to compare."))
+            return
+
+        llm = get_llm_client()
+        stats = get_description_stats()
+        stats.reset()
+        self.stdout.write(self.style.NOTICE(f"Comparing description modes on {len(products)} product(s)..."))
+        for p in products:
+            try:
+                for mode in ("separate", "json"):
+                    llm.generate_descriptions(p.name, p.category, p.unit, p.stock, mode=mode)
+            except LLMError as e:
+                self.stdout.write(self.style.WARNING(f"  ✗ {p.name}: {e}"))
+                continue
+            self.stdout.write(f"  ✓ {p.name}")
+
+        s = stats.stats()
+        for mode in ("separate", "json"):
+            m = s[mode]
+            self.stdout.write(
+                f"{mode:<9} avg tokens {m['avg_tokens']:7.1f} (prompt {m['avg_prompt_tokens']:6.1f}), "
+                f"avg latency {m['avg_seconds']:6.2f}s"
+            )
+        saved = s["saved_per_product"]
+        self.stdout.write(f"JSON fallbacks: {s['fallbacks']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"JSON mode saves {saved['tokens']:.1f} tokens ({saved['prompt_tokens']:.1f} prompt) "
+            f"and {saved['seconds']:.2f}s per product."
+        ))
@@ -0,0 +1,131 @@
+# products/management/commands/dedupe_media.py
+import hashlib
+import os
+import shutil
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from products.bulk import products_bulk_changed
+from products.models import MediaBlob, Product, SupplierProfile
+from products.storage import CHUNK_SIZE, content_addressed_storage as storage
+
+# (model, file field) pairs kept in the content-addressed storage
+UPLOAD_FIELDS = (
+    (Product, "image"),
+    (SupplierProfile, "logo"),
+    (SupplierProfile, "business_license"),
+)
+
+# Model -> (lookup from Product, products_bulk_changed field): product pages show their
+# image and their supplier's files
+PRODUCT_PATHS = {Product: ("", "image"), SupplierProfile: ("supplier__", "supplier")}
+
+
+def _hash_file(path):
+    h = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+            size += len(chunk)
+    return h.hexdigest(), size
+
+
+class Command(BaseCommand):
+    help = (
+        "Move existing uploads into the content-addressed media layout in place: "
+        "identical files collapse into one blob, references are rewritten and reference counts rebuilt."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would change without touching files or the database.",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        renamed = {}        # old name -> blob name
+        blobs = {}          # blob name -> (digest, size)
+        refs = Counter()    # blob name -> number of referencing fields
+        missing = 0
+
+        # Pass 1: hash every referenced file and work out its blob name
+        for model, field in UPLOAD_FIELDS:
+            for name in model.objects.exclude(**{field: ""}).exclude(**{f"{field}__isnull": True}) \
+                    .values_list(field, flat=True).iterator():
+                if name not in renamed:
+                    path = storage.path(name)
+                    if not os.path.exists(path):
+                        missing += 1
+                        self.stdout.write(self.style.WARNING(f"Missing file, left as is: {name}"))
+                        continue
+                    digest, size = _hash_file(path)
+                    target = storage.content_name(name, digest)
+                    renamed[name] = target
+                    blobs[target] = (digest, size)
+                refs[renamed[name]] += 1
+
+        moves = {old: new for old, new in renamed.items() if old != new}
+
+        # Bytes freed: every distinct file mapping to a blob except the one kept
+        copies = {}
+        for old, new in renamed.items():
+            copies.setdefault(new, set()).add(old)
+        reclaimable = 0
+        for new, olds in copies.items():
+            files = olds | ({new} if os.path.exists(storage.path(new)) else set())
+            reclaimable += blobs[new][1] * (len(files) - 1)
+
+        self.stdout.write(self.style.NOTICE(
+            f"{len(renamed)} referenced file(s) -> {len(blobs)} unique blob(s); "
+            f"{len(moves)} file(s) to move or merge, {reclaimable / 1024 / 1024:.1f} MiB reclaimable."
+        ))
+        if dry_run:
+            return
+
+        # Pass 2: link the first copy of each blob into place (old names stay valid until the DB is updated)
+        for old, new in moves.items():
+            new_path = storage.path(new)
+            if not os.path.exists(new_path):
+                os.makedirs(os.path.dirname(new_path), exist_ok=True)
+                try:
+                    os.link(storage.path(old), new_path)
+                except OSError:
+                    shutil.copy2(storage.path(old), new_path)
+
+        # Pass 3: rewrite references and rebuild reference counts; QuerySet.update() sends no
+        # signals, so touch updated_at of the products showing a rewritten file here
+        changed, fields = set(), set()
+        now = timezone.now()
+        with transaction.atomic():
+            for model, field in UPLOAD_FIELDS:
+                for old, new in moves.items():
+                    path, changed_field = PRODUCT_PATHS[model]
+                    products = Product.objects.filter(**{f"{path}{field}": old})
+                    if products.update(updated_at=now):
+                        changed.update(products.values_list("id", flat=True))
+                        fields.add(changed_field)
+                    model.objects.filter(**{field: old}).update(**{field: new})
+            MediaBlob.objects.all().delete()
+            MediaBlob.objects.bulk_create([
+                MediaBlob(name=name, digest=digest, size=size, refcount=refs[name])
+                for name, (digest, size) in blobs.items()
+            ])
+
+        # Cached pages and validated copies must not keep pointing at the files removed below
+        if changed:
+            products_bulk_changed.send(sender=Product, product_ids=sorted(changed), fields=fields)
+
+        # Pass 4: nothing points at the old names any more
+        for old, new in moves.items():
+            os.remove(storage.path(old))
+            self.stdout.write(f"✓ {old} -> {new}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. {len(blobs)} blob(s), {reclaimable / 1024 / 1024:.1f} MiB reclaimed, {missing} missing file(s)."
+        ))
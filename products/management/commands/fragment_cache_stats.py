@@ -0,0 +1,24 @@
+# products/management/commands/fragment_cache_stats.py
+from django.core.management.base import BaseCommand
+
+from products import cache as fragment_cache
+
+
+class Command(BaseCommand):
+    help = "Show hit/miss counters of the catalog and product-detail fragment cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the counters after printing them.",
+        )
+
+    def handle(self, *args, **options):
+        s = fragment_cache.stats()
+        self.stdout.write(f"Hits:     {s['hits']}")
+        self.stdout.write(f"Misses:   {s['misses']}")
+        self.stdout.write(f"Hit rate: {s['hit_rate']:.1%}")
+        if options["reset"]:
+            fragment_cache.reset_stats()
+            self.stdout.write(self.style.SUCCESS("Counters reset."))
@@ -0,0 +1,175 @@
+# products/management/commands/generate_descriptions.py
+import contextlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from ai.llm import LLMError, get_llm_client
+from ai.ratelimit import TokenBucket
+from products.bulk import bulk_update_products
+from products.models import Product
+
+# Columns the prompts need (plus the descriptions being written)
+FIELDS = ("id", "name", "category", "unit", "stock", "ai_description_en", "ai_description_zh")
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate missing English/Chinese AI descriptions for many products at once, "
+        "within the provider's rate limits. Progress is checkpointed, so an interrupted run resumes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=8, help="Concurrent LLM calls (default: 8).")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Products generated and written per batch; the checkpoint moves once per batch (default: 100).",
+        )
+        parser.add_argument(
+            "--rpm",
+            type=float,
+            default=None,
+            help="Provider requests per minute (default: LLM_RATE_LIMIT_RPM).",
+        )
+        parser.add_argument(
+            "--tpm",
+            type=float,
+            default=None,
+            help="Provider tokens per minute (default: LLM_RATE_LIMIT_TPM).",
+        )
+        parser.add_argument(
+            "--mode",
+            choices=["json", "separate"],
+            default=None,
+            help="Description mode (default: LLM_DESC_MODE).",
+        )
+        parser.add_argument("--supplier", type=int, default=None, help="Only products of this supplier id.")
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate every product, not only those missing a description.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            default=str(settings.BASE_DIR / ".generate_descriptions.checkpoint.json"),
+            help="Checkpoint file (default: .generate_descriptions.checkpoint.json in the project root).",
+        )
+        parser.add_argument("--reset", action="store_true", help="Ignore an existing checkpoint and start over.")
+
+    # checkpoint
+    def _load_checkpoint(self, path: str, scope: dict, reset: bool) -> dict:
+        fresh = {"scope": scope, "last_id": 0, "done": 0, "failed": [], "tokens": 0}
+        if reset or not os.path.exists(path):
+            return fresh
+        with open(path, encoding="utf-8") as fh:
+            state = json.load(fh)
+        if state.get("scope") != scope:
+            raise CommandError(
+                f"Checkpoint {path} belongs to a run with other options ({state.get('scope')}). "
+                "Use the same options, or --reset to start over."
+            )
+        return state
+
+    @staticmethod
+    def _save_checkpoint(path: str, state: dict):
+        # Write-then-rename, so a crash never leaves a half-written checkpoint
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(state, fh)
+        os.replace(tmp, path)
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        workers = max(1, options["workers"])
+        mode = options["mode"]
+        path = options["checkpoint"]
+        scope = {"supplier": options["supplier"], "force": options["force"], "mode": mode}
+        state = self._load_checkpoint(path, scope, options["reset"])
+
+        qs = Product.objects.order_by("id").only(*FIELDS)
+        if not options["force"]:
+            qs = qs.filter(Q(ai_description_en="") | Q(ai_description_zh=""))
+        if options["supplier"]:
+            qs = qs.filter(supplier_id=options["supplier"])
+
+        remaining = qs.filter(id__gt=state["last_id"]).count()
+        if state["last_id"]:
+            self.stdout.write(self.style.NOTICE(
+                f"Resuming after product #{state['last_id']} ({state['done']} done, {len(state['failed'])} failed)."
+            ))
+        self.stdout.write(self.style.NOTICE(f"{remaining} product(s) to generate with {workers} worker(s)..."))
+        if not remaining:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            return
+
+        llm = get_llm_client()
+        requests_bucket = TokenBucket.per_minute(options["rpm"] or settings.LLM_RATE_LIMIT_RPM)
+        tokens_bucket = TokenBucket.per_minute(options["tpm"] or settings.LLM_RATE_LIMIT_TPM)
+
+        def generate(p: Product):
+            requests, tokens = llm.description_cost(p.name, p.category, p.unit, p.stock, mode=mode)
+            requests_bucket.acquire(requests)
+            tokens_bucket.acquire(tokens)
+            try:
+                descs = llm.generate_descriptions(p.name, p.category, p.unit, p.stock, mode=mode)
+            except LLMError:
+                return p, None
+            used = sum(descs.usage)
+            if used:
+                # Settle the estimate against what the provider reported
+                tokens_bucket.adjust(tokens - used)
+            return p, descs
+
+        started = time.monotonic()
+        done = tokens = 0
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                while True:
+                    batch = list(qs.filter(id__gt=state["last_id"])[:batch_size])
+                    if not batch:
+                        break
+
+                    updated, batch_tokens = [], 0
+                    for p, descs in pool.map(generate, batch):
+                        if descs is None:
+                            state["failed"].append(p.pk)
+                            continue
+                        batch_tokens += sum(descs.usage)
+                        p.ai_description_en = descs["en"]
+                        p.ai_description_zh = descs["zh"]
+                        updated.append(p)
+                    bulk_update_products(updated, ["ai_description_en", "ai_description_zh"])
+
+                    done += len(updated)
+                    tokens += batch_tokens
+                    state["last_id"] = batch[-1].pk
+                    state["done"] += len(updated)
+                    state["tokens"] += batch_tokens
+                    self._save_checkpoint(path, state)
+
+                    minutes = max(time.monotonic() - started, 1e-9) / 60
+                    self.stdout.write(
+                        f"  ✓ {done}/{remaining} written, {len(state['failed'])} failed | "
+                        f"{done / minutes:,.1f} products/min, {tokens / minutes:,.0f} tokens/min"
+                    )
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING(
+                f"Interrupted. Progress is saved up to product #{state['last_id']}; run again to resume."
+            ))
+            return
+
+        # Absent when no batch was written (e.g. the products went away meanwhile)
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+        msg = f"Done. Generated {state['done']} product(s), {state['tokens']} tokens."
+        if state["failed"]:
+            msg += f" {len(state['failed'])} failed (ids {state['failed'][:20]}…); run again to retry them."
+        self.stdout.write(self.style.SUCCESS(msg))
@@ -0,0 +1,57 @@
+# products/management/commands/generate_renditions.py
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+
+from products.images import field_manifest, static_manifest
+from products.models import Product, SupplierProfile
+
+# Which presets each kind of image is rendered with
+PRODUCT_PRESETS = ("card", "thumb", "detail")
+LOGO_PRESETS = ("thumb",)
+STATIC_IMAGES = {"images/farmmate_logo.png": ("logo",)}
+
+
+class Command(BaseCommand):
+    help = "Eagerly generate WebP/JPEG renditions for product images, supplier logos and the site logo."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of images processed in parallel (default: 4).",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-encode renditions even if they already exist (replaced in place, never deleted).",
+        )
+
+    def handle(self, *args, **options):
+        force = options["force"]
+        jobs = []
+        for p in Product.objects.exclude(image="").exclude(image__isnull=True).only("id", "image").iterator():
+            jobs += [(f"product #{p.pk}", field_manifest, p.image, preset) for preset in PRODUCT_PRESETS]
+        for sp in SupplierProfile.objects.exclude(logo="").exclude(logo__isnull=True).only("id", "logo").iterator():
+            jobs += [(f"logo #{sp.pk}", field_manifest, sp.logo, preset) for preset in LOGO_PRESETS]
+        for path, presets in STATIC_IMAGES.items():
+            jobs += [(path, static_manifest, path, preset) for preset in presets]
+
+        self.stdout.write(self.style.NOTICE(f"Found {len(jobs)} rendition set(s) to build."))
+        done = failed = 0
+        with ThreadPoolExecutor(max_workers=max(1, options["workers"])) as pool:
+            futures = {
+                pool.submit(fn, source, preset, force=force): (label, preset)
+                for label, fn, source, preset in jobs
+            }
+            for fut in as_completed(futures):
+                label, preset = futures[fut]
+                if fut.result():
+                    done += 1
+                    self.stdout.write(f"✓ {label} [{preset}]")
+                else:
+                    failed += 1
+                    self.stdout.write(self.style.WARNING(f"✗ {label} [{preset}] (missing or unreadable)"))
+
+        self.stdout.write(self.style.SUCCESS(f"Done. Built: {done}, failed: {failed}."))
@@ -0,0 +1,127 @@
+# products/management/commands/llm_batch.py
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from ai import batch
+from ai.llm import get_llm_client
+from products.bulk import description_batch_requests, ingest_description_results
+from products.models import Product
+from qa.services import answer_batch_requests, ingest_answer_results
+
+
+class Command(BaseCommand):
+    help = (
+        "Offline LLM backfills through batch files (OpenAI Batch API format): export request files, "
+        "complete them locally with the dummy provider, or ingest the result files in bulk."
+    )
+
+    def add_arguments(self, parser):
+        actions = parser.add_subparsers(dest="action", required=True)
+
+        export = actions.add_parser("export", help="Write batch request files.")
+        export.add_argument("kind", choices=["descriptions", "answers"])
+        export.add_argument("--out", required=True, help="Directory for the request files.")
+        export.add_argument(
+            "--all",
+            action="store_true",
+            help="Descriptions: every product, not only those missing one. "
+                 "Answers: every stored answer, not only those given from an older product context.",
+        )
+        export.add_argument(
+            "--mode",
+            choices=["json", "separate"],
+            default=None,
+            help="Description mode (default: LLM_DESC_MODE).",
+        )
+        export.add_argument(
+            "--max-requests",
+            type=int,
+            default=batch.MAX_REQUESTS_PER_FILE,
+            help=f"Requests per file (default: {batch.MAX_REQUESTS_PER_FILE}, the provider limit).",
+        )
+
+        complete = actions.add_parser("complete", help="Complete request files locally with the dummy provider.")
+        complete.add_argument("requests", nargs="+", help="Request files.")
+        complete.add_argument("--out", required=True, help="Result file to write.")
+
+        ingest = actions.add_parser("ingest", help="Write result files back to products and Q&A answers.")
+        ingest.add_argument("results", nargs="+", help="Result files.")
+        ingest.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Rows per bulk update (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        getattr(self, f"_{options['action']}")(options)
+
+    def _export(self, options):
+        llm = get_llm_client()
+        if options["kind"] == "descriptions":
+            qs = Product.objects.order_by("id").only("id", "name", "category", "unit", "stock")
+            if not options["all"]:
+                qs = qs.filter(Q(ai_description_en="") | Q(ai_description_zh=""))
+            lines = description_batch_requests(qs.iterator(chunk_size=2000), llm, mode=options["mode"])
+        else:
+            lines = answer_batch_requests(llm, stale_only=not options["all"])
+
+        counted = _Counter(lines)
+        paths = batch.write_requests(
+            counted, options["out"], prefix=options["kind"], max_requests=max(1, options["max_requests"])
+        )
+        for path in paths:
+            self.stdout.write(f"  ✓ {path}")
+        self.stdout.write(self.style.SUCCESS(f"Exported {counted.count} request(s) to {len(paths)} file(s)."))
+
+    def _complete(self, options):
+        started = time.perf_counter()
+        done = batch.complete_locally(options["requests"], options["out"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Completed {done} request(s) locally in {time.perf_counter() - started:.1f}s → {options['out']}"
+        ))
+
+    def _ingest(self, options):
+        paths, chunk_size = options["results"], max(1, options["chunk_size"])
+        for path in paths:
+            if not os.path.exists(path):
+                raise CommandError(f"No such result file: {path}")
+
+        started = time.perf_counter()
+        products, failed = ingest_description_results(
+            (r for r in batch.read_results(paths) if r.custom_id.startswith("product:")), chunk_size
+        )
+        answers, failed_answers = ingest_answer_results(
+            (r for r in batch.read_results(paths) if r.custom_id.startswith("qa:")), chunk_size
+        )
+        failed += failed_answers
+        elapsed = time.perf_counter() - started
+
+        if failed:
+            self.stdout.write(self.style.WARNING(
+                f"{len(failed)} result(s) failed or were unusable, e.g. {', '.join(failed[:5])}"
+            ))
+        rows = products + answers
+        self.stdout.write(self.style.SUCCESS(
+            f"Ingested {products} product update(s) and {answers} answer(s) in {elapsed:.1f}s "
+            f"({rows / max(elapsed, 1e-9):,.0f} rows/s)."
+        ))
+
+
+class _Counter:
+    """Pass-through iterator that counts what went through it."""
+
+    def __init__(self, items):
+        self._items = iter(items)
+        self.count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        item = next(self._items)
+        self.count += 1
+        return item
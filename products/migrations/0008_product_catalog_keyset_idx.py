@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-17 18:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0007_product_purchase_link'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['is_active', '-created_at', 'id'], name='product_catalog_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.7 on 2026-10-17 18:25
+
+import products.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0008_product_catalog_keyset_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('digest', models.CharField(db_index=True, max_length=64)),
+                ('size', models.BigIntegerField(default=0)),
+                ('refcount', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Media blob',
+                'verbose_name_plural': 'Media blobs',
+            },
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=products.storage.upload_storage, upload_to='products/'),
+        ),
+        migrations.AlterField(
+            model_name='supplierprofile',
+            name='business_license',
+            field=models.FileField(blank=True, null=True, storage=products.storage.upload_storage, upload_to='licenses/'),
+        ),
+        migrations.AlterField(
+            model_name='supplierprofile',
+            name='logo',
+            field=models.ImageField(blank=True, null=True, storage=products.storage.upload_storage, upload_to='logos/'),
+        ),
+    ]
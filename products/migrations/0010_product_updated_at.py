@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-17 18:27
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_updated_at(apps, schema_editor):
+    """Existing products were last modified no earlier than they were created."""
+    Product = apps.get_model("products", "Product")
+    Product.objects.using(schema_editor.connection.alias).update(updated_at=F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0009_mediablob_content_addressed_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['updated_at'], name='products_pr_updated_150263_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.7 on 2026-10-17 19:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0010_product_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='pricing_dirty',
+            field=models.BooleanField(default=True, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('pricing_dirty', True)), fields=['id'], name='product_pricing_dirty_idx'),
+        ),
+    ]
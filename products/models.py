@@ -1,8 +1,39 @@
 from django.db import models
 from django.conf import settings
 
+from .storage import upload_storage
 
-class SupplierProfile(models.Model):
+
+class LoadedValuesMixin:
+    """Remember field values as loaded from the database, to detect what a save changes."""
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+
+class MediaBlob(models.Model):
+    """
+    One stored upload in the content-addressed media storage.
+    `refcount` is the number of file fields pointing at it; the file is removed when it drops to zero.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    digest = models.CharField(max_length=64, db_index=True)
+    size = models.BigIntegerField(default=0)
+    refcount = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Media blob"
+        verbose_name_plural = "Media blobs"
+
+    def __str__(self) -> str:
+        return f"{self.name} (x{self.refcount})"
+
+
+class SupplierProfile(LoadedValuesMixin, models.Model):
     """
     Supplier profile linked 1:1 to the auth user.
     Provides business identity and basic contact info for suppliers.
@@ -14,8 +45,8 @@ class SupplierProfile(models.Model):
     email = models.EmailField(blank=True)
     address = models.CharField(max_length=255, blank=True)
     description = models.TextField(blank=True)
-    logo = models.ImageField(upload_to="logos/", blank=True, null=True)
-    business_license = models.FileField(upload_to="licenses/", blank=True, null=True)
+    logo = models.ImageField(upload_to="logos/", storage=upload_storage, blank=True, null=True)
+    business_license = models.FileField(upload_to="licenses/", storage=upload_storage, blank=True, null=True)
 
     class Meta:
         verbose_name = "Supplier profile"
@@ -28,10 +59,13 @@ class SupplierProfile(models.Model):
         return self.company_name or f"Supplier #{self.pk} ({self.user})"
 
 
-class Product(models.Model):
+class Product(LoadedValuesMixin, models.Model):
     """
     A product listed by a supplier, with basic inventory and pricing fields.
     """
+    # Fields the price / logistics suggestions are computed from (see pricing.utils)
+    PRICING_INPUT_FIELDS = ("base_price", "stock", "category")
+
     supplier = models.ForeignKey(SupplierProfile, on_delete=models.CASCADE, related_name="products")
     name = models.CharField(max_length=200)
     category = models.CharField(max_length=100, blank=True)
@@ -41,9 +75,12 @@ class Product(models.Model):
     ai_description_en = models.TextField(blank=True)
     ai_description_zh = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    image = models.ImageField(upload_to="products/", blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    image = models.ImageField(upload_to="products/", storage=upload_storage, blank=True, null=True)
     is_active = models.BooleanField(default=True, verbose_name="Active (listed)")
     purchase_link = models.URLField(blank=True, null=True, verbose_name="Purchase Link")
+    # Set when a pricing input changes, cleared once suggestions are generated for the new values
+    pricing_dirty = models.BooleanField(default=True, editable=False)
 
     class Meta:
         verbose_name = "Product"
@@ -56,8 +93,33 @@ class Product(models.Model):
             models.Index(fields=["name"]),
             models.Index(fields=["category"]),
             models.Index(fields=["is_active"]),
+            # Keyset pagination of the buyer catalog
+            models.Index(fields=["is_active", "-created_at", "id"], name="product_catalog_keyset_idx"),
+            # Newest modification, for conditional GET validators
+            models.Index(fields=["updated_at"]),
+            # Products waiting to be repriced (regen_suggestions --changed-only): few at a time
+            models.Index(fields=["id"], condition=models.Q(pricing_dirty=True), name="product_pricing_dirty_idx"),
         ]
 
     def __str__(self) -> str:
         """Human-readable product name in admin and foreign key dropdowns."""
         return self.name
+
+    def save(self, *args, **kwargs):
+        # auto_now is skipped by partial saves unless the field is listed explicitly;
+        # update_fields=[] stays a no-op save
+        update_fields = kwargs.get("update_fields")
+        if update_fields:
+            kwargs["update_fields"] = {*update_fields, "updated_at"}
+
+        loaded = getattr(self, "_loaded_values", None)
+        saved_inputs = [
+            name for name in self.PRICING_INPUT_FIELDS if update_fields is None or name in update_fields
+        ]
+        if loaded is not None and any(name in loaded and loaded[name] != getattr(self, name) for name in saved_inputs):
+            self.pricing_dirty = True
+            if update_fields is not None:
+                kwargs["update_fields"].add("pricing_dirty")
+        super().save(*args, **kwargs)
+        if loaded is not None:
+            loaded.update({name: getattr(self, name) for name in saved_inputs if name in loaded})
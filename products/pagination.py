@@ -0,0 +1,57 @@
+# products/pagination.py
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+from django.db.models import Q, QuerySet
+
+
+@dataclass
+class KeysetPage:
+    items: List
+    next_cursor: Optional[str]
+
+
+def encode_cursor(created_at: datetime, pk: int) -> str:
+    """Pack the (created_at, id) position of the last row into an opaque URL-safe token."""
+    raw = json.dumps([created_at.isoformat(), pk]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]):
+    """
+    Unpack a cursor produced by encode_cursor.
+    Returns None for a missing or malformed cursor, so callers fall back to the first page.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created), int(pk)
+    except (ValueError, TypeError):
+        return None
+
+
+def keyset_page(qs: QuerySet, cursor: Optional[str], page_size: int) -> KeysetPage:
+    """
+    Return one page of `qs` ordered by (-created_at, id), starting after `cursor`.
+    Seeks straight to the position through the (is_active, -created_at, id) index,
+    so the cost of a page does not grow with how deep the buyer has scrolled.
+    """
+    qs = qs.order_by("-created_at", "id")
+    position = decode_cursor(cursor)
+    if position:
+        created_at, pk = position
+        qs = qs.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__gt=pk))
+
+    # Fetch one extra row to know whether another page exists
+    rows = list(qs[: page_size + 1])
+    items = rows[:page_size]
+    next_cursor = None
+    if len(rows) > page_size:
+        last = items[-1]
+        next_cursor = encode_cursor(last.created_at, last.pk)
+    return KeysetPage(items=items, next_cursor=next_cursor)
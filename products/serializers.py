@@ -0,0 +1,58 @@
+# products/serializers.py
+from rest_framework import serializers
+
+from .models import Product
+
+
+class SparseFieldsMixin:
+    """Drop every field not listed in ?fields=a,b,c (unknown names are ignored)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        wanted = requested_fields(request, self.fields.keys()) if request else None
+        if wanted is not None:
+            for name in set(self.fields) - wanted:
+                self.fields.pop(name)
+
+
+def requested_fields(request, available):
+    """Set of field names asked for with ?fields=, or None when the parameter is absent."""
+    raw = request.query_params.get("fields")
+    if not raw:
+        return None
+    wanted = {f.strip() for f in raw.split(",") if f.strip()} & set(available)
+    return wanted or None
+
+
+class ProductSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """
+    Public, read-only representation of a listed product.
+    `suggested_price` and `logistics` come from queryset annotations (the product's pricing.CurrentSuggestion).
+    """
+    supplier = serializers.CharField(source="supplier.company_name", read_only=True)
+    image = serializers.ImageField(read_only=True, use_url=True)
+    suggested_price = serializers.DecimalField(
+        source="latest_price", max_digits=10, decimal_places=2, read_only=True, allow_null=True
+    )
+    logistics = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Product
+        fields = [
+            "id", "name", "category", "unit", "stock", "base_price", "image", "purchase_link",
+            "ai_description_en", "ai_description_zh", "supplier", "is_active",
+            "suggested_price", "logistics", "created_at", "updated_at",
+        ]
+        read_only_fields = fields
+
+    def get_logistics(self, obj):
+        if getattr(obj, "latest_lg_days", None) is None:
+            return None
+        return {
+            "region": obj.latest_lg_region,
+            "carrier": obj.latest_lg_carrier,
+            "estimated_days": obj.latest_lg_days,
+            "cost_estimate": serializers.DecimalField(max_digits=10, decimal_places=2)
+            .to_representation(obj.latest_lg_cost),
+        }
@@ -0,0 +1,104 @@
+# products/signals.py
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .bulk import products_bulk_changed
+from .cache import bump_catalog_version, bump_product_versions
+from .models import Product, SupplierProfile
+from .storage import ContentAddressedStorage, release_blob, retain_blob
+
+# Model -> file fields stored in the content-addressed storage
+UPLOAD_FIELDS = {
+    Product: ("image",),
+    SupplierProfile: ("logo", "business_license"),
+}
+
+
+def _bump_after_commit(product_ids, catalog: bool = False):
+    """
+    Bump fragment versions once the write is committed. Bumped inside the transaction, a
+    page rendered before the commit would read the old rows and cache them under the new
+    version, where they would be served until the fragment expires.
+    """
+    product_ids = list(product_ids)
+
+    def bump():
+        bump_product_versions(product_ids)
+        if catalog:
+            bump_catalog_version()
+
+    transaction.on_commit(bump)
+
+
+@receiver([post_save, post_delete], sender=Product)
+def product_changed(sender, instance, **kwargs):
+    """A product write can change both its detail page and any catalog page."""
+    _bump_after_commit([instance.pk], catalog=True)
+
+
+@receiver(products_bulk_changed)
+def products_bulk_written(sender, product_ids, **kwargs):
+    _bump_after_commit(product_ids, catalog=True)
+
+
+def supplier_changed(sender, instance, **kwargs):
+    """Seller contact details are rendered on each of the supplier's product pages."""
+    ids = list(instance.products.values_list("id", flat=True))
+    Product.objects.filter(id__in=ids).update(updated_at=timezone.now())
+    _bump_after_commit(ids)
+
+
+def _track_references(field_file, retained: str = "", released: str = ""):
+    """Apply a reference change once the row change is committed; a rolled back save changes nothing."""
+    storage = field_file.storage
+    if not isinstance(storage, ContentAddressedStorage) or retained == released:
+        return
+
+    def apply():
+        if retained:
+            retain_blob(retained, storage)
+        if released:
+            release_blob(released, storage)
+
+    transaction.on_commit(apply)
+
+
+def track_saved_uploads(sender, instance, created, update_fields=None, **kwargs):
+    """Retain the upload a save points a field at, and release the one it replaced or cleared."""
+    loaded = getattr(instance, "_loaded_values", None)
+    if loaded is None:
+        if not created:
+            # Not loaded from the database: the stored value is unknown
+            return
+        loaded = instance._loaded_values = {}
+    for field in UPLOAD_FIELDS[sender._meta.concrete_model]:
+        if update_fields is not None and field not in update_fields:
+            continue
+        if not created and field not in loaded:
+            # Deferred when loaded
+            continue
+        current = getattr(instance, field)
+        _track_references(current, retained=current.name or "", released=loaded.get(field) or "")
+        loaded[field] = current.name or ""
+
+
+def release_deleted_uploads(sender, instance, **kwargs):
+    loaded = getattr(instance, "_loaded_values", None) or {}
+    for field in UPLOAD_FIELDS[sender._meta.concrete_model]:
+        current = getattr(instance, field)
+        # The stored value, even if the instance was changed in memory before the delete
+        _track_references(current, released=loaded.get(field, current.name) or "")
+
+
+# Connect for each model and its proxies (SupplierProfile is edited in admin through a proxy)
+for _model in (Product, SupplierProfile):
+    for _sender in apps.get_models():
+        if _sender._meta.concrete_model is not _model:
+            continue
+        post_save.connect(track_saved_uploads, sender=_sender)
+        post_delete.connect(release_deleted_uploads, sender=_sender)
+        if _model is SupplierProfile:
+            post_save.connect(supplier_changed, sender=_sender)
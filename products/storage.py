@@ -0,0 +1,172 @@
+# products/storage.py
+"""
+Content-addressed, deduplicating storage for uploaded media.
+
+Uploads are hashed (SHA-256) while they are streamed to a temporary file and
+stored once as `blobs/<digest[:2]>/<digest><ext>`, whichever field they were
+uploaded through. A second upload of the same bytes reuses the existing blob.
+MediaBlob rows count how many model fields point at each blob. References are
+taken and dropped by the models' post_save / post_delete receivers once the row
+change is committed (products.signals); the file goes with the last reference.
+Blobs of uploads whose row was never saved have no reference and are removed by
+collect_unreferenced_blobs (collect_media command).
+"""
+import hashlib
+import os
+import posixpath
+import tempfile
+import time
+from datetime import timedelta
+from typing import List
+
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils.deconstruct import deconstructible
+
+CHUNK_SIZE = 64 * 1024
+BLOB_DIR = "blobs"
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+
+    def content_name(self, name: str, digest: str) -> str:
+        """Blob name for content with `digest`; only the extension of the requested name is kept."""
+        ext = os.path.splitext(name)[1].lower()
+        return posixpath.join(BLOB_DIR, digest[:2], f"{digest}{ext}")
+
+    def get_available_name(self, name, max_length=None):
+        # Identical content maps to the same name by design; never add a random suffix
+        return name
+
+    def _save(self, name, content):
+        directory = self.path(BLOB_DIR)
+        os.makedirs(directory, exist_ok=True)
+
+        # Stream to a temp file on the same filesystem, hashing as we go
+        h = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                for chunk in content.chunks(CHUNK_SIZE):
+                    h.update(chunk)
+                    tmp.write(chunk)
+                    size += len(chunk)
+
+            digest = h.hexdigest()
+            final_name = self.content_name(name, digest)
+            register_blob(final_name, digest, size)
+
+            final_path = self.path(final_name)
+            if os.path.exists(final_path):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(tmp_path, self.file_permissions_mode)
+                os.replace(tmp_path, final_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return final_name
+
+    def delete(self, name):
+        """
+        A no-op: other rows may point at the same blob. Blobs are removed by release_blob()
+        with their last reference, which the model signals track.
+        """
+
+
+def register_blob(name: str, digest: str, size: int):
+    """Make sure a stored blob has its MediaBlob row; a new one starts without references."""
+    from .models import MediaBlob
+
+    try:
+        with transaction.atomic():
+            MediaBlob.objects.get_or_create(name=name, defaults={"digest": digest, "size": size})
+    except IntegrityError:
+        # Created concurrently
+        pass
+
+
+def retain_blob(name: str, storage: FileSystemStorage, count: int = 1):
+    """Add `count` references to a blob. Names outside the blob layout (legacy files) are not tracked."""
+    from .models import MediaBlob
+
+    for _ in range(2):
+        if MediaBlob.objects.filter(name=name).update(refcount=F("refcount") + count):
+            return
+        # Row missing (e.g. collected meanwhile): recreate it from the file
+        digest = posixpath.splitext(posixpath.basename(name))[0]
+        if not name.startswith(BLOB_DIR + "/") or not storage.exists(name):
+            return
+        try:
+            with transaction.atomic():
+                MediaBlob.objects.create(name=name, digest=digest, size=storage.size(name), refcount=count)
+            return
+        except IntegrityError:
+            # Created concurrently: retry the increment
+            continue
+
+
+def release_blob(name: str, storage: FileSystemStorage):
+    """Remove one reference to `name` and delete the file when it was the last."""
+    from .models import MediaBlob
+
+    with transaction.atomic():
+        if not MediaBlob.objects.filter(name=name, refcount__gt=0).update(refcount=F("refcount") - 1):
+            return
+        deleted, _ = MediaBlob.objects.filter(name=name, refcount__lte=0).delete()
+    if deleted:
+        FileSystemStorage.delete(storage, name)
+
+
+def collect_unreferenced_blobs(
+        storage: FileSystemStorage, older_than: timedelta = timedelta(days=1), dry_run: bool = False
+) -> List[str]:
+    """
+    Remove blob files no row references: uploads of a form or transaction that failed
+    after the file was stored (their MediaBlob row may have been rolled back with it) and
+    leftover temp files. `older_than` spares uploads whose row is still being saved.
+    Returns the names removed (or, with `dry_run`, that would be).
+    """
+    from .models import MediaBlob
+
+    root = storage.path(BLOB_DIR)
+    cutoff = time.time() - older_than.total_seconds()
+    candidates = []
+    for directory, _, files in os.walk(root):
+        for filename in files:
+            path = os.path.join(directory, filename)
+            if os.path.getmtime(path) < cutoff:
+                candidates.append(posixpath.join(BLOB_DIR, *os.path.relpath(path, root).split(os.sep)))
+
+    referenced = set()
+    for i in range(0, len(candidates), 500):
+        referenced.update(
+            MediaBlob.objects.filter(name__in=candidates[i:i + 500], refcount__gt=0).values_list("name", flat=True)
+        )
+    names = [name for name in candidates if name not in referenced]
+    if dry_run:
+        return names
+    removed = []
+    for name in names:
+        with transaction.atomic():
+            # Re-checked under the transaction: a reference may have been taken meanwhile
+            if MediaBlob.objects.filter(name=name, refcount__gt=0).exists():
+                continue
+            MediaBlob.objects.filter(name=name).delete()
+        FileSystemStorage.delete(storage, name)
+        removed.append(name)
+    return removed
+
+
+def upload_storage():
+    """Storage used by Product.image and SupplierProfile.logo / business_license."""
+    return content_addressed_storage
+
+
+content_addressed_storage = ContentAddressedStorage()
@@ -0,0 +1,26 @@
+# products/tasks.py
+from asgiref.sync import async_to_sync
+
+from ai.llm import get_llm_client
+from jobs.registry import job_handler
+from pricing.services import generate_pricing_and_logistics
+from .models import Product
+
+GENERATE_DESCRIPTION = "products.generate_description"
+
+
+@job_handler(GENERATE_DESCRIPTION)
+def generate_description(product_id: int) -> dict:
+    """English/Chinese descriptions + pricing and logistics suggestions for one product."""
+    p = Product.objects.get(pk=product_id)
+
+    llm = get_llm_client()
+    # LLMError keeps the current descriptions; the job is retried with backoff
+    descs = async_to_sync(llm.agenerate_descriptions)(p.name, p.category, p.unit, p.stock, langs=("en", "zh"))
+
+    p.ai_description_en = descs["en"]
+    p.ai_description_zh = descs["zh"]
+    p.save(update_fields=["ai_description_en", "ai_description_zh"])
+
+    generate_pricing_and_logistics(p)
+    return {"product_id": p.pk}
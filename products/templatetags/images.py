@@ -0,0 +1,43 @@
+# products/templatetags/images.py
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html
+
+from products.images import PRESETS, field_manifest, static_manifest
+
+register = template.Library()
+
+
+def _picture(manifest, preset, fallback_url, alt, css):
+    """<picture> with a WebP source and a lazily loaded JPEG <img>; plain <img> if no renditions exist."""
+    if not manifest:
+        return format_html(
+            '<img src="{}" class="{}" alt="{}" loading="lazy" decoding="async">', fallback_url, css, alt
+        )
+    return format_html(
+        '<picture>'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" class="{}" alt="{}" '
+        'loading="lazy" decoding="async">'
+        '</picture>',
+        manifest["webp"], PRESETS[preset].sizes,
+        manifest["jpeg_src"], manifest["jpeg"], PRESETS[preset].sizes,
+        manifest["width"], manifest["height"], css, alt,
+    )
+
+
+@register.simple_tag
+def responsive_image(image, preset, alt="", css=""):
+    """
+    Render an uploaded image (Product.image, SupplierProfile.logo) as sized renditions.
+    Usage: {% responsive_image p.image "card" alt=p.name css="w-full h-40 object-cover" %}
+    """
+    if not image:
+        return ""
+    return _picture(field_manifest(image, preset), preset, image.url, alt, css)
+
+
+@register.simple_tag
+def responsive_static(path, preset, alt="", css=""):
+    """Render an image from static/ as sized renditions, e.g. the site logo."""
+    return _picture(static_manifest(path, preset), preset, static(path), alt, css)
@@ -1,14 +1,32 @@
 # products/views.py
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponseForbidden, Http404
+from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, Http404, StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.views.decorators.http import require_POST
 
 from .models import Product, SupplierProfile
 from .forms import ProductForm
-from ai.llm import LLMClient
+from .pagination import keyset_page
+from . import cache as fragment_cache
+from .conditional import conditional_page
+from ai.llm import LLMError, get_llm_client
 from qa.forms import QuestionForm
-from pricing.services import generate_pricing_and_logistics
-from django.utils.text import Truncator
+from qa.services import find_similar_answer, get_product_context, record_exchange
+from jobs.models import Job
+from jobs.services import enqueue
+from .tasks import GENERATE_DESCRIPTION
+from django.conf import settings
+from urllib.parse import urlencode
+from search.services import search_products
+from asgiref.sync import sync_to_async
+import json
+
+# Columns rendered by the catalog card (plus created_at for the cursor)
+CATALOG_FIELDS = ("id", "name", "base_price", "unit", "image", "created_at")
+
+# Shown instead of an answer when no AI provider could answer (never stored)
+AI_UNAVAILABLE = "The assistant is unavailable right now. Please try again in a moment."
 
 
 @login_required
@@ -33,7 +51,13 @@ def seller_dashboard(request):
     if not request.user.is_seller():
         return render(request, "errors/forbidden.html", status=403)
     sp, _ = SupplierProfile.objects.get_or_create(user=request.user)
-    products = Product.objects.filter(supplier=sp).order_by("-created_at")
+    products = list(Product.objects.filter(supplier=sp).order_by("-created_at"))
+
+    # Products whose descriptions are still being generated show a polling status badge
+    active = Job.objects.filter(owner=request.user, kind=GENERATE_DESCRIPTION, status__in=Job.ACTIVE)
+    jobs_by_product = {j.payload.get("product_id"): j for j in active}
+    for p in products:
+        p.generation_job = jobs_by_product.get(p.pk)
     return render(request, "seller/dashboard.html", {"products": products})
 
 
@@ -74,95 +98,217 @@ def product_edit(request, pk):
 
 @login_required
 def generate_desc(request, pk):
-    """One-click generation of English/Chinese descriptions + pricing and logistics suggestions"""
+    """
+    One-click generation of English/Chinese descriptions + pricing and logistics suggestions.
+    The work is queued for `run_workers` (see products.tasks); the response returns at once
+    with a status badge that polls until the job is done.
+    """
     if not request.user.is_seller():
         return render(request, "errors/forbidden.html", status=403)
     sp, _ = SupplierProfile.objects.get_or_create(user=request.user)
     p = get_object_or_404(Product, pk=pk, supplier=sp)
 
-    llm = LLMClient()
-    p.ai_description_en = llm.generate_product_desc(p.name, p.category, p.unit, p.stock, lang="en")
-    p.ai_description_zh = llm.generate_product_desc(p.name, p.category, p.unit, p.stock, lang="zh")
-    p.save(update_fields=["ai_description_en", "ai_description_zh"])
-
-    generate_pricing_and_logistics(p)
+    job = enqueue(GENERATE_DESCRIPTION, {"product_id": p.pk}, owner=request.user)
+    if request.htmx:
+        return render(request, "jobs/_job_status.html", {"job": job})
     return redirect("seller-dashboard")
 
 
-def buyer_catalog(request):
-    """Buyer catalog: only show active products"""
-    products = Product.objects.filter(is_active=True).order_by("-created_at")
-    return render(request, "buyer/catalog.html", {"products": products})
+def _catalog_params(request):
+    """Query parameters that select a catalog page, in a stable order."""
+    return urlencode(sorted(
+        (k, v) for k, v in request.GET.items() if k in {"q", "category", "page", "cursor"}
+    ))
 
 
-def product_detail(request, pk):
+def _catalog_validators(request):
     """
-    Buyer product detail view.
-    Includes supplier contact info and shipping data for AI question context.
+    The catalog fragment-cache version, which every product write or delete bumps
+    (products.signals): one cache read, no database query, even for a 304.
+    No Last-Modified: the version is not a time.
+    """
+    return f"{fragment_cache.catalog_version()}|{_catalog_params(request)}", None
+
+
+def _detail_validators(request, pk):
+    """
+    The product's updated_at; price/logistics and supplier writes touch it too.
+    None for missing or inactive products, so the view produces the 404.
+    """
+    updated_at = Product.objects.filter(pk=pk, is_active=True).values_list("updated_at", flat=True).first()
+    if updated_at is None:
+        return None
+    return f"{pk}|{updated_at}", updated_at
+
+
+@conditional_page(_catalog_validators, shared=True)
+def buyer_catalog(request):
     """
-    # Retrieve product and supplier together
-    p = get_object_or_404(Product.objects.select_related("supplier"), pk=pk)
+    Buyer catalog: only show active products.
+    Keyset-paginated on (created_at, id); htmx infinite scroll requests get only the next page partial.
+    A `q` parameter switches to ranked full-text search with category facets.
+    Rendered pages are cached under the catalog version.
+    """
+    page = fragment_cache.get_or_render(
+        fragment_cache.catalog_page_key(_catalog_params(request)), lambda: _render_catalog_page(request)
+    )
+    if request.htmx:
+        return HttpResponse(page["grid"])
+    return render(request, "buyer/catalog.html", page)
+
+
+def _render_catalog_page(request):
+    """Query and render one catalog page; returns the grid HTML plus the header context."""
+    query = request.GET.get("q", "").strip()
+    if query:
+        context = _catalog_search(request, query)
+    else:
+        cursor = request.GET.get("cursor")
+        qs = Product.objects.filter(is_active=True).only(*CATALOG_FIELDS)
+        page = keyset_page(qs, cursor, settings.CATALOG_PAGE_SIZE)
+        next_url = f"?{urlencode({'cursor': page.next_cursor})}" if page.next_cursor else None
+        context = {"products": page.items, "next_url": next_url, "first_page": not cursor}
+    context["grid"] = render_to_string("buyer/_catalog_page.html", context)
+    del context["products"]
+    return context
+
+
+def _catalog_search(request, query):
+    """Search results page: hits come ranked from the index, then one PK lookup loads the cards."""
+    category = request.GET.get("category", "").strip()
+    try:
+        page_no = max(1, int(request.GET.get("page", 1)))
+    except ValueError:
+        page_no = 1
+    size = settings.CATALOG_PAGE_SIZE
+
+    result = search_products(query, category=category or None, limit=size, offset=(page_no - 1) * size)
+    by_id = Product.objects.only(*CATALOG_FIELDS).in_bulk([pk for pk, _ in result.hits])
+    products = [by_id[pk] for pk, _ in result.hits if pk in by_id]
+
+    next_url = None
+    if page_no * size < result.total:
+        params = {"q": query, "page": page_no + 1}
+        if category:
+            params["category"] = category
+        next_url = f"?{urlencode(params)}"
+    return {
+        "products": products,
+        "next_url": next_url,
+        "first_page": page_no == 1,
+        "query": query,
+        "category": category,
+        "facets": sorted(result.facets.items(), key=lambda kv: (-kv[1], kv[0])),
+        "total": result.total,
+    }
+
+
+def _render_product_detail(pk):
+    """Render the cacheable parts of the detail page (everything except the Q&A form)."""
+    # The current price / logistics suggestion comes with the same query (one join, no history sort)
+    p = get_object_or_404(Product.objects.select_related("supplier", "current_suggestion"), pk=pk)
     if not p.is_active:
         raise Http404("Product is inactive")
+    return {
+        "title": p.name,
+        "body": render_to_string("buyer/_product_detail_body.html", {"p": p}),
+        "contact": render_to_string("buyer/_product_contact.html", {"p": p}),
+    }
 
-    # Build product context for AI
-    unit = p.unit or "kg"
-
-    # Supplier information
-    sp = getattr(p, "supplier", None)
-    seller_bits = []
-    if sp:
-        if sp.company_name:
-            seller_bits.append(f"Company: {sp.company_name}")
-        if sp.contact_name:
-            seller_bits.append(f"Contact name: {sp.contact_name}")
-        if sp.email:
-            seller_bits.append(f"Email: {sp.email}")
-        if sp.phone:
-            seller_bits.append(f"Phone: {sp.phone}")
-        if sp.address:
-            seller_bits.append(f"Address: {sp.address}")
-    seller_info = "Seller info: " + ("; ".join(seller_bits) if seller_bits else "Not provided")
-
-    # Latest logistics info (if exists)
-    lg_last = p.logistics.last() if hasattr(p, "logistics") else None
-    logistics_info = ""
-    if lg_last:
-        logistics_info = (
-            f"Shipping: region {lg_last.region}, carrier {lg_last.carrier}, "
-            f"ETA approx. {lg_last.estimated_days} days, cost ${lg_last.cost_estimate}"
-        )
-
-    # Combine all context text
-    ctx_parts = [
-        f"Product: {p.name}",
-        f"Base price: {p.base_price} per {unit}",
-        f"Stock: {p.stock} {unit}",
-        f"Category: {p.category}" if p.category else "",
-        f"Description (English): {p.ai_description_en or ''}",
-        f"Description (Chinese): {p.ai_description_zh or ''}",
-        seller_info,
-        logistics_info,
-    ]
-    product_context = "\n".join([x for x in ctx_parts if x])
-    product_context = Truncator(product_context).chars(3500)
+
+@conditional_page(_detail_validators)
+def product_detail(request, pk):
+    """
+    Buyer product detail view.
+    Product, pricing and contact sections come from the versioned fragment cache;
+    the AI context is only looked up (precomputed, one indexed read) when a question is posted.
+    A question close enough to one already answered for the same context reuses that answer.
+    """
+    detail = fragment_cache.get_or_render(
+        fragment_cache.product_detail_key(pk), lambda: _render_product_detail(pk)
+    )
 
     # Handle AI question
     ai_answer = None
     form = QuestionForm(request.POST or None)
     if request.method == "POST" and form.is_valid():
+        product_context, context_version = get_product_context(pk)
         q = form.cleaned_data["question"]
-        ai = LLMClient()
-        ai_answer = ai.answer_question(q, product_context)
+        ai_answer = find_similar_answer(pk, context_version, q)
+        if ai_answer is None:
+            ai = get_llm_client()
+            try:
+                ai_answer = ai.answer_question(q, product_context, cache_scope=pk, context_version=context_version)
+            except LLMError:
+                # Shown to the buyer, never stored
+                ai_answer = AI_UNAVAILABLE
+            else:
+                buyer = request.user if request.user.is_authenticated else None
+                record_exchange(pk, context_version, q, ai_answer, buyer=buyer)
 
     # Render page
     return render(
         request,
         "buyer/product_detail.html",
-        {"p": p, "form": form, "ai_answer": ai_answer},
+        {"pk": pk, "detail": detail, "form": form, "ai_answer": ai_answer},
     )
 
 
+def _sse(payload, event=None) -> str:
+    """Format one Server-Sent Events message."""
+    head = f"event: {event}\n" if event else ""
+    return f"{head}data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+@require_POST
+async def product_answer_stream(request, pk):
+    """
+    Stream the AI answer to the posted question as Server-Sent Events (`message` events
+    carry text deltas, a final `done` event ends the stream).
+    POST with the CSRF token, like the detail form it enhances: a completion is paid for
+    and the exchange is stored, so a link, prefetch or cross-site request must not start one.
+    An async view: served through core/asgi.py, each open stream is a coroutine rather
+    than a worker thread, and the buyer sees the first words as soon as the model emits them.
+    """
+    form = QuestionForm(request.POST)
+    if not form.is_valid():
+        return HttpResponseBadRequest(form.errors["question"][0])
+    if not await Product.objects.filter(pk=pk, is_active=True).aexists():
+        raise Http404("Product is inactive")
+
+    q = form.cleaned_data["question"]
+    product_context, context_version = await sync_to_async(get_product_context)(pk)
+    stored = await sync_to_async(find_similar_answer)(pk, context_version, q)
+    user = await request.auser()
+    buyer = user if user.is_authenticated else None
+
+    async def events():
+        if stored is not None:
+            yield _sse({"delta": stored})
+        else:
+            parts = []
+            ai = get_llm_client()
+            try:
+                async for delta in ai.astream_answer(
+                        q, product_context, cache_scope=pk, context_version=context_version
+                ):
+                    parts.append(delta)
+                    yield _sse({"delta": delta})
+            except LLMError:
+                yield _sse({"delta": ("\n\n" if parts else "") + AI_UNAVAILABLE})
+            else:
+                answer = "".join(parts).strip()
+                if answer:
+                    await sync_to_async(record_exchange)(pk, context_version, q, answer, buyer=buyer)
+        yield _sse({}, event="done")
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Ask reverse proxies (nginx) not to buffer the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
 @login_required
 def product_delete(request, pk):
    
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class QaConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'qa'
+
+    def ready(self):
+        # Mark precomputed product contexts stale when their inputs change
+        from . import signals  # noqa: F401
@@ -0,0 +1,44 @@
+# qa/management/commands/rebuild_qa_index.py
+from django.core.management.base import BaseCommand
+
+from qa.models import QAMessage
+from qa.retrieval import to_bytes
+from qa.services import embed_question, get_question_index
+
+
+class Command(BaseCommand):
+    help = "Recompute the question vectors used for near-duplicate question matching."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of questions embedded per batch (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+
+        total = 0
+        last_id = 0
+        # Walk buyer questions by primary key; only the text is loaded
+        while True:
+            batch = list(
+                QAMessage.objects.filter(sender="BUYER", id__gt=last_id)
+                .order_by("id")
+                .only("id", "content")[:batch_size]
+            )
+            if not batch:
+                break
+            for m in batch:
+                m.embedding = to_bytes(embed_question(m.content))
+            QAMessage.objects.bulk_update(batch, ["embedding"])
+            total += len(batch)
+            last_id = batch[-1].id
+            self.stdout.write(f"Embedded {total} question(s)...")
+
+        # Indexes already loaded in this process are reloaded on next use;
+        # running web workers pick up the new vectors when they restart.
+        get_question_index().clear()
+        self.stdout.write(self.style.SUCCESS(f"Done. Embedded {total} question(s)."))
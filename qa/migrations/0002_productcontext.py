@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2026-10-17 18:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0010_product_updated_at'),
+        ('qa', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductContext',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='qa_context', serialize=False, to='products.product')),
+                ('text', models.TextField()),
+                ('digest', models.CharField(max_length=40)),
+                ('is_stale', models.BooleanField(default=False)),
+                ('built_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Product context',
+                'verbose_name_plural': 'Product contexts',
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='qamessage',
+            options={'ordering': ['created_at'], 'verbose_name': 'QA message', 'verbose_name_plural': 'QA messages'},
+        ),
+        migrations.AlterModelOptions(
+            name='qathread',
+            options={'ordering': ['-created_at'], 'verbose_name': 'QA thread', 'verbose_name_plural': 'QA threads'},
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-17 18:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('qa', '0002_productcontext'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='qamessage',
+            name='context_digest',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=40),
+        ),
+        migrations.AddField(
+            model_name='qamessage',
+            name='embedding',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='qamessage',
+            name='reply_to',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='replies', to='qa.qamessage'),
+        ),
+    ]
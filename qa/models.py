@@ -48,6 +48,18 @@ class QAMessage(models.Model):
     )
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    # Links an AI answer to the buyer question it replies to
+    reply_to = models.ForeignKey(
+        "self",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="replies",
+    )
+    # ProductContext.digest the answer was generated from
+    context_digest = models.CharField(max_length=40, blank=True, default="", db_index=True)
+    # Question vector used for near-duplicate matching (see qa.retrieval)
+    embedding = models.BinaryField(null=True, blank=True, editable=False)
 
     class Meta:
         # Show messages chronologically inside a thread
@@ -58,3 +70,28 @@ class QAMessage(models.Model):
     def __str__(self) -> str:
         snippet = (self.content[:30] + "…") if self.content and len(self.content) > 30 else self.content
         return f"{self.sender}: {snippet}"
+
+
+class ProductContext(models.Model):
+    """
+    Precomputed product context string used by the AI assistant.
+    Built lazily on the first question, marked stale when the product, its supplier
+    or its logistics change, and rebuilt on the next question. `digest` versions the text.
+    """
+    product = models.OneToOneField(
+        Product,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="qa_context",
+    )
+    text = models.TextField()
+    digest = models.CharField(max_length=40)
+    is_stale = models.BooleanField(default=False)
+    built_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Product context"
+        verbose_name_plural = "Product contexts"
+
+    def __str__(self) -> str:
+        return f"Context for product #{self.product_id} ({self.digest[:8]})"
@@ -0,0 +1,194 @@
+# qa/retrieval.py
+"""
+Near-duplicate question matching over past buyer questions.
+
+Questions are turned into hashed word + character n-gram vectors (no model, no
+vocabulary to train): words are case-folded, stop words dropped and common
+marketplace synonyms folded onto one term ("deliver", "shipping" -> "ship"),
+then every word and every character trigram of it is hashed into a fixed
+number of signed buckets. Vectors are L2-normalised, so a dot product is the
+cosine similarity and a lookup is one matrix-vector product with NumPy.
+
+This module is pure Python + NumPy; wiring to the database lives in qa.services.
+"""
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_DIM = 256
+
+# Numbers and letters are separate words, so "5kg" and "5 kg" read the same
+_WORD_RE = re.compile(r"\d+|[^\W\d_]+", re.UNICODE)
+
+_STOPWORDS = frozenset(
+    "a an the is are was were be been am do does did can could will would should shall may might "
+    "i me my we our you your it its this that these those there here of in on at to for from with "
+    "by about as and or but if so than then please pls any some what which who whom whose "
+    "how when where why get got have has had just also need needed want like order ordering buy buying "
+    "use used take taking before after without".split()
+)
+
+# Different words buyers use for the same thing
+_SYNONYMS = {
+    "deliver": "ship", "delivers": "ship", "delivered": "ship", "delivery": "ship", "deliveries": "ship",
+    "shipping": "ship", "shipped": "ship", "ships": "ship", "shipment": "ship", "postage": "ship",
+    "send": "ship", "sent": "ship", "freight": "ship", "courier": "ship", "carrier": "ship",
+    "cost": "price", "costs": "price", "prices": "price", "priced": "price", "fee": "price", "fees": "price",
+    "charge": "price", "charges": "price", "much": "price", "expensive": "price", "cheap": "price", "rate": "price",
+    "available": "stock", "availability": "stock", "inventory": "stock", "left": "stock", "remaining": "stock",
+    "quantity": "stock", "supply": "stock",
+    "long": "time", "days": "time", "day": "time", "eta": "time", "arrive": "time", "arrival": "time",
+    "soon": "time", "fast": "time", "quickly": "time",
+    "organically": "organic", "pesticide": "organic", "pesticides": "organic", "chemicals": "organic",
+    "chemical": "organic", "sprayed": "organic", "spray": "organic", "grown": "organic",
+    "seller": "supplier", "vendor": "supplier", "farm": "supplier", "farmer": "supplier", "company": "supplier",
+    "phone": "contact", "email": "contact", "call": "contact", "reach": "contact",
+    "fresh": "freshness", "harvested": "freshness", "picked": "freshness",
+    "kilo": "kg", "kilogram": "kg", "kilograms": "kg", "kilos": "kg",
+}
+
+WORD_WEIGHT = 1.0
+TRIGRAM_WEIGHT = 0.35
+
+
+def tokens(text: str) -> List[str]:
+    """Normalised content words of a question."""
+    out = []
+    for w in _WORD_RE.findall((text or "").casefold()):
+        if w in _STOPWORDS:
+            continue
+        out.append(_SYNONYMS.get(w, w))
+    return out
+
+
+def _features(text: str) -> Iterable[Tuple[str, float]]:
+    for w in tokens(text):
+        yield "w:" + w, WORD_WEIGHT
+        padded = f" {w} "
+        for i in range(len(padded) - 2):
+            yield padded[i:i + 3], TRIGRAM_WEIGHT
+
+
+def embed(text: str, dim: int = DEFAULT_DIM) -> np.ndarray:
+    """Unit-length float32 vector for `text` (all zeros when it has no content words)."""
+    vec = np.zeros(dim, dtype=np.float32)
+    for feature, weight in _features(text):
+        h = zlib.crc32(feature.encode())
+        # One hash bit picks the sign so that collisions cancel out on average
+        vec[h % dim] += weight if h & 0x80000000 else -weight
+    norm = float(np.linalg.norm(vec))
+    if norm:
+        vec /= norm
+    return vec
+
+
+def to_bytes(vec: np.ndarray) -> bytes:
+    return np.asarray(vec, dtype=np.float32).tobytes()
+
+
+def from_bytes(raw: bytes, dim: int = DEFAULT_DIM) -> Optional[np.ndarray]:
+    """Decode a stored vector; None when it was built with a different dimension."""
+    if not raw:
+        return None
+    vec = np.frombuffer(bytes(raw), dtype=np.float32)
+    return vec if vec.shape[0] == dim else None
+
+
+class QuestionIndex:
+    """
+    Vectors of stored questions plus the answer given to each.
+    Appends are amortised O(1) (the matrix grows by doubling); a lookup scans all rows.
+    """
+
+    def __init__(self, dim: int = DEFAULT_DIM, capacity: int = 64):
+        self.dim = dim
+        self._matrix = np.zeros((capacity, dim), dtype=np.float32)
+        self._answers: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._answers)
+
+    def add(self, vec: np.ndarray, answer: str):
+        n = len(self._answers)
+        if n == self._matrix.shape[0]:
+            grown = np.zeros((n * 2, self.dim), dtype=np.float32)
+            grown[:n] = self._matrix
+            self._matrix = grown
+        self._matrix[n] = vec
+        self._answers.append(answer)
+
+    def add_many(self, vectors: Sequence[np.ndarray], answers: Sequence[str]):
+        for vec, answer in zip(vectors, answers):
+            self.add(vec, answer)
+
+    def nearest(self, vec: np.ndarray) -> Tuple[float, Optional[str]]:
+        """(cosine similarity, answer) of the closest stored question; (0.0, None) when empty."""
+        n = len(self._answers)
+        if not n or not vec.any():
+            return 0.0, None
+        scores = self._matrix[:n] @ vec
+        best = int(np.argmax(scores))
+        return float(scores[best]), self._answers[best]
+
+
+class QuestionIndexRegistry:
+    """
+    One QuestionIndex per (scope, context version), loaded lazily through `loader`.
+    A scope is a product id; when a product's context version changes, its previous
+    index is dropped, because answers given from the old context may no longer hold.
+    At most `max_scopes` indexes are kept (least recently used ones are evicted).
+    """
+
+    def __init__(
+            self,
+            loader: Callable[[Hashable, str], Tuple[Sequence[np.ndarray], Sequence[str]]],
+            dim: int = DEFAULT_DIM,
+            max_scopes: int = 1000,
+    ):
+        self.loader = loader
+        self.dim = dim
+        self.max_scopes = max_scopes
+        self._indexes: "OrderedDict[Hashable, Tuple[str, QuestionIndex]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, scope: Hashable, version: str) -> QuestionIndex:
+        with self._lock:
+            entry = self._indexes.get(scope)
+            if entry and entry[0] == version:
+                self._indexes.move_to_end(scope)
+                return entry[1]
+
+        vectors, answers = self.loader(scope, version)
+        index = QuestionIndex(self.dim, capacity=max(64, len(answers)))
+        index.add_many(vectors, answers)
+
+        with self._lock:
+            entry = self._indexes.get(scope)
+            if entry and entry[0] == version:
+                # Loaded concurrently; keep the first one
+                return entry[1]
+            self._indexes[scope] = (version, index)
+            self._indexes.move_to_end(scope)
+            while len(self._indexes) > self.max_scopes:
+                self._indexes.popitem(last=False)
+        return index
+
+    def lookup(self, scope: Hashable, version: str, vec: np.ndarray) -> Tuple[float, Optional[str]]:
+        index = self._get(scope, version)
+        with self._lock:
+            return index.nearest(vec)
+
+    def add(self, scope: Hashable, version: str, vec: np.ndarray, answer: str):
+        """Append to an index that is already loaded; unloaded ones pick the row up from the loader."""
+        with self._lock:
+            entry = self._indexes.get(scope)
+            if entry and entry[0] == version:
+                entry[1].add(vec, answer)
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
@@ -0,0 +1,223 @@
+# qa/services.py
+import hashlib
+import threading
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.text import Truncator
+
+from pricing.models import CurrentSuggestion
+from products.models import Product
+from . import retrieval
+from .models import ProductContext, QAMessage, QAThread
+
+# Upper bound on the context sent with each question
+CONTEXT_MAX_CHARS = 3500
+
+
+def build_product_context(p: Product) -> str:
+    """Assemble the product context text the AI assistant answers from."""
+    unit = p.unit or "kg"
+
+    # Supplier information
+    sp = getattr(p, "supplier", None)
+    seller_bits = []
+    if sp:
+        if sp.company_name:
+            seller_bits.append(f"Company: {sp.company_name}")
+        if sp.contact_name:
+            seller_bits.append(f"Contact name: {sp.contact_name}")
+        if sp.email:
+            seller_bits.append(f"Email: {sp.email}")
+        if sp.phone:
+            seller_bits.append(f"Phone: {sp.phone}")
+        if sp.address:
+            seller_bits.append(f"Address: {sp.address}")
+    seller_info = "Seller info: " + ("; ".join(seller_bits) if seller_bits else "Not provided")
+
+    # Latest logistics info (if exists)
+    lg_last = CurrentSuggestion.objects.filter(product=p, estimated_days__isnull=False).first()
+    logistics_info = ""
+    if lg_last:
+        logistics_info = (
+            f"Shipping: region {lg_last.region}, carrier {lg_last.carrier}, "
+            f"ETA approx. {lg_last.estimated_days} days, cost ${lg_last.cost_estimate}"
+        )
+
+    # Combine all context text
+    ctx_parts = [
+        f"Product: {p.name}",
+        f"Base price: {p.base_price} per {unit}",
+        f"Stock: {p.stock} {unit}",
+        f"Category: {p.category}" if p.category else "",
+        f"Description (English): {p.ai_description_en or ''}",
+        f"Description (Chinese): {p.ai_description_zh or ''}",
+        seller_info,
+        logistics_info,
+    ]
+    product_context = "\n".join([x for x in ctx_parts if x])
+    return Truncator(product_context).chars(CONTEXT_MAX_CHARS)
+
+
+def get_product_context(product_id: int) -> Tuple[str, str]:
+    """
+    Return (context text, version digest) for a product.
+    A fresh precomputed row costs one primary-key lookup; a missing or stale one is rebuilt and stored.
+    Raises Product.DoesNotExist for unknown products.
+    """
+    row = (
+        ProductContext.objects.filter(product_id=product_id, is_stale=False)
+        .values_list("text", "digest")
+        .first()
+    )
+    if row:
+        return row
+
+    p = Product.objects.select_related("supplier").get(pk=product_id)
+    text = build_product_context(p)
+    digest = hashlib.sha1(text.encode()).hexdigest()
+    ProductContext.objects.update_or_create(
+        product=p, defaults={"text": text, "digest": digest, "is_stale": False}
+    )
+    return text, digest
+
+
+def invalidate_product_contexts(product_ids: Iterable[int]):
+    """Mark precomputed contexts stale; they are rebuilt on the next question."""
+    ProductContext.objects.filter(product_id__in=list(product_ids)).update(is_stale=True)
+
+
+def _load_question_index(product_id: int, digest: str):
+    """Stored (question vector, answer) pairs answered from this version of the product context."""
+    dim = settings.QA_INDEX_DIM
+    rows = (
+        QAMessage.objects.filter(
+            sender="AI",
+            context_digest=digest,
+            thread__product_id=product_id,
+            reply_to__embedding__isnull=False,
+        )
+        .order_by("id")
+        .values_list("reply_to__embedding", "content")
+    )
+    vectors, answers = [], []
+    for raw, answer in rows.iterator():
+        vec = retrieval.from_bytes(raw, dim)
+        if vec is not None:
+            vectors.append(vec)
+            answers.append(answer)
+    return vectors, answers
+
+
+_index_registry = None
+_index_registry_lock = threading.Lock()
+
+
+def get_question_index() -> retrieval.QuestionIndexRegistry:
+    """Process-wide registry of per-product question indexes."""
+    global _index_registry
+    if _index_registry is None:
+        with _index_registry_lock:
+            if _index_registry is None:
+                _index_registry = retrieval.QuestionIndexRegistry(
+                    _load_question_index,
+                    dim=settings.QA_INDEX_DIM,
+                    max_scopes=settings.QA_INDEX_MAX_PRODUCTS,
+                )
+    return _index_registry
+
+
+def embed_question(question: str):
+    return retrieval.embed(question, settings.QA_INDEX_DIM)
+
+
+def find_similar_answer(product_id: int, digest: str, question: str) -> Optional[str]:
+    """
+    Answer previously given to a near-duplicate of `question` about the same product
+    (and the same context version), or None when nothing is similar enough.
+    """
+    score, answer = get_question_index().lookup(product_id, digest, embed_question(question))
+    if answer is not None and score >= settings.QA_SIMILARITY_THRESHOLD:
+        return answer
+    return None
+
+
+@transaction.atomic
+def record_exchange(product_id: int, digest: str, question: str, answer: str, buyer=None) -> QAMessage:
+    """Store a buyer question and the AI answer; returns the AI message."""
+    thread = None
+    if buyer is not None:
+        thread = QAThread.objects.filter(buyer=buyer, product_id=product_id).first()
+    if thread is None:
+        thread = QAThread.objects.create(buyer=buyer, product_id=product_id)
+
+    asked = QAMessage.objects.create(
+        thread=thread,
+        sender="BUYER",
+        content=question,
+        embedding=retrieval.to_bytes(embed_question(question)),
+    )
+    return QAMessage.objects.create(
+        thread=thread,
+        sender="AI",
+        content=answer,
+        reply_to=asked,
+        context_digest=digest,
+    )
+
+
+# Batch-file re-answers (see ai.batch): custom ids are "qa:<answer pk>:<context digest>"
+def answer_batch_requests(llm, stale_only: bool = True) -> Iterator[dict]:
+    """
+    Batch request lines answering the stored buyer questions again from the current
+    product context; with `stale_only`, only answers given from an older context.
+    """
+    answers = (
+        QAMessage.objects.filter(sender="AI", reply_to__isnull=False, thread__product__isnull=False)
+        .order_by("thread__product_id", "id")
+        .values_list("id", "thread__product_id", "context_digest", "reply_to__content")
+    )
+    current = (None, None, None)
+    for pk, product_id, digest, question in answers.iterator():
+        if product_id != current[0]:
+            current = (product_id, *get_product_context(product_id))
+        _, context, current_digest = current
+        if stale_only and digest == current_digest:
+            continue
+        yield llm.answer_batch_request(f"qa:{pk}:{current_digest}", question, context)
+
+
+def ingest_answer_results(results: Iterable, chunk_size: int = 1000) -> Tuple[int, List[str]]:
+    """
+    Replace stored AI answers with answer batch results (ai.batch.BatchResult),
+    `chunk_size` per bulk_update. Returns (answers written, custom ids that failed);
+    answers deleted since the batch was submitted count as failed.
+    """
+    written, failed = 0, []
+    chunk: List[Tuple[str, QAMessage]] = []
+
+    def flush():
+        nonlocal written
+        existing = set(QAMessage.objects.filter(pk__in=[m.pk for _, m in chunk]).values_list("pk", flat=True))
+        failed.extend(custom_id for custom_id, m in chunk if m.pk not in existing)
+        written += QAMessage.objects.bulk_update(
+            [m for _, m in chunk if m.pk in existing], ["content", "context_digest"]
+        )
+        chunk.clear()
+
+    for result in results:
+        kind, _, rest = result.custom_id.partition(":")
+        pk, _, digest = rest.partition(":")
+        if result.error or kind != "qa" or not result.text:
+            failed.append(result.custom_id)
+            continue
+        chunk.append((result.custom_id, QAMessage(pk=int(pk), content=result.text, context_digest=digest)))
+        if len(chunk) >= chunk_size:
+            flush()
+    if chunk:
+        flush()
+    if written:
+        # Loaded question indexes hold the previous answers
+        get_question_index().clear()
+    return written, failed
@@ -0,0 +1,48 @@
+# qa/signals.py
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from products.bulk import products_bulk_changed
+from products.models import Product, SupplierProfile
+from . import retrieval
+from .models import ProductContext, QAMessage
+from .services import get_question_index, invalidate_product_contexts
+
+
+@receiver(post_save, sender=Product)
+def product_saved(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_product_contexts([instance.pk])
+
+
+@receiver(products_bulk_changed)
+def products_bulk_written(sender, product_ids, **kwargs):
+    invalidate_product_contexts(product_ids)
+
+
+@receiver(post_save, sender=QAMessage)
+def answer_saved(sender, instance, created, **kwargs):
+    """Add new AI answers to the loaded question index of their product."""
+    if not (created and instance.sender == "AI" and instance.reply_to_id and instance.context_digest):
+        return
+    question = instance.reply_to
+    vec = retrieval.from_bytes(question.embedding, get_question_index().dim)
+    product_id = instance.thread.product_id
+    if vec is None or product_id is None:
+        return
+    transaction.on_commit(
+        lambda: get_question_index().add(product_id, instance.context_digest, vec, instance.content)
+    )
+
+
+def supplier_saved(sender, instance, created, **kwargs):
+    if not created:
+        ProductContext.objects.filter(product__supplier=instance).update(is_stale=True)
+
+
+# SupplierProfile is also edited through its admin proxy
+for _sender in apps.get_models():
+    if _sender._meta.concrete_model is SupplierProfile:
+        post_save.connect(supplier_saved, sender=_sender)
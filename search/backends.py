@@ -0,0 +1,237 @@
+# search/backends.py
+"""
+Inverted-index backends for product search.
+
+The index lives in its own table next to the products table:
+- SQLite: an FTS5 virtual table (rowid = product id), ranked with bm25()
+- PostgreSQL: a weighted tsvector column with a GIN index, ranked with ts_rank()
+
+Both backends answer a query with ranked hits *and* per-category facet counts
+in a single SQL statement.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.db import connection as default_connection
+
+INDEX_TABLE = "search_productindex"
+
+# (product_id, name, category, ai_description_en, ai_description_zh, is_active)
+IndexRow = Tuple[int, str, str, str, str, bool]
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class SearchResult:
+    hits: List[Tuple[int, float]] = field(default_factory=list)  # (product_id, score), best first
+    facets: Dict[str, int] = field(default_factory=dict)  # category -> number of matches
+    total: int = 0
+
+
+def tokenize_query(query: str) -> List[str]:
+    """Split free text into word tokens; punctuation never reaches the match syntax."""
+    return _TOKEN_RE.findall(query or "")[:16]
+
+
+class BaseSearchBackend:
+    # Best-first direction of the backend's score
+    score_order = "ASC"
+
+    def __init__(self, connection=None):
+        self.connection = connection or default_connection
+
+    # schema
+    def create_schema(self):
+        raise NotImplementedError
+
+    def drop_schema(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {INDEX_TABLE}")
+
+    def clear(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {INDEX_TABLE}")
+
+    def optimize(self):
+        """Compact the index after a bulk rebuild (no-op unless the backend needs it)."""
+
+    # writes
+    def upsert(self, rows: Sequence[IndexRow]):
+        raise NotImplementedError
+
+    def delete(self, product_ids: Iterable[int]):
+        ids = list(product_ids)
+        if not ids:
+            return
+        marks = ", ".join(["%s"] * len(ids))
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {INDEX_TABLE} WHERE {self.id_column} IN ({marks})", ids)
+
+    # reads
+    def match_sql(self) -> str:
+        """SQL selecting (product_id, category, is_active, score) for rows matching the %s query param."""
+        raise NotImplementedError
+
+    def build_query(self, tokens: List[str]) -> str:
+        raise NotImplementedError
+
+    def search(
+            self,
+            query: str,
+            category: Optional[str] = None,
+            limit: int = 24,
+            offset: int = 0,
+            active_only: bool = True,
+    ) -> SearchResult:
+        """
+        Ranked hits (optionally narrowed to one category) plus facet counts over
+        all matches, fetched in one round trip.
+        """
+        tokens = tokenize_query(query)
+        if not tokens:
+            return SearchResult()
+
+        active_clause = "WHERE is_active" if active_only else ""
+        sql = f"""
+            WITH matches AS ({self.match_sql()}),
+                 visible AS (SELECT product_id, category, score FROM matches {active_clause})
+            SELECT 'hit', product_id, category, score FROM (
+                SELECT product_id, category, score FROM visible
+                WHERE %s = '' OR category = %s
+                ORDER BY score {self.score_order}, product_id
+                LIMIT %s OFFSET %s
+            ) AS page
+            UNION ALL
+            SELECT 'facet', COUNT(*), category, NULL FROM visible GROUP BY category
+        """
+        cat = category or ""
+        params = [self.build_query(tokens), cat, cat, limit, offset]
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        result = SearchResult()
+        for kind, value, cat_name, score in rows:
+            if kind == "hit":
+                result.hits.append((value, float(score)))
+            else:
+                result.facets[cat_name or ""] = value
+        reverse = self.score_order == "DESC"
+        result.hits.sort(key=lambda h: h[1], reverse=reverse)
+        if category:
+            result.total = result.facets.get(category, 0)
+        else:
+            result.total = sum(result.facets.values())
+        return result
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    """FTS5 virtual table; the rowid is the product id. bm25() is lower-is-better."""
+
+    id_column = "rowid"
+    score_order = "ASC"
+
+    # bm25 column weights: name, category, description_en, description_zh, is_active
+    _WEIGHTS = "10.0, 4.0, 1.0, 1.0, 0.0"
+
+    def create_schema(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {INDEX_TABLE} USING fts5("
+                "name, category, description_en, description_zh, is_active UNINDEXED, "
+                "tokenize = 'unicode61 remove_diacritics 2')"
+            )
+
+    def optimize(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {INDEX_TABLE}({INDEX_TABLE}) VALUES ('optimize')")
+
+    def upsert(self, rows: Sequence[IndexRow]):
+        if not rows:
+            return
+        self.delete(r[0] for r in rows)
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {INDEX_TABLE} "
+                "(rowid, name, category, description_en, description_zh, is_active) "
+                "VALUES (%s, %s, %s, %s, %s, %s)",
+                [(pk, name, cat or "", en or "", zh or "", 1 if active else 0)
+                 for pk, name, cat, en, zh, active in rows],
+            )
+
+    def match_sql(self) -> str:
+        return (
+            f"SELECT rowid AS product_id, category, is_active, "
+            f"bm25({INDEX_TABLE}, {self._WEIGHTS}) AS score "
+            f"FROM {INDEX_TABLE} WHERE {INDEX_TABLE} MATCH %s"
+        )
+
+    def build_query(self, tokens: List[str]) -> str:
+        # Every token must match, each as a prefix: "tom"* "che"*
+        return " ".join(f'"{t}"*' for t in tokens)
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """Weighted tsvector (name A, category B, descriptions C) with a GIN index. ts_rank() is higher-is-better."""
+
+    id_column = "product_id"
+    score_order = "DESC"
+
+    _DOCUMENT = (
+        "setweight(to_tsvector('simple', %s), 'A') || "
+        "setweight(to_tsvector('simple', %s), 'B') || "
+        "setweight(to_tsvector('simple', %s || ' ' || %s), 'C')"
+    )
+
+    def create_schema(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {INDEX_TABLE} ("
+                "product_id bigint PRIMARY KEY, "
+                "category varchar(100) NOT NULL DEFAULT '', "
+                "is_active boolean NOT NULL DEFAULT true, "
+                "document tsvector NOT NULL)"
+            )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {INDEX_TABLE}_document_gin "
+                f"ON {INDEX_TABLE} USING GIN (document)"
+            )
+
+    def upsert(self, rows: Sequence[IndexRow]):
+        if not rows:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {INDEX_TABLE} (product_id, category, is_active, document) "
+                f"VALUES (%s, %s, %s, {self._DOCUMENT}) "
+                "ON CONFLICT (product_id) DO UPDATE SET "
+                "category = EXCLUDED.category, is_active = EXCLUDED.is_active, document = EXCLUDED.document",
+                [(pk, cat or "", bool(active), name, cat or "", en or "", zh or "")
+                 for pk, name, cat, en, zh, active in rows],
+            )
+
+    def match_sql(self) -> str:
+        return (
+            f"SELECT product_id, category, is_active, ts_rank(document, q) AS score "
+            f"FROM {INDEX_TABLE}, to_tsquery('simple', %s) AS q WHERE document @@ q"
+        )
+
+    def build_query(self, tokens: List[str]) -> str:
+        return " & ".join(f"{t}:*" for t in tokens)
+
+
+_BACKENDS = {
+    "sqlite": SQLiteSearchBackend,
+    "postgresql": PostgresSearchBackend,
+}
+
+
+def get_backend(connection=None) -> BaseSearchBackend:
+    """Pick the backend matching the database vendor (DATABASE_URL)."""
+    conn = connection or default_connection
+    try:
+        return _BACKENDS[conn.vendor](conn)
+    except KeyError:
+        raise NotImplementedError(f"Product search is not supported on '{conn.vendor}' databases.")
@@ -0,0 +1,45 @@
+# search/management/commands/rebuild_search_index.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from products.models import Product
+from search.backends import get_backend
+from search.services import INDEX_FIELDS
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text product search index from scratch."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of products indexed per batch (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        backend = get_backend()
+        backend.create_schema()
+
+        total = 0
+        last_id = 0
+        with transaction.atomic():
+            backend.clear()
+            # Walk the table by primary key so each batch is an index range scan
+            while True:
+                rows = list(
+                    Product.objects.filter(id__gt=last_id)
+                    .order_by("id")
+                    .values_list(*INDEX_FIELDS)[:batch_size]
+                )
+                if not rows:
+                    break
+                backend.upsert(rows)
+                total += len(rows)
+                last_id = rows[-1][0]
+                self.stdout.write(f"Indexed {total} product(s)...")
+        backend.optimize()
+
+        self.stdout.write(self.style.SUCCESS(f"Done. Indexed {total} product(s)."))
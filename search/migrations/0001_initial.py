@@ -0,0 +1,33 @@
+from django.db import migrations
+
+
+INDEX_FIELDS = ("id", "name", "category", "ai_description_en", "ai_description_zh", "is_active")
+
+
+def create_index(apps, schema_editor):
+    from search.backends import get_backend
+
+    backend = get_backend(schema_editor.connection)
+    backend.create_schema()
+    Product = apps.get_model("products", "Product")
+    db_alias = schema_editor.connection.alias
+    backend.upsert(list(Product.objects.using(db_alias).values_list(*INDEX_FIELDS)))
+
+
+def drop_index(apps, schema_editor):
+    from search.backends import get_backend
+
+    get_backend(schema_editor.connection).drop_schema()
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('products', '0008_product_catalog_keyset_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,38 @@
+# search/services.py
+from typing import Iterable, Optional
+
+from products.models import Product
+from .backends import SearchResult, get_backend
+
+INDEX_FIELDS = ("id", "name", "category", "ai_description_en", "ai_description_zh", "is_active")
+
+
+def index_products(product_ids: Iterable[int]):
+    """(Re)index the given products; ids that no longer exist are dropped from the index."""
+    ids = list(product_ids)
+    if not ids:
+        return
+    rows = list(Product.objects.filter(id__in=ids).values_list(*INDEX_FIELDS))
+    backend = get_backend()
+    backend.upsert(rows)
+    backend.delete(set(ids) - {r[0] for r in rows})
+
+
+def index_product(product: Product):
+    """Index a single in-memory product without re-reading it."""
+    get_backend().upsert([tuple(getattr(product, f) for f in INDEX_FIELDS)])
+
+
+def unindex_products(product_ids: Iterable[int]):
+    get_backend().delete(product_ids)
+
+
+def search_products(
+        query: str,
+        category: Optional[str] = None,
+        limit: int = 24,
+        offset: int = 0,
+        active_only: bool = True,
+) -> SearchResult:
+    """Ranked product ids plus per-category facet counts for a free-text query."""
+    return get_backend().search(query, category=category, limit=limit, offset=offset, active_only=active_only)
@@ -0,0 +1,27 @@
+# search/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from products.bulk import products_bulk_changed
+from products.models import Product
+from .services import INDEX_FIELDS, index_product, index_products, unindex_products
+
+
+@receiver(post_save, sender=Product)
+def reindex_product(sender, instance, update_fields=None, **kwargs):
+    """Refresh the index entry; partial saves may leave unloaded fields, so re-read those."""
+    if update_fields is not None or instance.get_deferred_fields():
+        index_products([instance.pk])
+    else:
+        index_product(instance)
+
+
+@receiver(post_delete, sender=Product)
+def drop_product(sender, instance, **kwargs):
+    unindex_products([instance.pk])
+
+
+@receiver(products_bulk_changed)
+def reindex_bulk_written(sender, product_ids, fields, **kwargs):
+    if set(fields) & set(INDEX_FIELDS):
+        index_products(product_ids)